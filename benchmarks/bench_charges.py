@@ -0,0 +1,70 @@
+"""Time charge-book validation on a synthetic regulator book.
+
+    python benchmarks/bench_charges.py --rows 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from pricing_engine.charges import PassThroughLibrary
+
+
+def synthetic_charge_book(rows: int, versions: int = 10, seed: int = 0) -> pd.DataFrame:
+    """Versioned charge rows: ``rows // versions`` charge keys with yearly versions."""
+    rng = np.random.default_rng(seed)
+    n_keys = max(rows // versions, 1)
+    key = np.repeat(np.arange(n_keys), versions)[:rows]
+    version = np.tile(np.arange(1, versions + 1), n_keys)[:rows]
+
+    start = np.datetime64("2016-01-01") + (version - 1) * np.timedelta64(365, "D")
+    # Roughly 1% of versions start a month early, overlapping the previous one.
+    early = rng.random(rows) < 0.01
+    start = start - np.where(early & (version > 1), 30, 0).astype("timedelta64[D]")
+    end = start + np.timedelta64(364, "D")
+
+    return pd.DataFrame(
+        {
+            "region": np.where(key % 2, "ROI", "NI"),
+            "commodity": np.where(key % 3, "ELEC", "GAS"),
+            "segment": np.where(key % 5, "SME", "IC"),
+            "year": 2026,
+            "band": np.array(["FLAT", "DAY", "NIGHT", "PEAK", "OFFPEAK"])[key % 5],
+            "charge_type": np.where(key % 4, "NETWORK", "LEVY"),
+            "name": pd.Series(key).map("Charge {}".format).to_numpy(),
+            "unit": "EUR_MWH",
+            "value": np.round(20 + 30 * rng.random(rows), 2),
+            "effective_from": start.astype(str),
+            "effective_to": end.astype(str),
+            "version": version,
+        }
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    df = synthetic_charge_book(args.rows)
+
+    t0 = time.perf_counter()
+    library = PassThroughLibrary(df)
+    t1 = time.perf_counter()
+    overlaps = library.find_overlaps()
+    t2 = time.perf_counter()
+    changes = library.detect_large_changes(args.threshold)
+    t3 = time.perf_counter()
+
+    print(f"rows:                 {len(df):,}")
+    print(f"load:                 {t1 - t0:.2f}s")
+    print(f"find_overlaps:        {t2 - t1:.2f}s ({len(overlaps):,} findings)")
+    print(f"detect_large_changes: {t3 - t2:.2f}s ({len(changes):,} findings)")
+
+
+if __name__ == "__main__":
+    main()
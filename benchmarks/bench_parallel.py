@@ -0,0 +1,95 @@
+"""Scaling curve of ParallelPricer: price_batch and reprice-book per process count.
+
+    python benchmarks/bench_parallel.py --quotes 1000000 --processes 1 2 4 8 16 32
+
+Speedup and efficiency are relative to the single-process run. The book
+run includes reading and parsing the CSV (overlapped with pricing) and
+rendering the priced CSV, which is spread over the worker processes.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from pricing_engine.batch import RequestBatch
+from pricing_engine.book import reprice_book
+from pricing_engine.parallel import ParallelPricer
+from pricing_engine.schemas import ContractType, Market, Segment, TariffStructure
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def synthetic_book(quotes: int, seed: int = 0) -> pd.DataFrame:
+    """ROI SME electricity day/night quotes (the sample data's priced slice)."""
+    rng = np.random.default_rng(seed)
+    day = 0.5 + 0.4 * rng.random(quotes)
+    return pd.DataFrame(
+        {
+            "customer_id": np.arange(quotes),
+            "market": Market.ROI.value,
+            "commodity": "ELEC",
+            "segment": Segment.SME.value,
+            "tariff_structure": TariffStructure.DAY_NIGHT.value,
+            "year": 2026,
+            "contract_type": ContractType.FIXED.value,
+            "annual_consumption_kwh": 50_000 * (0.5 + rng.random(quotes)),
+            "standing_charge_eur_per_year": 300.0,
+            "day_share": day,
+            "night_share": 1.0 - day,
+        }
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--quotes", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="reprice-book chunk rows")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, 8, 16, 32, os.cpu_count() or 1}),
+    )
+    args = parser.parse_args()
+
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    book = synthetic_book(args.quotes)
+    batch = RequestBatch.from_columns(book, vat_by_market=engine.settings.vat)
+    engine.market_tables()
+    print(f"{args.quotes:,} quotes on {os.cpu_count()} CPU cores")
+    print(f"{'processes':>9} {'price_batch':>12} {'speedup':>8} {'reprice-book':>13} "
+          f"{'rows/s':>11} {'speedup':>8} {'efficiency':>10}")
+
+    with tempfile.TemporaryDirectory(prefix="pricing_bench_") as tmp:
+        book_path = Path(tmp) / "book.csv"
+        book.to_csv(book_path, index=False)
+        base_batch = base_book = 0.0
+        for processes in args.processes:
+            with ParallelPricer(engine, processes=processes) as pricer:
+                pricer.price_batch(batch.slice(slice(0, 10 * pricer.min_task_rows)))  # warm pool
+                start = time.perf_counter()
+                pricer.price_batch(batch)
+                batch_s = time.perf_counter() - start
+                start = time.perf_counter()
+                reprice_book(
+                    pricer, book_path, Path(tmp) / "priced.csv", args.chunk_size, processes=processes
+                )
+                book_s = time.perf_counter() - start
+            base_batch = base_batch or batch_s
+            base_book = base_book or book_s
+            speedup = base_book / book_s
+            print(
+                f"{processes:>9} {batch_s:11.3f}s {base_batch / batch_s:7.2f}x {book_s:12.3f}s "
+                f"{args.quotes / book_s:11,.0f} {speedup:7.2f}x {speedup / processes:9.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
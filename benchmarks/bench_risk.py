@@ -0,0 +1,60 @@
+"""Time Monte Carlo risk premia on a synthetic ROI book.
+
+    python benchmarks/bench_risk.py --quotes 10000 --paths 5000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from pricing_engine.batch import RequestBatch
+from pricing_engine.schemas import ContractType, Market, Segment, TariffStructure
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def synthetic_book(quotes: int, seed: int = 0) -> RequestBatch:
+    """ROI SME electricity day/night quotes (the sample data's priced slice)."""
+    rng = np.random.default_rng(seed)
+    day = 0.5 + 0.4 * rng.random(quotes)
+    columns = {
+        "market": np.full(quotes, Market.ROI.value),
+        "commodity": np.full(quotes, "ELEC"),
+        "segment": np.full(quotes, Segment.SME.value),
+        "tariff_structure": np.full(quotes, TariffStructure.DAY_NIGHT.value),
+        "year": np.full(quotes, 2026),
+        "contract_type": np.full(quotes, ContractType.FIXED.value),
+        "annual_consumption_kwh": 50_000 * (0.5 + rng.random(quotes)),
+        "standing_charge_eur_per_year": np.full(quotes, 300.0),
+        "day_share": day,
+        "night_share": 1.0 - day,
+    }
+    return RequestBatch.from_columns(columns, vat_by_market={"ROI": 0.23, "NI": 0.20})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quotes", type=int, default=10_000)
+    parser.add_argument("--paths", type=int, default=5_000)
+    parser.add_argument("--max-cells", type=int, default=4_000_000)
+    args = parser.parse_args()
+
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    engine.settings.risk_model = {"paths": args.paths, "max_cells": args.max_cells, "seed": 1}
+    batch = synthetic_book(args.quotes)
+    engine.market_tables()
+
+    t0 = time.perf_counter()
+    priced = engine.price_batch(batch)
+    t1 = time.perf_counter()
+
+    risk = (batch.band_weights.T * priced.stack.risk).sum(axis=0)
+    print(f"quotes x paths:  {args.quotes:,} x {args.paths:,}")
+    print(f"price_batch:     {t1 - t0:.2f}s")
+    flat = engine.settings.risk_pct["SME"]
+    print(f"risk premium:    {risk.min():.2f} - {risk.max():.2f} €/MWh (flat: {flat:.1%} of cost)")
+
+
+if __name__ == "__main__":
+    main()
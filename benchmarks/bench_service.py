@@ -0,0 +1,97 @@
+"""Load-test a running quote service with concurrent keep-alive clients.
+
+    python -m pricing_engine serve --port 8080 &
+    python benchmarks/bench_service.py --port 8080 --clients 64 --requests 20000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+
+def request_bodies(n_distinct: int) -> list[bytes]:
+    """Distinct ROI day/night quote requests varying in consumption and split."""
+    bodies = []
+    for i in range(n_distinct):
+        day = 0.5 + (i % 40) / 100
+        bodies.append(
+            json.dumps(
+                {
+                    "market": "ROI",
+                    "commodity": "ELEC",
+                    "segment": "SME",
+                    "tariff_structure": "daynight",
+                    "year": 2026,
+                    "contract_type": "fixed",
+                    "annual_consumption_kwh": 10_000 + 37.5 * i,
+                    "standing_charge_eur_per_year": 300,
+                    "band_split": {"DAY": day, "NIGHT": 1 - day},
+                }
+            ).encode()
+        )
+    return bodies
+
+
+async def client(host: str, port: int, bodies: list[bytes], latencies: list[float]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    for body in bodies:
+        started = time.perf_counter()
+        writer.write(
+            b"POST /quote HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+            + f"Content-Length: {len(body)}\r\n\r\n".encode()
+            + body
+        )
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+            if line == b"\r\n":
+                break
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - started)
+    writer.close()
+
+
+async def run(host: str, port: int, clients: int, requests: int, distinct: int) -> None:
+    bodies = request_bodies(distinct)
+    per_client = requests // clients
+    latencies: list[float] = []
+    started = time.perf_counter()
+    plans = [
+        [bodies[(c * per_client + i) % distinct] for i in range(per_client)]
+        for c in range(clients)
+    ]
+    await asyncio.gather(*(client(host, port, plan, latencies) for plan in plans))
+    elapsed = time.perf_counter() - started
+    ms = np.array(latencies) * 1000.0
+    print(
+        f"{len(ms):,} requests from {clients} clients in {elapsed:.2f}s "
+        f"({len(ms) / elapsed:,.0f} req/s); client p50 {np.percentile(ms, 50):.3f} ms, "
+        f"p99 {np.percentile(ms, 99):.3f} ms"
+    )
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b"GET /metrics HTTP/1.1\r\nConnection: close\r\n\r\n")
+    print((await reader.read()).split(b"\r\n\r\n", 1)[1].decode())
+    writer.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--distinct", type=int, default=100_000, help="Distinct request bodies")
+    args = parser.parse_args()
+    asyncio.run(run(args.host, args.port, args.clients, args.requests, args.distinct))
+
+
+if __name__ == "__main__":
+    main()
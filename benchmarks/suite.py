@@ -0,0 +1,288 @@
+"""Time the pricing pipeline on synthetic data and write the results as JSON.
+
+    python benchmarks/suite.py run --scale medium --output bench-new.json
+    python benchmarks/suite.py compare bench-old.json bench-new.json
+
+Each benchmark is repeated ``--repeat`` times; the JSON keeps the best and
+median wall time, the item count and the best time per item.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from pricing_engine.batch import RequestBatch
+from pricing_engine.charges import PassThroughLibrary
+from pricing_engine.config import load_settings
+from pricing_engine.export_csv import export_tariff_to_csv
+from pricing_engine.export_excel import export_tariff_to_excel
+from pricing_engine.market_data import (
+    MarketDataStore,
+    load_archetypes,
+    load_losses,
+    load_pass_through,
+    load_shaping_adders,
+    load_wholesale_curve,
+)
+from pricing_engine.market_index import MarketIndex
+from pricing_engine.sanity import check_tariff_bounds
+from pricing_engine.schemas import Commodity, Market, Segment, TimeBand
+from pricing_engine.tariff_engine import TariffEngine
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from synthetic import SyntheticSpec, customer_book, generate  # noqa: E402
+
+SCALES = {
+    "small": SyntheticSpec(years=1, charge_versions=1, customers=10_000),
+    "medium": SyntheticSpec(years=5, charge_versions=12, customers=100_000),
+    "large": SyntheticSpec(years=20, charge_versions=52, charges_per_band=4, customers=1_000_000),
+}
+# Per-quote benchmarks (single build_tariff, sanity, exporters) use at most this many quotes.
+SINGLE_QUOTES = 2_000
+EXPORT_QUOTES = 20
+
+
+class Suite:
+    def __init__(self, root: Path, spec: SyntheticSpec, repeat: int):
+        self.root = root
+        self.spec = spec
+        self.repeat = repeat
+        self.results: Dict[str, Dict[str, float]] = {}
+
+    def time(
+        self,
+        name: str,
+        items: int,
+        fn: Callable[..., Any],
+        setup: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        times = []
+        value = None
+        for _ in range(self.repeat):
+            arg = setup() if setup is not None else None
+            start = time.perf_counter()
+            value = fn(arg) if setup is not None else fn()
+            times.append(time.perf_counter() - start)
+        best = min(times)
+        self.results[name] = {
+            "seconds": best,
+            "median_seconds": statistics.median(times),
+            "items": items,
+            "per_item_us": best / max(items, 1) * 1e6,
+        }
+        per_item = self.results[name]["per_item_us"]
+        print(f"{name:<32} {best:9.4f}s  {items:>10,} items  {per_item:10.2f} us/item")
+        return value
+
+    def run(self) -> Dict[str, Dict[str, float]]:
+        spec, root = self.spec, self.root
+        start = time.perf_counter()
+        config = generate(root, spec)
+        book = customer_book(spec)
+        print(f"generated data in {time.perf_counter() - start:.2f}s under {root}")
+        settings = load_settings(config)
+
+        slices = [
+            (Market(m), c, s, y)
+            for m in spec.market_list
+            for c in Commodity
+            for s in Segment
+            for y in spec.year_list
+        ]
+        self.time(
+            "load_wholesale_curve",
+            len(slices),
+            lambda: [load_wholesale_curve(settings, root, m, c, y) for m, c, _, y in slices],
+        )
+        self.time(
+            "load_shaping_adders",
+            len(slices),
+            lambda: [load_shaping_adders(settings, root, m, c, y) for m, c, _, y in slices],
+        )
+        self.time(
+            "load_losses",
+            len(slices),
+            lambda: [load_losses(settings, root, m, c, s, y) for m, c, s, y in slices],
+        )
+        self.time(
+            "load_pass_through",
+            len(slices),
+            lambda: [load_pass_through(settings, root, m, c, s, y) for m, c, s, y in slices],
+        )
+        self.time("load_archetypes", 1, lambda: load_archetypes(settings, root))
+        self.time(
+            "market_index_compile",
+            len(slices),
+            lambda store: MarketIndex.from_store(store),
+            setup=lambda: MarketDataStore(settings, root),
+        )
+
+        charges = pd.read_csv(root / settings.file_paths["pass_through"])
+        library = self.time(
+            "pass_through_library", len(charges), lambda: PassThroughLibrary(charges)
+        )
+        band_keys = [(m, c, s, y, b) for m, c, s, y in slices for b in TimeBand]
+        self.time(
+            "pass_through_select_for_band",
+            len(band_keys),
+            lambda: [library.select_for_band(*key) for key in band_keys],
+        )
+        self.time("pass_through_find_overlaps", len(charges), library.find_overlaps)
+        self.time("pass_through_detect_changes", len(charges), library.detect_large_changes)
+
+        batch = RequestBatch.from_columns(book, vat_by_market=settings.vat)
+        requests = [batch.request(i) for i in range(min(len(batch), SINGLE_QUOTES))]
+        self.time(
+            "build_tariff_cold",
+            1,
+            lambda engine: engine.build_tariff(requests[0]),
+            setup=lambda: TariffEngine.from_config(config, root),
+        )
+        engine = TariffEngine.from_config(config, root)
+        engine.build_tariff(requests[0])
+        results = self.time(
+            "build_tariff", len(requests), lambda: [engine.build_tariff(r) for r in requests]
+        )
+        priced = self.time("price_batch", len(batch), lambda: engine.price_batch(batch))
+
+        bounds = settings.sanity
+        self.time(
+            "check_tariff_bounds",
+            len(results),
+            lambda: [
+                check_tariff_bounds(
+                    r, bounds["min_unit_rate_eur_per_kwh"], bounds["max_unit_rate_eur_per_kwh"]
+                )
+                for r in results
+            ],
+        )
+        self.time("check_bounds_batch", len(batch), lambda: engine.check_bounds(priced))
+
+        exports = results[:EXPORT_QUOTES]
+        out = root / "exports"
+        out.mkdir(exist_ok=True)
+        self.time(
+            "export_csv",
+            len(exports),
+            lambda: [export_tariff_to_csv(r, out / f"q{i}.csv") for i, r in enumerate(exports)],
+        )
+        self.time(
+            "export_excel",
+            len(exports),
+            lambda: [export_tariff_to_excel(r, out / f"q{i}.xlsx") for i, r in enumerate(exports)],
+        )
+        return self.results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run(args: argparse.Namespace) -> None:
+    spec = SCALES[args.scale]
+    overrides = {
+        name: getattr(args, name)
+        for name in ("markets", "years", "charge_versions", "charges_per_band", "customers", "seed")
+        if getattr(args, name) is not None
+    }
+    spec = replace(spec, **overrides)
+    with tempfile.TemporaryDirectory(prefix="pricing_bench_") as tmp:
+        results = Suite(Path(args.data_dir or tmp), spec, args.repeat).run()
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "scale": args.scale,
+            "repeat": args.repeat,
+        },
+        "spec": asdict(spec),
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nResults written to: {Path(args.output).resolve()}")
+
+
+def compare(args: argparse.Namespace) -> None:
+    base, new = (json.loads(Path(p).read_text()) for p in (args.baseline, args.candidate))
+    if base["spec"] != new["spec"]:
+        print("warning: the two runs used different synthetic data specs")
+    print(f"{'benchmark':<32} {'baseline':>11} {'candidate':>11} {'change':>8}")
+    regressions: List[str] = []
+    for name, result in new["results"].items():
+        old = base["results"].get(name)
+        if old is None:
+            print(f"{name:<32} {'-':>11} {result['seconds']:10.4f}s {'new':>8}")
+            continue
+        change = result["seconds"] / old["seconds"] - 1.0 if old["seconds"] else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  slower"
+            regressions.append(name)
+        print(f"{name:<32} {old['seconds']:10.4f}s {result['seconds']:10.4f}s {change:+8.1%}{flag}")
+    if regressions and args.fail:
+        raise SystemExit(f"{len(regressions)} benchmark(s) slower by more than {args.threshold:.0%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Generate data, time the pipeline, write JSON")
+    run_parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    run_parser.add_argument("--markets", type=int)
+    run_parser.add_argument("--years", type=int)
+    run_parser.add_argument("--charge-versions", type=int)
+    run_parser.add_argument("--charges-per-band", type=int)
+    run_parser.add_argument("--customers", type=int)
+    run_parser.add_argument("--seed", type=int)
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--output", default="benchmark-results.json")
+    run_parser.add_argument("--data-dir", help="Keep the generated data here (default: a temp dir)")
+
+    compare_parser = commands.add_parser("compare", help="Compare two JSON result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Flag slowdowns above this fraction"
+    )
+    compare_parser.add_argument(
+        "--fail", action="store_true", help="Exit non-zero on flagged slowdowns"
+    )
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        compare(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""Synthetic market data and customer books at scale, in the sample_data layout.
+
+    python benchmarks/synthetic.py --output /tmp/synthetic --years 10 --charge-versions 12
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from pricing_engine.schemas import (
+    Commodity,
+    Market,
+    Segment,
+    TariffStructure,
+    TIME_BANDS_BY_TARIFF,
+    TimeBand,
+)
+
+BASE_CONFIG = Path(__file__).resolve().parents[1] / "config" / "base.yaml"
+BANDS = [b.value for b in TimeBand]
+BASE_WHOLESALE = {"ELEC": 100.0, "GAS": 40.0}
+BAND_SHAPE = {"FLAT": 1.0, "DAY": 1.1, "NIGHT": 0.8, "PEAK": 1.3, "OFFPEAK": 0.85}
+# Network charges are set high enough that every quote clears the sanity floors.
+NETWORK = {"ELEC": 35.0, "GAS": 70.0}
+
+
+@dataclass
+class SyntheticSpec:
+    """How big to make the dataset.
+
+    ``markets`` is capped at the markets the schema knows (ROI and NI).
+    Pass-through rows number markets x 2 commodities x 2 segments x years x
+    5 bands x ``charges_per_band`` x ``charge_versions``.
+    """
+
+    markets: int = 2
+    years: int = 1
+    first_year: int = 2026
+    charge_versions: int = 1
+    charges_per_band: int = 2
+    customers: int = 10_000
+    seed: int = 0
+
+    @property
+    def market_list(self) -> List[str]:
+        return [m.value for m in list(Market)[: max(1, min(self.markets, len(Market)))]]
+
+    @property
+    def year_list(self) -> List[int]:
+        return list(range(self.first_year, self.first_year + self.years))
+
+
+def _curve_rows(spec: SyntheticSpec, rng: np.random.Generator, commodity: str, market: str):
+    for year in spec.year_list:
+        level = BASE_WHOLESALE[commodity] * (1.0 + 0.05 * rng.standard_normal())
+        for band in BANDS:
+            price = round(level * BAND_SHAPE[band], 2)
+            yield {
+                "year": year,
+                "market": market,
+                "commodity": commodity,
+                "band": band,
+                "price_eur_per_mwh": price,
+            }
+
+
+def pass_through_rows(spec: SyntheticSpec, rng: np.random.Generator) -> pd.DataFrame:
+    """Versioned charges: each year is split into ``charge_versions`` back-to-back periods."""
+    frames = []
+    for year in spec.year_list:
+        periods = spec.charge_versions + 1
+        bounds = pd.date_range(f"{year}-01-01", f"{year + 1}-01-01", periods=periods)
+        starts = bounds[:-1].normalize()
+        ends = (bounds[1:] - pd.Timedelta(days=1)).normalize()
+        ends = ends.where(ends >= starts, starts)
+        for market in spec.market_list:
+            for commodity in (c.value for c in Commodity):
+                for segment in (s.value for s in Segment):
+                    for band in BANDS:
+                        for c in range(spec.charges_per_band):
+                            levy = c % 2 == 1
+                            base = 5.0 if levy else NETWORK[commodity]
+                            values = base * (1 + 0.05 * rng.standard_normal(spec.charge_versions))
+                            frames.append(
+                                pd.DataFrame(
+                                    {
+                                        "region": market,
+                                        "commodity": commodity,
+                                        "segment": segment,
+                                        "year": year,
+                                        "band": band,
+                                        "charge_type": "LEVY" if levy else "NETWORK",
+                                        "name": f"{'Levy' if levy else 'Network'} {c} {band}",
+                                        "unit": "EUR_MWH",
+                                        "value": np.round(np.abs(values), 2),
+                                        "effective_from": starts.strftime("%Y-%m-%d"),
+                                        "effective_to": ends.strftime("%Y-%m-%d"),
+                                        "version": np.arange(1, spec.charge_versions + 1),
+                                    }
+                                )
+                            )
+    return pd.concat(frames, ignore_index=True)
+
+
+def customer_book(spec: SyntheticSpec) -> pd.DataFrame:
+    """``spec.customers`` priceable quote requests in the reprice-book layout."""
+    rng = np.random.default_rng(spec.seed + 1)
+    n = spec.customers
+    tariffs = np.array([t.value for t in TariffStructure])
+    tariff = tariffs[rng.integers(0, len(tariffs), n)]
+    segment = np.where(rng.random(n) < 0.8, Segment.SME.value, Segment.IC.value)
+    first = 0.5 + 0.4 * rng.random(n)
+    shares: Dict[str, np.ndarray] = {f"{b.lower()}_share": np.zeros(n) for b in BANDS}
+    for structure in TariffStructure:
+        rows = tariff == structure.value
+        bands = TIME_BANDS_BY_TARIFF[structure]
+        if len(bands) == 1:
+            shares[f"{bands[0].value.lower()}_share"][rows] = 1.0
+        else:
+            shares[f"{bands[0].value.lower()}_share"][rows] = first[rows]
+            shares[f"{bands[1].value.lower()}_share"][rows] = 1.0 - first[rows]
+    return pd.DataFrame(
+        {
+            "customer_id": np.arange(n),
+            "market": np.array(spec.market_list)[rng.integers(0, len(spec.market_list), n)],
+            "commodity": np.where(rng.random(n) < 0.7, "ELEC", "GAS"),
+            "segment": segment,
+            "tariff_structure": tariff,
+            "year": np.array(spec.year_list)[rng.integers(0, spec.years, n)],
+            "contract_type": "fixed",
+            "annual_consumption_kwh": np.where(segment == "SME", 50_000, 1_000_000)
+            * (0.2 + 1.6 * rng.random(n)),
+            "standing_charge_eur_per_year": np.where(segment == "SME", 300.0, 1_000.0),
+            **shares,
+        }
+    )
+
+
+def generate(root: str | Path, spec: SyntheticSpec) -> Path:
+    """Write market data, archetypes and a config under ``root``; return the config path."""
+    root = Path(root)
+    data = root / "data"
+    data.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(spec.seed)
+    markets = spec.market_list
+
+    wholesale: Dict[str, Dict[str, str]] = {}
+    for commodity in (c.value for c in Commodity):
+        wholesale[commodity] = {}
+        for market in Market:
+            # The config lists every market; unused ones get an empty curve.
+            rows = []
+            if market.value in markets:
+                rows = list(_curve_rows(spec, rng, commodity, market.value))
+            name = f"wholesale_{commodity.lower()}_{market.value.lower()}.csv"
+            columns = ["year", "market", "commodity", "band", "price_eur_per_mwh"]
+            pd.DataFrame(rows, columns=columns).to_csv(data / name, index=False)
+            wholesale[commodity][market.value] = f"data/{name}"
+
+    keys = [
+        (y, m, c, b)
+        for y in spec.year_list
+        for m in markets
+        for c in (c.value for c in Commodity)
+        for b in BANDS
+    ]
+    shaping = pd.DataFrame(keys, columns=["year", "market", "commodity", "band"])
+    shaping["adder_eur_per_mwh"] = shaping["band"].map(BAND_SHAPE) * 2.0
+    shaping.to_csv(data / "shaping_adders.csv", index=False)
+    losses = pd.DataFrame(
+        [(y, m, c, s.value, b) for y, m, c, b in keys for s in Segment],
+        columns=["year", "market", "commodity", "segment", "band"],
+    )
+    losses["loss_factor"] = np.where(losses["commodity"] == "ELEC", 1.08, 1.02)
+    losses.to_csv(data / "losses.csv", index=False)
+    pass_through_rows(spec, rng).to_csv(data / "pass_through_charges.csv", index=False)
+
+    archetypes = []
+    for m in markets:
+        for c in Commodity:
+            for s in Segment:
+                for t in TariffStructure:
+                    bands = [b.value for b in TIME_BANDS_BY_TARIFF[t]]
+                    split = [1.0] if len(bands) == 1 else [0.6, 0.4]
+                    row = {
+                        "archetype_id": f"{s.value}_{c.value}_{t.value}_{m}".upper(),
+                        "name": f"{s.value} {t.value} {c.value} {m}",
+                        "market": m,
+                        "commodity": c.value,
+                        "segment": s.value,
+                        "tariff_structure": t.value,
+                        "annual_consumption_kwh": 50_000 if s == Segment.SME else 1_000_000,
+                        "standing_charge_eur_per_year": 300 if s == Segment.SME else 1_000,
+                    }
+                    row.update({f"{b.lower()}_share": 0.0 for b in BANDS})
+                    row.update({f"{b.lower()}_share": w for b, w in zip(bands, split)})
+                    archetypes.append(row)
+    pd.DataFrame(archetypes).to_csv(data / "customer_archetypes.csv", index=False)
+
+    config = yaml.safe_load(BASE_CONFIG.read_text())
+    config["file_paths"] = {
+        "wholesale": wholesale,
+        "shaping_adders": "data/shaping_adders.csv",
+        "losses": "data/losses.csv",
+        "pass_through": "data/pass_through_charges.csv",
+        "customer_archetypes": "data/customer_archetypes.csv",
+    }
+    config_path = root / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config, sort_keys=False))
+    (root / "spec.yaml").write_text(yaml.safe_dump(asdict(spec), sort_keys=False))
+    return config_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--markets", type=int, default=2)
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--charge-versions", type=int, default=1)
+    parser.add_argument("--charges-per-band", type=int, default=2)
+    parser.add_argument("--customers", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    spec = SyntheticSpec(
+        markets=args.markets,
+        years=args.years,
+        charge_versions=args.charge_versions,
+        charges_per_band=args.charges_per_band,
+        customers=args.customers,
+        seed=args.seed,
+    )
+    config = generate(args.output, spec)
+    customer_book(spec).to_csv(Path(args.output) / "customers.csv", index=False)
+    print(f"Config: {config}")
+    print(f"Customer book: {Path(args.output) / 'customers.csv'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,17 @@
-from .tariff_engine import TariffEngine
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .tariff_engine import TariffEngine
 
 __all__ = ["TariffEngine"]
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str) -> Any:
+    # Imported on first use so `import pricing_engine` (and the CLI) stays cheap.
+    if name == "TariffEngine":
+        from .tariff_engine import TariffEngine
+
+        return TariffEngine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
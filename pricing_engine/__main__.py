@@ -1,18 +1,45 @@
 from __future__ import annotations
 
 import argparse
+import os
 from pathlib import Path
 
-from .export_csv import export_tariff_to_csv
-from .export_excel import export_tariff_to_excel
+from .config import load_settings
 from .schemas import Commodity, ContractType, Market, Segment, TariffStructure
 from .tariff_engine import TariffEngine
 
+# pandas, the exporters and the book/parallel modules are imported inside the
+# commands that use them: a plain `run` should not pay for them at startup.
+
+# Default on-disk result cache for `run` and the `cache` command.
+CACHE_ENV = "PRICING_ENGINE_CACHE"
+
+
+def _engine(args: argparse.Namespace) -> TariffEngine:
+    if args.snapshot:
+        return TariffEngine.from_snapshot(args.snapshot, args.config_path, args.data_root)
+    return TariffEngine.from_config(args.config_path, args.data_root)
+
 
 def main() -> None:
     parser = argparse.ArgumentParser(
         prog="pricing_engine", description="ROI + NI All-In Tariff Builder"
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each pipeline stage and print the breakdown to stderr when the command ends",
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="PATH",
+        help="Also run under cProfile and write the stats here (implies --profile)",
+    )
+    parser.add_argument(
+        "--profile-openmetrics",
+        metavar="PATH",
+        help="Write the stage timings in OpenMetrics text format (implies --profile)",
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     run_parser = subparsers.add_parser("run", help="Build a tariff for a given segment")
@@ -36,6 +63,10 @@ def main() -> None:
         default=".",
         help="Root directory for input files (config is relative to this).",
     )
+    run_parser.add_argument(
+        "--snapshot",
+        help="Compiled market data snapshot (.npz) to price from instead of the CSVs",
+    )
     run_parser.add_argument(
         "--output-excel",
         help="Path to Excel file to write quote (optional)",
@@ -49,11 +80,732 @@ def main() -> None:
         action="store_true",
         help="If set, estimated bill will be ex-VAT only.",
     )
+    run_parser.add_argument(
+        "--cache",
+        default=os.environ.get(CACHE_ENV),
+        help=f"SQLite result cache shared between runs (default: ${CACHE_ENV}, if set)",
+    )
+    run_parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=256.0,
+        help="Evict least recently used results beyond this size",
+    )
+
+    cache_parser = subparsers.add_parser("cache", help="Inspect or prune the result cache")
+    cache_parser.add_argument("action", choices=["stats", "prune", "clear"])
+    cache_parser.add_argument(
+        "--cache",
+        default=os.environ.get(CACHE_ENV),
+        required=CACHE_ENV not in os.environ,
+        help=f"SQLite result cache (default: ${CACHE_ENV})",
+    )
+    cache_parser.add_argument(
+        "--max-mb", type=float, help="prune: shrink the cache to this size"
+    )
+    cache_parser.add_argument(
+        "--older-than-days", type=float, help="prune: drop results unused for this long"
+    )
+
+    validate_parser = subparsers.add_parser(
+        "validate-charges",
+        help="Check a pass-through charge file for overlapping versions and large step changes",
+    )
+    validate_parser.add_argument(
+        "--charges-file",
+        help="Charge CSV to validate (defaults to the pass_through file in the config)",
+    )
+    validate_parser.add_argument(
+        "--config-path",
+        default="config/base.yaml",
+        help="Path to YAML config file",
+    )
+    validate_parser.add_argument(
+        "--data-root",
+        default=".",
+        help="Root directory for input files (config is relative to this).",
+    )
+    validate_parser.add_argument(
+        "--threshold",
+        type=float,
+        help="Step-change threshold as a fraction "
+        "(defaults to sanity.network_change_warn_threshold_pct)",
+    )
+    validate_parser.add_argument(
+        "--output-overlaps",
+        help="Path to CSV file to write overlap findings (optional)",
+    )
+    validate_parser.add_argument(
+        "--output-changes",
+        help="Path to CSV file to write large-change findings (optional)",
+    )
+
+    book_parser = subparsers.add_parser(
+        "reprice-book",
+        help="Price a customer book (CSV or Parquet) in streamed chunks",
+    )
+    book_parser.add_argument("--input", required=True, help="Customer book (.csv or .parquet)")
+    book_parser.add_argument(
+        "--output",
+        required=True,
+        help="Priced book to write (.csv or .parquet), or .xlsx for one workbook of cost stacks",
+    )
+    book_parser.add_argument(
+        "--band-dataset",
+        metavar="DIR",
+        help="Also write per-band cost stacks here, partitioned by market/commodity/segment",
+    )
+    book_parser.add_argument(
+        "--band-format",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="File format for --band-dataset",
+    )
+    book_parser.add_argument(
+        "--on-breach",
+        choices=["raise", "flag", "drop"],
+        help="Quotes outside the sanity bounds: stop, flag or drop them "
+        "(default: sanity.on_breach in the config)",
+    )
+    book_parser.add_argument(
+        "--violations",
+        metavar="PATH",
+        help="Write every sanity bound breach, by quote and band, here (.csv or .parquet)",
+    )
+    book_parser.add_argument(
+        "--year",
+        type=int,
+        help="Pricing year for books without a 'year' column",
+    )
+    book_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=50_000,
+        help="Rows read, priced and written per chunk",
+    )
+    book_parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Worker processes for pricing and writing (0 = one per CPU core)",
+    )
+    book_parser.add_argument(
+        "--config-path",
+        default="config/base.yaml",
+        help="Path to YAML config file",
+    )
+    book_parser.add_argument(
+        "--data-root",
+        default=".",
+        help="Root directory for input files (config is relative to this).",
+    )
+    book_parser.add_argument(
+        "--snapshot",
+        help="Compiled market data snapshot (.npz) to price from instead of the CSVs",
+    )
+    book_parser.add_argument(
+        "--exclude-vat",
+        action="store_true",
+        help="If set, estimated bills will be ex-VAT only (unless the book has vat_rate).",
+    )
+
+    pack_parser = subparsers.add_parser(
+        "quote-packs",
+        help="Write one quote workbook per customer in a book, across a process pool",
+    )
+    pack_parser.add_argument("--input", required=True, help="Customer book (.csv or .parquet)")
+    pack_parser.add_argument(
+        "--output-dir", required=True, help="Directory for the workbooks and manifest.csv"
+    )
+    pack_parser.add_argument(
+        "--year",
+        type=int,
+        help="Pricing year for books without a 'year' column",
+    )
+    pack_parser.add_argument(
+        "--processes",
+        type=int,
+        default=0,
+        help="Rendering processes (0 = one per CPU core, 1 = no pool)",
+    )
+    pack_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=5_000,
+        help="Book rows priced at a time; progress is printed per chunk",
+    )
+    pack_parser.add_argument(
+        "--config-path",
+        default="config/base.yaml",
+        help="Path to YAML config file",
+    )
+    pack_parser.add_argument(
+        "--data-root",
+        default=".",
+        help="Root directory for input files (config is relative to this).",
+    )
+    pack_parser.add_argument(
+        "--snapshot",
+        help="Compiled market data snapshot (.npz) to price from instead of the CSVs",
+    )
+    pack_parser.add_argument(
+        "--exclude-vat",
+        action="store_true",
+        help="If set, estimated bills will be ex-VAT only (unless the book has vat_rate).",
+    )
+
+    snapshot_parser = subparsers.add_parser(
+        "compile-snapshot",
+        help="Compile every configured input file into one memory-mappable snapshot",
+    )
+    snapshot_parser.add_argument("--output", required=True, help="Snapshot file to write (.npz)")
+    snapshot_parser.add_argument(
+        "--config-path",
+        default="config/base.yaml",
+        help="Path to YAML config file",
+    )
+    snapshot_parser.add_argument(
+        "--data-root",
+        default=".",
+        help="Root directory for input files (config is relative to this).",
+    )
+
+    meter_parser = subparsers.add_parser(
+        "ingest-meter-reads",
+        help="Aggregate half-hourly meter reads into per-customer band splits",
+    )
+    meter_parser.add_argument(
+        "--input",
+        required=True,
+        help="Interval reads (.csv or .parquet) with customer_id, timestamp, kwh",
+    )
+    meter_parser.add_argument(
+        "--output", required=True, help="Band-split table to write (.csv or .parquet)"
+    )
+    meter_parser.add_argument(
+        "--market",
+        choices=[m.value for m in Market],
+        help="Market for files without a 'market' column",
+    )
+    meter_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1_000_000,
+        help="Reads held in memory per chunk",
+    )
+    meter_parser.add_argument(
+        "--local-time",
+        action="store_true",
+        help="Naive timestamps are local clock time rather than UTC",
+    )
+    meter_parser.add_argument(
+        "--interval-ending",
+        action="store_true",
+        help="Timestamps mark the end of each half-hour rather than the start",
+    )
+    meter_parser.add_argument(
+        "--annualise",
+        action="store_true",
+        help="Scale metered kWh to a full year of reads",
+    )
+    meter_parser.add_argument("--year", type=int, help="Pricing year written to the table")
+    meter_parser.add_argument("--commodity", choices=[c.value for c in Commodity])
+    meter_parser.add_argument("--segment", choices=[s.value for s in Segment])
+    meter_parser.add_argument("--tariff", choices=[t.value for t in TariffStructure])
+    meter_parser.add_argument("--contract", choices=[c.value for c in ContractType])
+    meter_parser.add_argument("--standing-charge", type=float)
+
+    grid_parser = subparsers.add_parser(
+        "scenario-grid",
+        help="Evaluate a customer book under a grid of input shocks",
+    )
+    grid_parser.add_argument("--input", required=True, help="Customer book (.csv or .parquet)")
+    grid_parser.add_argument(
+        "--shocks",
+        required=True,
+        help="Scenario CSV: one row per scenario, columns named after the shocked inputs",
+    )
+    grid_parser.add_argument(
+        "--output", required=True, help="Directory for the (scenarios x quotes) .npy totals"
+    )
+    grid_parser.add_argument(
+        "--year",
+        type=int,
+        help="Pricing year for books without a 'year' column",
+    )
+    grid_parser.add_argument(
+        "--max-cells",
+        type=int,
+        default=1_000_000,
+        help="Scenario x quote cells evaluated per chunk",
+    )
+    grid_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=50_000,
+        help="Book rows read and evaluated at a time",
+    )
+    grid_parser.add_argument(
+        "--float32",
+        action="store_true",
+        help="Store the output grids as float32 to halve their size",
+    )
+    grid_parser.add_argument(
+        "--config-path",
+        default="config/base.yaml",
+        help="Path to YAML config file",
+    )
+    grid_parser.add_argument(
+        "--data-root",
+        default=".",
+        help="Root directory for input files (config is relative to this).",
+    )
+    grid_parser.add_argument(
+        "--snapshot",
+        help="Compiled market data snapshot (.npz) to price from instead of the CSVs",
+    )
+    grid_parser.add_argument(
+        "--exclude-vat",
+        action="store_true",
+        help="If set, estimated bills will be ex-VAT only (unless the book has vat_rate).",
+    )
+
+    changes_parser = subparsers.add_parser(
+        "reprice-changes",
+        help="Update a priced book for changed inputs, repricing only affected quotes",
+    )
+    changes_parser.add_argument("--input", required=True, help="Customer book (.csv or .parquet)")
+    changes_parser.add_argument(
+        "--previous",
+        required=True,
+        help="reprice-book output for the same book under the old inputs",
+    )
+    changes_parser.add_argument(
+        "--since",
+        required=True,
+        help="Snapshot (.npz) of the old inputs the previous book was priced from",
+    )
+    changes_parser.add_argument(
+        "--since-config",
+        help="Config the previous book was priced with (default: --config-path)",
+    )
+    changes_parser.add_argument(
+        "--output", required=True, help="Updated priced book to write (.csv or .parquet)"
+    )
+    changes_parser.add_argument(
+        "--feed", help="Change feed of old vs new rates to write (.csv or .parquet)"
+    )
+    changes_parser.add_argument(
+        "--year",
+        type=int,
+        help="Pricing year for books without a 'year' column",
+    )
+    changes_parser.add_argument(
+        "--config-path",
+        default="config/base.yaml",
+        help="Path to YAML config file",
+    )
+    changes_parser.add_argument(
+        "--data-root",
+        default=".",
+        help="Root directory for input files (config is relative to this).",
+    )
+    changes_parser.add_argument(
+        "--snapshot",
+        help="Compiled market data snapshot (.npz) to price from instead of the CSVs",
+    )
+    changes_parser.add_argument(
+        "--on-breach",
+        choices=["raise", "flag"],
+        help="Repriced quotes outside the sanity bounds: stop or flag them, as in the "
+        "reprice-book run (default: sanity.on_breach in the config)",
+    )
+    changes_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=50_000,
+        help="Rows of the book and previous output read, updated and written per chunk",
+    )
+    changes_parser.add_argument(
+        "--exclude-vat",
+        action="store_true",
+        help="If set, estimated bills will be ex-VAT only (unless the book has vat_rate).",
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run the quoting service: a warm engine behind a micro-batching HTTP API",
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    serve_parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    serve_parser.add_argument(
+        "--max-batch",
+        type=int,
+        default=1_024,
+        help="Most quote requests priced together in one batch",
+    )
+    serve_parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=0.2,
+        help="How long a batch waits for more requests after the first arrives",
+    )
+    serve_parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=0,
+        help="Keep up to this many priced quotes in an LRU cache (0 = no cache)",
+    )
+    serve_parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        help="Seconds a cached quote stays valid (default: until the inputs change)",
+    )
+    serve_parser.add_argument(
+        "--config-path",
+        default="config/base.yaml",
+        help="Path to YAML config file",
+    )
+    serve_parser.add_argument(
+        "--data-root",
+        default=".",
+        help="Root directory for input files (config is relative to this).",
+    )
+    serve_parser.add_argument(
+        "--snapshot",
+        help="Compiled market data snapshot (.npz) to price from instead of the CSVs",
+    )
 
     args = parser.parse_args()
+    if args.profile or args.profile_output or args.profile_openmetrics:
+        _profile(args)
+    else:
+        _run(args)
+
+
+def _profile(args: argparse.Namespace) -> None:
+    import sys
+    import time
+
+    from .instrumentation import METRICS
+
+    profiler = None
+    if args.profile_output:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    METRICS.reset()
+    METRICS.enable()
+    start = time.perf_counter()
+    try:
+        if profiler is not None:
+            profiler.runcall(_run, args)
+        else:
+            _run(args)
+    finally:
+        wall = time.perf_counter() - start
+        METRICS.disable()
+        err = sys.stderr
+        print("\n=== Stage Timings ===", file=err)
+        print(METRICS.format_table(wall), file=err)
+        if profiler is not None:
+            profiler.dump_stats(args.profile_output)
+            print(f"cProfile stats written to: {Path(args.profile_output).resolve()}", file=err)
+        if args.profile_openmetrics:
+            Path(args.profile_openmetrics).write_text(METRICS.to_openmetrics())
+            print(f"OpenMetrics written to: {Path(args.profile_openmetrics).resolve()}", file=err)
+
+
+def _run(args: argparse.Namespace) -> None:
+    if args.command == "compile-snapshot":
+        from .snapshot import compile_snapshot
 
-    if args.command == "run":
         engine = TariffEngine.from_config(args.config_path, args.data_root)
+        snapshot_id = compile_snapshot(engine.store, args.output)
+        print(f"Snapshot {snapshot_id} written to: {Path(args.output).resolve()}")
+
+    if args.command == "reprice-book":
+        from .book import RepriceStats, reprice_book
+        from .parallel import ParallelPricer
+
+        engine = _engine(args)
+
+        def report(stats: RepriceStats) -> None:
+            print(
+                f"  chunk {stats.chunks}: {stats.rows:,} rows priced "
+                f"({stats.rows_per_second:,.0f} rows/s)",
+                flush=True,
+            )
+
+        print("=== Book Repricing ===")
+        if args.processes == 1:
+            stats = reprice_book(
+                engine,
+                args.input,
+                args.output,
+                chunk_size=args.chunk_size,
+                year=args.year,
+                include_vat=not args.exclude_vat,
+                progress=report,
+                band_dataset=args.band_dataset,
+                band_format=args.band_format,
+                on_breach=args.on_breach,
+                violations_path=args.violations,
+            )
+        else:
+            with ParallelPricer(engine, processes=args.processes or None) as pricer:
+                stats = reprice_book(
+                    pricer,
+                    args.input,
+                    args.output,
+                    chunk_size=args.chunk_size,
+                    year=args.year,
+                    include_vat=not args.exclude_vat,
+                    progress=report,
+                    band_dataset=args.band_dataset,
+                    band_format=args.band_format,
+                    on_breach=args.on_breach,
+                    violations_path=args.violations,
+                    processes=pricer.processes,
+                )
+        print(
+            f"Priced {stats.rows:,} rows in {stats.seconds:.2f}s "
+            f"({stats.rows_per_second:,.0f} rows/s)"
+        )
+        print(f"Priced book written to: {Path(args.output).resolve()}")
+        if args.band_dataset:
+            print(f"Band dataset written to: {Path(args.band_dataset).resolve()}")
+        if stats.breaches:
+            action = "dropped" if stats.dropped else "flagged"
+            print(f"{stats.breaches:,} quotes outside the sanity bounds ({action}):")
+            print(stats.violations.to_string(index=False))
+        if args.violations:
+            print(f"Sanity violations written to: {Path(args.violations).resolve()}")
+
+    if args.command == "quote-packs":
+        from .quote_pack import MANIFEST_NAME, QuotePackStats, build_quote_packs
+
+        def report_packs(stats: QuotePackStats) -> None:
+            print(
+                f"  {stats.files:,} written, {stats.skipped:,} already done, "
+                f"{stats.failed:,} failed ({stats.files_per_second:,.1f} files/s)",
+                flush=True,
+            )
+
+        print("=== Quote Packs ===")
+        stats = build_quote_packs(
+            _engine(args),
+            args.input,
+            args.output_dir,
+            processes=args.processes or None,
+            chunk_size=args.chunk_size,
+            year=args.year,
+            include_vat=not args.exclude_vat,
+            progress=report_packs,
+        )
+        print(
+            f"Wrote {stats.files:,} workbooks in {stats.seconds:.2f}s "
+            f"({stats.files_per_second:,.1f} files/s); {stats.skipped:,} skipped as done"
+        )
+        print(f"Manifest: {(Path(args.output_dir) / MANIFEST_NAME).resolve()}")
+        if stats.failed:
+            raise SystemExit(f"{stats.failed:,} workbooks failed; see the manifest and re-run")
+
+    if args.command == "ingest-meter-reads":
+        from .metering import IngestStats, ingest_meter_reads
+
+        defaults = {
+            column: value
+            for column, value in (
+                ("commodity", args.commodity),
+                ("segment", args.segment),
+                ("tariff_structure", args.tariff),
+                ("contract_type", args.contract),
+                ("year", args.year),
+                ("standing_charge_eur_per_year", args.standing_charge),
+            )
+            if value is not None
+        }
+
+        def report(stats: IngestStats) -> None:
+            print(
+                f"  chunk {stats.chunks}: {stats.rows:,} reads, {stats.customers:,} customers "
+                f"({stats.rows_per_second:,.0f} rows/s)",
+                flush=True,
+            )
+
+        print("=== Meter Read Ingestion ===")
+        _table, stats = ingest_meter_reads(
+            args.input,
+            args.output,
+            market=Market(args.market) if args.market else None,
+            chunk_size=args.chunk_size,
+            local_time=args.local_time,
+            interval_ending=args.interval_ending,
+            annualise=args.annualise,
+            year=args.year,
+            defaults=defaults,
+            progress=report,
+        )
+        print(
+            f"Ingested {stats.rows:,} reads for {stats.customers:,} customers in "
+            f"{stats.seconds:.2f}s ({stats.rows_per_second:,.0f} rows/s)"
+        )
+        print(f"Band splits written to: {Path(args.output).resolve()}")
+
+    if args.command == "scenario-grid":
+        import time
+
+        import numpy as np
+        import pandas as pd
+
+        from .batch import RequestBatch
+        from .book import count_book_rows, iter_book_chunks, read_ahead
+        from .scenarios import ScenarioEngine, ScenarioShocks
+
+        engine = _engine(args)
+        vat_by_market = None if args.exclude_vat else engine.settings.vat
+        quotes = count_book_rows(args.input)
+        batches = (
+            RequestBatch.from_columns(chunk, year=args.year, vat_by_market=vat_by_market)
+            for chunk in read_ahead(iter_book_chunks(args.input, args.chunk_size))
+        )
+        shocks = ScenarioShocks.from_columns(pd.read_csv(args.shocks))
+
+        print("=== Scenario Grid ===")
+        start = time.perf_counter()
+        ScenarioEngine(engine, max_cells=args.max_cells).write_grid(
+            batches,
+            shocks,
+            args.output,
+            dtype=np.float32 if args.float32 else np.float64,
+            quotes=quotes,
+        )
+        seconds = time.perf_counter() - start
+        cells = len(shocks) * quotes
+        print(
+            f"Evaluated {len(shocks):,} scenarios x {quotes:,} quotes in {seconds:.2f}s "
+            f"({cells / seconds if seconds else 0.0:,.0f} cells/s)"
+        )
+        print(f"Scenario grid written to: {Path(args.output).resolve()}")
+
+    if args.command == "reprice-changes":
+        from .incremental import diff_inputs, reprice_changes
+
+        engine = _engine(args)
+        previous = TariffEngine.from_snapshot(
+            args.since, args.since_config or args.config_path, args.data_root
+        )
+        changes = diff_inputs(
+            previous.market_index(), engine.market_index(), previous.settings, engine.settings
+        )
+
+        print("=== Incremental Repricing ===")
+        for change in changes:
+            print(f"  {change.key.label}: {change.old} -> {change.new}")
+        stats = reprice_changes(
+            engine,
+            changes,
+            args.input,
+            args.previous,
+            args.output,
+            feed_path=args.feed,
+            year=args.year,
+            include_vat=not args.exclude_vat,
+            chunk_size=args.chunk_size,
+            on_breach=args.on_breach,
+        )
+        print(
+            f"{stats.changes} input changes; repriced {stats.repriced:,} of {stats.rows:,} "
+            f"rows in {stats.seconds:.2f}s"
+        )
+        if stats.breaches:
+            print(f"{stats.breaches:,} repriced quotes are outside the sanity bounds (flagged)")
+        print(f"Priced book written to: {Path(args.output).resolve()}")
+        if args.feed:
+            print(f"Change feed written to: {Path(args.feed).resolve()}")
+
+    if args.command == "serve":
+        import asyncio
+
+        from .quote_cache import QuoteCache
+        from .service import QuoteServer, QuoteService
+
+        engine = _engine(args)
+        if args.cache_size:
+            engine.quote_cache = QuoteCache(args.cache_size, args.cache_ttl)
+        service = QuoteService(engine, args.max_batch, args.max_wait_ms)
+        print(f"Serving quotes on http://{args.host}:{args.port} (POST /quote, GET /metrics)")
+        try:
+            asyncio.run(QuoteServer(service).serve_forever(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+
+    if args.command == "validate-charges":
+        import pandas as pd
+
+        from .charges import PassThroughLibrary
+
+        settings = load_settings(args.config_path)
+        charges_file = args.charges_file or (
+            Path(args.data_root) / settings.file_paths["pass_through"]
+        )
+        threshold = (
+            args.threshold
+            if args.threshold is not None
+            else float(settings.sanity["network_change_warn_threshold_pct"])
+        )
+
+        library = PassThroughLibrary(pd.read_csv(charges_file))
+        overlaps = library.find_overlaps()
+        changes = library.detect_large_changes(threshold_pct=threshold)
+
+        print("=== Charge File Validation ===")
+        print(f"File: {Path(charges_file).resolve()}")
+        print(f"Rows: {len(library.df):,}")
+        print(f"Overlapping versions: {len(overlaps):,}")
+        print(f"Step changes > {threshold:.0%}: {len(changes):,}")
+
+        if args.output_overlaps:
+            overlaps.to_csv(args.output_overlaps, index=False)
+            print(f"\nOverlaps exported to CSV: {Path(args.output_overlaps).resolve()}")
+        if args.output_changes:
+            changes.to_csv(args.output_changes, index=False)
+            print(f"Large changes exported to CSV: {Path(args.output_changes).resolve()}")
+
+        if not overlaps.empty:
+            raise SystemExit(1)
+
+    if args.command == "cache":
+        from .quote_cache import PersistentQuoteCache
+
+        cache = PersistentQuoteCache(args.cache)
+        if args.action == "prune":
+            removed = cache.prune(
+                max_bytes=int(args.max_mb * 1024 * 1024) if args.max_mb is not None else None,
+                older_than_s=(
+                    args.older_than_days * 86_400 if args.older_than_days is not None else None
+                ),
+            )
+            print(f"Removed {removed:,} cached results")
+        elif args.action == "clear":
+            cache.clear()
+            print("Cache cleared")
+        stats = cache.stats()
+        print("=== Result Cache ===")
+        print(f"File: {Path(stats['path']).resolve()}")
+        print(f"Entries: {stats['entries']:,}")
+        print(f"Size: {stats['bytes'] / 1024 / 1024:,.2f} MB")
+        print(f"Hits: {stats['hits']:,}  Misses: {stats['misses']:,}  Hit rate: {stats['hit_rate']:.1%}")
+
+    if args.command == "run":
+        engine = _engine(args)
+        if args.cache:
+            from .quote_cache import PersistentQuoteCache
+
+            engine.result_cache = PersistentQuoteCache(
+                args.cache, max_bytes=int(args.cache_max_mb * 1024 * 1024)
+            )
 
         result = engine.build_tariff_from_archetype(
             market=Market(args.market),
@@ -82,6 +834,7 @@ def main() -> None:
         print(f"Weighted all-in rate:      {result.weighted_all_in_eur_per_kwh:.5f} €/kWh")
         print(f"Estimated annual bill (ex VAT): €{result.estimated_annual_bill_ex_vat:,.2f}")
         print(f"Estimated annual bill (inc VAT): €{result.estimated_annual_bill_inc_vat:,.2f}")
+        print(f"Market data snapshot: {result.snapshot_id}")
 
         if result.indexed_info is not None:
             print("\nIndexed product structure (adders vs index in €/MWh):")
@@ -90,10 +843,14 @@ def main() -> None:
 
         # Optional file exports
         if args.output_csv:
+            from .export_csv import export_tariff_to_csv
+
             export_tariff_to_csv(result, args.output_csv)
             print(f"\nTariff build exported to CSV: {Path(args.output_csv).resolve()}")
 
         if args.output_excel:
+            from .export_excel import export_tariff_to_excel
+
             export_tariff_to_excel(result, args.output_excel)
             print(f"Excel quote exported to: {Path(args.output_excel).resolve()}")
 
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .batch import CONTRACT_TYPES, SHARE_COLUMNS, RequestBatch, TariffResultBatch
+from .market_index import MarketIndex
+from .schemas import (
+    Commodity,
+    ContractType,
+    Market,
+    Segment,
+    TariffResult,
+    TariffStructure,
+)
+from .tariff_engine import TariffEngine
+
+# (market, commodity, segment, tariff structure, year, contract type, include VAT)
+GridKey = Tuple[Market, Commodity, Segment, TariffStructure, int, ContractType, bool]
+
+_ARCHETYPE_COLUMNS = [
+    "market",
+    "commodity",
+    "segment",
+    "tariff_structure",
+    "annual_consumption_kwh",
+    "standing_charge_eur_per_year",
+    *SHARE_COLUMNS.values(),
+]
+
+
+@dataclass
+class ArchetypeGrid:
+    """Every archetype priced for every year, contract type and VAT choice in one batch.
+
+    ``results[key]`` matches build_tariff_from_archetype for the same inputs.
+    Combinations without market data are left out; quotes outside the
+    sanity bounds are kept, and their keys listed in ``breached``.
+    """
+
+    priced: TariffResultBatch
+    results: Dict[GridKey, TariffResult]
+    breached: Set[GridKey]
+
+    @classmethod
+    def build(cls, engine: TariffEngine) -> "ArchetypeGrid":
+        index = engine.market_index()
+        grid: List[Tuple[Dict[str, Any], int, ContractType, bool]] = [
+            (row, year, contract, include_vat)
+            for row in index.archetype_rows()
+            for year in index.years()
+            for contract in CONTRACT_TYPES
+            for include_vat in (True, False)
+        ]
+        if not grid:
+            raise ValueError("No customer archetypes or market data years to price")
+
+        columns: Dict[str, List[Any]] = {
+            name: [row.get(name, 0.0) for row, *_ in grid] for name in _ARCHETYPE_COLUMNS
+        }
+        columns["year"] = [year for _, year, _, _ in grid]
+        columns["contract_type"] = [contract.value for _, _, contract, _ in grid]
+        columns["vat_rate"] = [
+            float(engine.settings.vat[row["market"]]) if include_vat else 0.0
+            for row, _, _, include_vat in grid
+        ]
+        batch = RequestBatch.from_columns(columns)
+        _, ok = engine.market_tables().locate(batch)
+        available = np.flatnonzero(ok)
+        priced = engine.price_batch(batch.take(available), on_breach="flag")
+
+        results: Dict[GridKey, TariffResult] = {}
+        breached: Set[GridKey] = set()
+        for i, g in enumerate(available):
+            row, year, contract, include_vat = grid[g]
+            key = (
+                Market(row["market"]),
+                Commodity(row["commodity"]),
+                Segment(row["segment"]),
+                TariffStructure(row["tariff_structure"]),
+                year,
+                contract,
+                include_vat,
+            )
+            results[key] = priced.result(i)
+            if priced.breach[i]:
+                breached.add(key)
+        return cls(priced=priced, results=results, breached=breached)
+
+    def years(self) -> List[int]:
+        return sorted({key[4] for key in self.results})
+
+
+def sample_portfolio(index: MarketIndex, quotes: int, year: int, seed: int = 0) -> pd.DataFrame:
+    """``quotes`` customers drawn from the archetypes, in the reprice-book layout.
+
+    Each keeps its archetype's band split and standing charge; annual
+    consumption is scaled by a lognormal factor (median 1).
+    """
+    rows = index.archetype_rows()
+    if not rows:
+        raise ValueError("No customer archetypes to sample from")
+    rng = np.random.default_rng(seed)
+    pick = rng.integers(0, len(rows), quotes)
+    book = pd.DataFrame(
+        {
+            name: np.asarray([row.get(name, 0.0) for row in rows])[pick]
+            for name in _ARCHETYPE_COLUMNS
+        }
+    )
+    book.insert(0, "customer_id", [f"S{i:06d}" for i in range(quotes)])
+    scale = rng.lognormal(0.0, 0.5, quotes)
+    book["annual_consumption_kwh"] = book["annual_consumption_kwh"].astype(float) * scale
+    book["year"] = year
+    book["contract_type"] = ContractType.FIXED.value
+    return book
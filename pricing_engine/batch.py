@@ -0,0 +1,632 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .cost_stack import CostStack, band_cost_stack, weighted_rate
+from .schemas import (
+    Commodity,
+    ContractType,
+    IndexedTariffInfo,
+    Market,
+    Segment,
+    TariffComponent,
+    TariffRequest,
+    TariffResult,
+    TariffStructure,
+    TIME_BANDS_BY_TARIFF,
+    TimeBand,
+)
+
+# Integer codes used by the columnar batch representation. Position in these
+# lists is the code stored in the arrays.
+MARKETS: List[Market] = list(Market)
+COMMODITIES: List[Commodity] = list(Commodity)
+SEGMENTS: List[Segment] = list(Segment)
+TARIFF_STRUCTURES: List[TariffStructure] = list(TariffStructure)
+CONTRACT_TYPES: List[ContractType] = list(ContractType)
+
+# Bands are stored in fixed slots: slot b holds TIME_BANDS_BY_TARIFF[tariff][b].
+MAX_BANDS = max(len(bands) for bands in TIME_BANDS_BY_TARIFF.values())
+
+# Band share columns, as in customer_archetypes.csv
+SHARE_COLUMNS: Dict[TimeBand, str] = {band: f"{band.value.lower()}_share" for band in TimeBand}
+
+
+# Band shares must sum to 1 within this tolerance, as in CustomerArchetype.band_split.
+SHARE_TOLERANCE = 1e-3
+# (tariff code, slot) -> True for the slots the tariff uses
+_USED_SLOTS = np.array(
+    [[b < len(TIME_BANDS_BY_TARIFF[t]) for b in range(MAX_BANDS)] for t in TARIFF_STRUCTURES]
+)
+
+
+def _check_band_weights(
+    columns: Mapping[str, Any], tariff: np.ndarray, weights: np.ndarray
+) -> None:
+    used = _USED_SLOTS[tariff]
+    total = np.where(used, weights, 0.0).sum(axis=1)
+    bad = ((np.isnan(weights) | (weights < 0)) & used).any(axis=1)
+    bad |= ~(np.abs(total - 1.0) <= SHARE_TOLERANCE)
+    if not bad.any():
+        return
+    i = int(np.flatnonzero(bad)[0])
+    index = getattr(columns, "index", None)
+    label = f"Row {index[i] if index is not None else i}"
+    if "customer_id" in columns:
+        label += f" (customer_id {np.asarray(columns['customer_id'])[i]})"
+    structure = TARIFF_STRUCTURES[tariff[i]]
+    shares = {
+        SHARE_COLUMNS[band]: float(weights[i, b])
+        for b, band in enumerate(TIME_BANDS_BY_TARIFF[structure])
+    }
+    more = int(bad.sum()) - 1
+    raise ValueError(
+        f"{label}: {structure.value} band shares {shares} must be non-negative and sum to 1.0"
+        + (f" ({more} more rows like this)" if more else "")
+    )
+
+
+def _codes(values: Sequence, members: List) -> np.ndarray:
+    if len(values) < 256:
+        lookup = {m: i for i, m in enumerate(members)}  # str enums also match their values
+        return np.fromiter((lookup[v] for v in values), dtype=np.int8, count=len(values))
+    values = np.asarray(values, dtype=object)
+    codes = np.full(len(values), -1, dtype=np.int8)
+    for i, member in enumerate(members):
+        codes[values == member.value] = i  # str enum members also match their values
+    if (codes < 0).any():
+        raise KeyError(values[codes < 0][0])
+    return codes
+
+
+def slot_bands(tariff_structure: TariffStructure) -> List[Optional[TimeBand]]:
+    bands: List[Optional[TimeBand]] = list(TIME_BANDS_BY_TARIFF[tariff_structure])
+    return bands + [None] * (MAX_BANDS - len(bands))
+
+
+@dataclass
+class RequestBatch:
+    """Columnar view of N tariff requests."""
+
+    market: np.ndarray
+    commodity: np.ndarray
+    segment: np.ndarray
+    tariff_structure: np.ndarray
+    contract_type: np.ndarray
+    year: np.ndarray
+    annual_consumption_kwh: np.ndarray
+    standing_charge_eur_per_year: np.ndarray
+    vat_rate: np.ndarray
+    band_weights: np.ndarray  # (N, MAX_BANDS), slot order
+    requests: Optional[List[TariffRequest]] = None
+
+    def __len__(self) -> int:
+        return len(self.year)
+
+    def slice(self, rows: slice) -> "RequestBatch":
+        """Rows ``rows`` of the batch as views."""
+        arrays = {
+            f.name: getattr(self, f.name)[rows] for f in fields(self) if f.name != "requests"
+        }
+        requests = self.requests[rows] if self.requests is not None else None
+        return RequestBatch(**arrays, requests=requests)
+
+    def take(self, rows: np.ndarray) -> "RequestBatch":
+        """The requests at positions ``rows`` (copies)."""
+        arrays = {
+            f.name: getattr(self, f.name)[rows] for f in fields(self) if f.name != "requests"
+        }
+        requests = [self.requests[i] for i in rows] if self.requests is not None else None
+        return RequestBatch(**arrays, requests=requests)
+
+    @classmethod
+    def from_requests(cls, requests: Sequence[TariffRequest]) -> "RequestBatch":
+        requests = list(requests)
+        n = len(requests)
+        weights = np.zeros((n, MAX_BANDS), dtype=float)
+        for i, req in enumerate(requests):
+            for b, band in enumerate(TIME_BANDS_BY_TARIFF[req.tariff_structure]):
+                weights[i, b] = req.band_split[band]
+        return cls(
+            market=_codes([r.market for r in requests], MARKETS),
+            commodity=_codes([r.commodity for r in requests], COMMODITIES),
+            segment=_codes([r.segment for r in requests], SEGMENTS),
+            tariff_structure=_codes([r.tariff_structure for r in requests], TARIFF_STRUCTURES),
+            contract_type=_codes([r.contract_type for r in requests], CONTRACT_TYPES),
+            year=np.fromiter((r.year for r in requests), dtype=np.int32, count=n),
+            annual_consumption_kwh=np.fromiter(
+                (r.annual_consumption_kwh for r in requests), dtype=float, count=n
+            ),
+            standing_charge_eur_per_year=np.fromiter(
+                (r.standing_charge_eur_per_year for r in requests), dtype=float, count=n
+            ),
+            vat_rate=np.fromiter(
+                (r.vat_rate if r.vat_rate is not None else 0.0 for r in requests),
+                dtype=float,
+                count=n,
+            ),
+            band_weights=weights,
+            requests=requests,
+        )
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: Mapping[str, Any],
+        year: Optional[int] = None,
+        vat_by_market: Optional[Mapping[str, float]] = None,
+    ) -> "RequestBatch":
+        """Build from tabular columns (a DataFrame chunk or dict of arrays).
+
+        Expects market, commodity, segment, tariff_structure, contract_type,
+        annual_consumption_kwh, standing_charge_eur_per_year and the band
+        ``*_share`` columns. ``year`` and ``vat_rate`` columns are optional and
+        fall back to the ``year`` argument and ``vat_by_market`` (else 0); so
+        do blank ``vat_rate`` cells. Raises ValueError, naming the first bad
+        row, if the shares of a tariff's bands are blank, negative or do not
+        sum to 1.
+        """
+        market = _codes(np.asarray(columns["market"]), MARKETS)
+        tariff = _codes(np.asarray(columns["tariff_structure"]), TARIFF_STRUCTURES)
+        n = len(market)
+
+        if "year" in columns:
+            years = np.asarray(columns["year"], dtype=np.int32)
+        elif year is not None:
+            years = np.full(n, year, dtype=np.int32)
+        else:
+            raise ValueError("Book has no 'year' column and no year was given")
+
+        if vat_by_market is not None:
+            vat = np.array([float(vat_by_market[m.value]) for m in MARKETS])[market]
+        else:
+            vat = np.zeros(n)
+        if "vat_rate" in columns:
+            given = np.asarray(columns["vat_rate"], dtype=float)
+            vat = np.where(np.isnan(given), vat, given)
+
+        weights = np.zeros((n, MAX_BANDS), dtype=float)
+        for t, structure in enumerate(TARIFF_STRUCTURES):
+            rows = tariff == t
+            if not rows.any():
+                continue
+            for b, band in enumerate(TIME_BANDS_BY_TARIFF[structure]):
+                weights[rows, b] = np.asarray(columns[SHARE_COLUMNS[band]], dtype=float)[rows]
+        _check_band_weights(columns, tariff, weights)
+
+        return cls(
+            market=market,
+            commodity=_codes(np.asarray(columns["commodity"]), COMMODITIES),
+            segment=_codes(np.asarray(columns["segment"]), SEGMENTS),
+            tariff_structure=tariff,
+            contract_type=_codes(np.asarray(columns["contract_type"]), CONTRACT_TYPES),
+            year=years,
+            annual_consumption_kwh=np.asarray(columns["annual_consumption_kwh"], dtype=float),
+            standing_charge_eur_per_year=np.asarray(
+                columns["standing_charge_eur_per_year"], dtype=float
+            ),
+            vat_rate=vat,
+            band_weights=weights,
+        )
+
+    def request(self, i: int) -> TariffRequest:
+        if self.requests is not None:
+            return self.requests[i]
+        tariff_structure = TARIFF_STRUCTURES[self.tariff_structure[i]]
+        band_split = {
+            band: float(self.band_weights[i, b])
+            for b, band in enumerate(TIME_BANDS_BY_TARIFF[tariff_structure])
+        }
+        return TariffRequest(
+            market=MARKETS[self.market[i]],
+            commodity=COMMODITIES[self.commodity[i]],
+            segment=SEGMENTS[self.segment[i]],
+            tariff_structure=tariff_structure,
+            year=int(self.year[i]),
+            contract_type=CONTRACT_TYPES[self.contract_type[i]],
+            annual_consumption_kwh=float(self.annual_consumption_kwh[i]),
+            standing_charge_eur_per_year=float(self.standing_charge_eur_per_year[i]),
+            band_split=band_split,
+            vat_rate=float(self.vat_rate[i]),
+        )
+
+
+@dataclass
+class PricingTables:
+    """Dense pricing inputs for every (year, market, commodity, segment, tariff) combination.
+
+    Band arrays have shape (MAX_BANDS, years, markets, commodities, segments,
+    tariffs), band slot first so a batch lookup yields contiguous (MAX_BANDS, N)
+    rows; ``available`` marks combinations whose inputs are complete.
+    Everything is a plain NumPy array so the tables can be memory-mapped and
+    shared with worker processes.
+    """
+
+    years: np.ndarray
+    wholesale: np.ndarray
+    shaping: np.ndarray
+    loss_factor: np.ndarray
+    network: np.ndarray
+    levies: np.ndarray
+    valid: np.ndarray
+    available: np.ndarray
+    margin_pct: np.ndarray  # by segment code
+    risk_pct: np.ndarray  # by segment code
+    version: str = ""
+
+    ARRAYS = (
+        "years",
+        "wholesale",
+        "shaping",
+        "loss_factor",
+        "network",
+        "levies",
+        "valid",
+        "available",
+        "margin_pct",
+        "risk_pct",
+    )
+
+    @classmethod
+    def build(cls, index: Any, settings: Any, years: Sequence[int]) -> "PricingTables":
+        years_arr = np.array(sorted(set(int(y) for y in years)), dtype=np.int32)
+        shape = (
+            len(years_arr),
+            len(MARKETS),
+            len(COMMODITIES),
+            len(SEGMENTS),
+            len(TARIFF_STRUCTURES),
+        )
+        band_shape = (MAX_BANDS,) + shape
+        tables = cls(
+            years=years_arr,
+            wholesale=np.zeros(band_shape),
+            shaping=np.zeros(band_shape),
+            loss_factor=np.ones(band_shape),
+            network=np.zeros(band_shape),
+            levies=np.zeros(band_shape),
+            valid=np.zeros(band_shape, dtype=bool),
+            available=np.zeros(shape, dtype=bool),
+            margin_pct=np.array([float(settings.margin_pct[s.value]) for s in SEGMENTS]),
+            risk_pct=np.array([float(settings.risk_pct[s.value]) for s in SEGMENTS]),
+            version=getattr(index, "version", ""),
+        )
+        for key in np.ndindex(*shape):
+            y, m, c, s, t = key
+            bands = TIME_BANDS_BY_TARIFF[TARIFF_STRUCTURES[t]]
+            try:
+                band_inputs = index.band_inputs(
+                    MARKETS[m], COMMODITIES[c], SEGMENTS[s], int(years_arr[y]), bands
+                )
+            except (ValueError, KeyError, FileNotFoundError):
+                continue
+            for b, row in enumerate(band_inputs):
+                (
+                    tables.wholesale[(b,) + key],
+                    tables.shaping[(b,) + key],
+                    tables.loss_factor[(b,) + key],
+                    tables.network[(b,) + key],
+                    tables.levies[(b,) + key],
+                ) = row
+                tables.valid[(b,) + key] = True
+            tables.available[key] = True
+        return tables
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in self.ARRAYS}
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray], version: str = "") -> "PricingTables":
+        return cls(**{name: arrays[name] for name in cls.ARRAYS}, version=version)
+
+    def gather(self, batch: RequestBatch) -> Dict[str, np.ndarray]:
+        """(MAX_BANDS, N) band inputs for each request, keyed like price_band_inputs."""
+        key, _ = self.locate(batch)
+        flat = np.ravel_multi_index(key, self.available.shape)
+        # take() keeps each (MAX_BANDS, N) result C-contiguous, one row per slot.
+        return {
+            name: np.take(getattr(self, name).reshape(MAX_BANDS, -1), flat, axis=1)
+            for name in ("wholesale", "shaping", "loss_factor", "network", "levies", "valid")
+        }
+
+    def locate(self, batch: RequestBatch) -> tuple[tuple, np.ndarray]:
+        """Table coordinates for each request and a mask of requests with complete inputs."""
+        if not len(self.years):
+            raise ValueError("No market data years available to price against")
+        y = np.minimum(np.searchsorted(self.years, batch.year), len(self.years) - 1)
+        key = (y, batch.market, batch.commodity, batch.segment, batch.tariff_structure)
+        return key, (self.years[y] == batch.year) & self.available[key]
+
+
+def price_with_tables(
+    tables: PricingTables, batch: RequestBatch, risk_model: Optional[Any] = None
+) -> "TariffResultBatch":
+    """Vectorised cost stack for a batch whose inputs are all available in ``tables``.
+
+    With a ``risk_model`` (see pricing_engine.risk) each quote's risk_pct is
+    simulated instead of taken from the per-segment table.
+    """
+    inputs = tables.gather(batch)
+    risk_pct = (
+        tables.risk_pct[batch.segment]
+        if risk_model is None
+        else risk_model.risk_pct(batch, inputs)
+    )
+    return price_band_inputs(
+        batch,
+        **inputs,
+        margin_pct=tables.margin_pct[batch.segment],
+        risk_pct=risk_pct,
+        snapshot_id=tables.version,
+    )
+
+
+def price_band_inputs(
+    batch: RequestBatch,
+    wholesale: np.ndarray,
+    shaping: np.ndarray,
+    loss_factor: np.ndarray,
+    network: np.ndarray,
+    levies: np.ndarray,
+    margin_pct: Any,
+    risk_pct: Any,
+    valid: np.ndarray,
+    snapshot_id: str = "",
+) -> "TariffResultBatch":
+    """Cost stack and totals from (MAX_BANDS, N) band inputs, as build_tariff computes them."""
+    indexed = batch.contract_type == CONTRACT_TYPES.index(ContractType.INDEXED)
+    wholesale_used = np.where(indexed, 0.0, wholesale)
+
+    stack = band_cost_stack(
+        wholesale_used, shaping, loss_factor, network, levies, margin_pct, risk_pct
+    )
+    energy_only = stack.energy_only
+    all_in = stack.all_in
+
+    weights = batch.band_weights.T
+    weighted_energy_only_eur_per_kwh = weighted_rate(weights, energy_only) / 1000.0
+    weighted_all_in_eur_per_kwh = weighted_rate(weights, all_in) / 1000.0
+
+    annual_energy_cost = weighted_all_in_eur_per_kwh * batch.annual_consumption_kwh
+    annual_bill_ex_vat = annual_energy_cost + batch.standing_charge_eur_per_year
+    annual_bill_inc_vat = annual_bill_ex_vat * (1.0 + batch.vat_rate)
+
+    return TariffResultBatch(
+        batch=batch,
+        stack=stack,
+        energy_only=energy_only,
+        all_in=all_in,
+        valid=valid,
+        weighted_energy_only_eur_per_kwh=np.asarray(weighted_energy_only_eur_per_kwh),
+        weighted_all_in_eur_per_kwh=np.asarray(weighted_all_in_eur_per_kwh),
+        estimated_annual_bill_ex_vat=np.asarray(annual_bill_ex_vat),
+        estimated_annual_bill_inc_vat=np.asarray(annual_bill_inc_vat),
+        snapshot_id=snapshot_id,
+    )
+
+
+# SLOT_BAND_CODES[tariff code, slot] is the TimeBand code in that slot, -1 if unused.
+BANDS: List[TimeBand] = list(TimeBand)
+SLOT_BAND_CODES = np.array(
+    [[BANDS.index(b) if b is not None else -1 for b in slot_bands(t)] for t in TARIFF_STRUCTURES],
+    dtype=np.int8,
+)
+
+REQUEST_CATEGORIES = {
+    "market": MARKETS,
+    "commodity": COMMODITIES,
+    "segment": SEGMENTS,
+    "tariff_structure": TARIFF_STRUCTURES,
+    "contract_type": CONTRACT_TYPES,
+}
+TOTAL_COLUMNS = (
+    "weighted_energy_only_eur_per_kwh",
+    "weighted_all_in_eur_per_kwh",
+    "estimated_annual_bill_ex_vat",
+    "estimated_annual_bill_inc_vat",
+)
+
+
+@dataclass
+class TariffResultBatch:
+    """Struct-of-arrays pricing output for a RequestBatch.
+
+    Band arrays (``stack`` fields, ``energy_only``, ``all_in``, ``valid``) are
+    (MAX_BANDS, N), so each band slot is one contiguous column. Totals are (N,).
+    A pydantic TariffResult is only built when a row is asked for.
+    """
+
+    batch: RequestBatch
+    stack: CostStack
+    energy_only: np.ndarray  # €/MWh
+    all_in: np.ndarray  # €/MWh
+    valid: np.ndarray  # bool, False for unused band slots
+    weighted_energy_only_eur_per_kwh: np.ndarray
+    weighted_all_in_eur_per_kwh: np.ndarray
+    estimated_annual_bill_ex_vat: np.ndarray
+    estimated_annual_bill_inc_vat: np.ndarray
+    snapshot_id: str = ""
+    # bool per quote, outside the sanity bounds; set when priced with on_breach="flag"
+    breach: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.batch)
+
+    def __getitem__(self, i: int) -> TariffResult:
+        return self.result(i)
+
+    def slice(self, rows: slice) -> "TariffResultBatch":
+        """Quotes ``rows`` of the batch as views."""
+        return self._select(self.batch.slice(rows), rows)
+
+    def take(self, rows: np.ndarray) -> "TariffResultBatch":
+        """The quotes at positions ``rows`` (copies)."""
+        return self._select(self.batch.take(rows), rows)
+
+    def _select(self, batch: RequestBatch, rows: Any) -> "TariffResultBatch":
+        return TariffResultBatch(
+            batch=batch,
+            stack=CostStack(*(values[:, rows] for values in self.stack)),
+            energy_only=self.energy_only[:, rows],
+            all_in=self.all_in[:, rows],
+            valid=self.valid[:, rows],
+            **{name: getattr(self, name)[rows] for name in TOTAL_COLUMNS},
+            snapshot_id=self.snapshot_id,
+            breach=self.breach[rows] if self.breach is not None else None,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        arrays = list(self.stack) + [self.energy_only, self.all_in, self.valid]
+        arrays += [getattr(self, name) for name in TOTAL_COLUMNS]
+        arrays += [
+            getattr(self.batch, name)
+            for name in list(REQUEST_CATEGORIES)
+            + ["year", "annual_consumption_kwh", "standing_charge_eur_per_year", "vat_rate"]
+        ]
+        arrays.append(self.batch.band_weights)
+        return sum(a.nbytes for a in arrays)
+
+    def result(self, i: int) -> TariffResult:
+        request = self.batch.request(i)
+        stack = self.stack
+
+        components: List[TariffComponent] = []
+        for b, band in enumerate(TIME_BANDS_BY_TARIFF[request.tariff_structure]):
+            components.append(
+                TariffComponent(
+                    band=band,
+                    wholesale_eur_per_mwh=float(stack.wholesale[b, i]),
+                    shaping_eur_per_mwh=float(stack.shaping[b, i]),
+                    losses_eur_per_mwh=float(stack.losses[b, i]),
+                    network_eur_per_mwh=float(stack.network[b, i]),
+                    levies_eur_per_mwh=float(stack.levies[b, i]),
+                    margin_eur_per_mwh=float(stack.margin[b, i]),
+                    risk_eur_per_mwh=float(stack.risk[b, i]),
+                )
+            )
+
+        indexed_info: IndexedTariffInfo | None = None
+        if request.contract_type == ContractType.INDEXED:
+            indexed_info = IndexedTariffInfo(
+                band_adders_energy_only_eur_per_mwh={
+                    c.band: c.energy_only_eur_per_mwh for c in components
+                },
+                band_adders_all_in_eur_per_mwh={c.band: c.all_in_eur_per_mwh for c in components},
+            )
+
+        return TariffResult(
+            request=request,
+            components=components,
+            weighted_energy_only_eur_per_kwh=float(self.weighted_energy_only_eur_per_kwh[i]),
+            weighted_all_in_eur_per_kwh=float(self.weighted_all_in_eur_per_kwh[i]),
+            estimated_annual_bill_ex_vat=float(self.estimated_annual_bill_ex_vat[i]),
+            estimated_annual_bill_inc_vat=float(self.estimated_annual_bill_inc_vat[i]),
+            indexed_info=indexed_info,
+            snapshot_id=self.snapshot_id,
+        )
+
+    def results(self) -> List[TariffResult]:
+        return [self.result(i) for i in range(len(self))]
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Flat per-quote columns, band slots as ``band{n}_*``; numeric columns are views.
+
+        Categorical columns (``market`` ... ``contract_type``, ``band{n}``) are
+        integer codes into REQUEST_CATEGORIES / BANDS, with -1 for an unused slot.
+        """
+        batch = self.batch
+        columns: Dict[str, np.ndarray] = {name: getattr(batch, name) for name in REQUEST_CATEGORIES}
+        columns["year"] = batch.year
+        columns["annual_consumption_kwh"] = batch.annual_consumption_kwh
+        columns["standing_charge_eur_per_year"] = batch.standing_charge_eur_per_year
+        columns["vat_rate"] = batch.vat_rate
+        slot_codes = SLOT_BAND_CODES[batch.tariff_structure]
+        for b in range(MAX_BANDS):
+            prefix = f"band{b + 1}"
+            columns[prefix] = slot_codes[:, b]
+            columns[f"{prefix}_weight"] = batch.band_weights[:, b]
+            for name, values in zip(CostStack._fields, self.stack):
+                columns[f"{prefix}_{name}_eur_per_mwh"] = values[b]
+            columns[f"{prefix}_energy_only_eur_per_mwh"] = self.energy_only[b]
+            columns[f"{prefix}_all_in_eur_per_mwh"] = self.all_in[b]
+        for name in TOTAL_COLUMNS:
+            columns[name] = getattr(self, name)
+        return columns
+
+    def _categories(self, name: str) -> List[str]:
+        members = BANDS if name.startswith("band") else REQUEST_CATEGORIES[name]
+        return [m.value for m in members]
+
+    def _is_categorical(self, name: str) -> bool:
+        return name in REQUEST_CATEGORIES or (name.startswith("band") and "_" not in name)
+
+    def to_dataframe(self) -> Any:
+        """pandas DataFrame over the batch columns, without copying numeric data."""
+        import pandas as pd
+
+        data: Dict[str, Any] = {}
+        for name, values in self.columns().items():
+            if self._is_categorical(name):
+                values = pd.Categorical.from_codes(values, categories=self._categories(name))
+            data[name] = values
+        df = pd.DataFrame(data, copy=False)
+        df.attrs["snapshot_id"] = self.snapshot_id
+        return df
+
+    def to_arrow(self) -> Any:
+        """pyarrow Table over the batch columns (dictionary-encoded categoricals)."""
+        try:
+            import pyarrow as pa
+        except ImportError as exc:  # pragma: no cover - depends on environment
+            raise ImportError(
+                "Arrow output needs pyarrow: pip install 'esb-tariff-engine[parquet]'"
+            ) from exc
+
+        arrays = {}
+        for name, values in self.columns().items():
+            if self._is_categorical(name):
+                codes = pa.array(values, mask=values < 0)
+                arrays[name] = pa.DictionaryArray.from_arrays(
+                    codes, pa.array(self._categories(name))
+                )
+            else:
+                arrays[name] = pa.array(values)
+        table = pa.table(arrays)
+        return table.replace_schema_metadata({"snapshot_id": self.snapshot_id})
+
+    def summary_columns(self) -> Dict[str, np.ndarray]:
+        """One value per quote: request fields, totals and all-in €/kWh per band."""
+        batch = self.batch
+        columns: Dict[str, np.ndarray] = {
+            "market": np.array([m.value for m in MARKETS])[batch.market],
+            "commodity": np.array([c.value for c in COMMODITIES])[batch.commodity],
+            "segment": np.array([s.value for s in SEGMENTS])[batch.segment],
+            "tariff_structure": np.array([t.value for t in TARIFF_STRUCTURES])[
+                batch.tariff_structure
+            ],
+            "contract_type": np.array([c.value for c in CONTRACT_TYPES])[batch.contract_type],
+            "year": batch.year,
+            "annual_consumption_kwh": batch.annual_consumption_kwh,
+            "standing_charge_eur_per_year": batch.standing_charge_eur_per_year,
+            "weighted_energy_only_eur_per_kwh": self.weighted_energy_only_eur_per_kwh,
+            "weighted_all_in_eur_per_kwh": self.weighted_all_in_eur_per_kwh,
+            "estimated_annual_bill_ex_vat": self.estimated_annual_bill_ex_vat,
+            "estimated_annual_bill_inc_vat": self.estimated_annual_bill_inc_vat,
+        }
+        all_in_kwh = self.all_in / 1000.0
+        for band in TimeBand:
+            rate = np.full(len(self), np.nan)
+            for t, structure in enumerate(TARIFF_STRUCTURES):
+                bands = TIME_BANDS_BY_TARIFF[structure]
+                if band in bands:
+                    rows = batch.tariff_structure == t
+                    rate[rows] = all_in_kwh[bands.index(band), rows]
+            columns[f"{band.value.lower()}_all_in_eur_per_kwh"] = rate
+        columns["snapshot_id"] = np.full(len(self), self.snapshot_id)
+        if self.breach is not None:
+            columns["sanity_breach"] = self.breach
+        return columns
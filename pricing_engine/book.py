@@ -0,0 +1,405 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+)
+
+import numpy as np
+import pandas as pd
+
+from .batch import RequestBatch, TariffResultBatch
+from .config import Settings
+from .sanity import VIOLATION_COLUMNS, batch_bounds_violations, summarise_violations
+from .schemas import TariffResult
+
+
+class BatchPricer(Protocol):
+    """TariffEngine, or anything that prices a RequestBatch the same way (ParallelPricer)."""
+
+    settings: Settings
+
+    def price_batch(self, batch: RequestBatch, on_breach: str = "raise") -> TariffResultBatch: ...
+
+
+# Columns carried through from the book to the output unchanged, if present
+PASSTHROUGH_COLUMNS = ["customer_id", "archetype_id"]
+
+
+def _is_parquet(path: str | Path) -> bool:
+    return Path(path).suffix.lower() in {".parquet", ".pq"}
+
+
+def _is_excel(path: str | Path) -> bool:
+    return Path(path).suffix.lower() == ".xlsx"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError(
+            "Parquet books need pyarrow: pip install 'esb-tariff-engine[parquet]'"
+        ) from exc
+    return pa, pq
+
+
+def iter_book_chunks(path: str | Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Yield the customer book in DataFrames of at most ``chunk_size`` rows."""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Required input file not found: {path}")
+    if _is_parquet(path):
+        _, pq = _require_pyarrow()
+        for record_batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield record_batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def count_book_rows(path: str | Path, chunk_size: int = 1_000_000) -> int:
+    """Rows in a customer book: from the Parquet footer, or one CSV column at a time."""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Required input file not found: {path}")
+    if _is_parquet(path):
+        _, pq = _require_pyarrow()
+        return pq.ParquetFile(path).metadata.num_rows
+    return sum(len(chunk) for chunk in pd.read_csv(path, usecols=[0], chunksize=chunk_size))
+
+
+def read_ahead(items: Iterable[Any], depth: int = 2) -> Iterator[Any]:
+    """Yield ``items`` while a background thread fetches up to ``depth`` more.
+
+    Reading and parsing the next book chunk then overlaps with pricing the
+    current one. Errors are raised in the consuming thread.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(entry: Tuple[Any, Optional[BaseException]]) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fill() -> None:
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except BaseException as exc:  # noqa: BLE001 - handed to the consumer
+            put((done, exc))
+
+    thread = threading.Thread(target=fill, name="book-read-ahead", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+class WriteBehind:
+    """Run writes on one background thread, in order, at most one chunk behind.
+
+    Writing a priced chunk then overlaps with pricing the next. ``wait``
+    re-raises a failed write.
+    """
+
+    def __init__(self) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="book-write")
+        self._pending: Optional[Future] = None
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> None:
+        self.wait()
+        self._pending = self._pool.submit(fn, *args)
+
+    def wait(self) -> None:
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            pending.result()
+
+    def __enter__(self) -> "WriteBehind":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        try:
+            self.wait()
+        finally:
+            self._pool.shutdown()
+
+
+def _csv_text(df: pd.DataFrame, header: bool) -> str:
+    return df.to_csv(header=header, index=False)
+
+
+class BookWriter:
+    """Append-only CSV or Parquet writer; the format follows the file suffix.
+
+    Formatting CSV text is most of the cost of a book run, so with
+    ``processes`` > 1 chunks are rendered in a process pool and written
+    in order as they finish, a few chunks behind.
+    """
+
+    def __init__(self, path: str | Path, processes: int = 1):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._parquet = _is_parquet(self.path)
+        self._writer = None
+        self._started = False
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: Deque[Future] = deque()
+        self._max_pending = 2 * processes
+        if processes > 1 and not self._parquet:
+            self._pool = ProcessPoolExecutor(max_workers=processes)
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self._parquet:
+            pa, pq = _require_pyarrow()
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        elif self._pool is not None:
+            self._pending.append(self._pool.submit(_csv_text, df, not self._started))
+            while len(self._pending) >= self._max_pending:
+                self._write_text(self._pending.popleft().result())
+        else:
+            mode = "a" if self._started else "w"
+            df.to_csv(self.path, mode=mode, header=not self._started, index=False)
+        self._started = True
+
+    def _write_text(self, text: str) -> None:
+        if self._writer is None:
+            self._writer = open(self.path, "w", newline="", encoding="utf-8")
+        self._writer.write(text)
+
+    def close(self) -> None:
+        try:
+            while self._pending:
+                self._write_text(self._pending.popleft().result())
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def __enter__(self) -> "BookWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@dataclass
+class RepriceStats:
+    rows: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+    breaches: int = 0  # quotes outside the sanity bounds
+    dropped: int = 0
+    # Breaches by segment, band and limit (summarise_violations), once the run is done
+    violations: Optional[pd.DataFrame] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _price_chunk(
+    engine: BatchPricer,
+    chunk: pd.DataFrame,
+    year: Optional[int],
+    include_vat: bool,
+    on_breach: str = "raise",
+) -> TariffResultBatch:
+    batch = RequestBatch.from_columns(
+        chunk, year=year, vat_by_market=engine.settings.vat if include_vat else None
+    )
+    return engine.price_batch(batch, on_breach)
+
+
+def price_book_chunk(
+    engine: BatchPricer,
+    chunk: pd.DataFrame,
+    year: Optional[int] = None,
+    include_vat: bool = True,
+) -> pd.DataFrame:
+    return _summary_frame(chunk, _price_chunk(engine, chunk, year, include_vat))
+
+
+def _summary_frame(chunk: pd.DataFrame, priced: TariffResultBatch) -> pd.DataFrame:
+    out = pd.DataFrame(priced.summary_columns(), index=chunk.index)
+    passthrough: List[str] = [c for c in PASSTHROUGH_COLUMNS if c in chunk.columns]
+    if passthrough:
+        out = pd.concat([chunk[passthrough], out], axis=1)
+    return out.reset_index(drop=True)
+
+
+def iter_book_quotes(
+    engine: BatchPricer,
+    chunks: Iterable[pd.DataFrame],
+    year: Optional[int] = None,
+    include_vat: bool = True,
+) -> Iterator[Tuple[Any, TariffResult]]:
+    """(quote_id, TariffResult) per book row, priced a chunk at a time.
+
+    The quote_id is the row's customer_id, or its position in the book.
+    """
+    row = 0
+    for chunk in chunks:
+        priced = _price_chunk(engine, chunk, year, include_vat)
+        for i, quote_id in enumerate(_quote_ids(chunk, row)):
+            yield quote_id, priced.result(i)
+        row += len(chunk)
+
+
+def _quote_ids(chunk: pd.DataFrame, first_row: int) -> List[Any]:
+    if "customer_id" in chunk.columns:
+        return chunk["customer_id"].tolist()
+    return list(range(first_row, first_row + len(chunk)))
+
+
+def reprice_book(
+    engine: BatchPricer,
+    input_path: str | Path,
+    output_path: str | Path,
+    chunk_size: int = 50_000,
+    year: Optional[int] = None,
+    include_vat: bool = True,
+    progress: Optional[Callable[[RepriceStats], None]] = None,
+    band_dataset: Optional[str | Path] = None,
+    band_format: str = "csv",
+    on_breach: Optional[str] = None,
+    violations_path: Optional[str | Path] = None,
+    processes: int = 1,
+) -> RepriceStats:
+    """Stream a customer book through the batch engine, a few chunks in memory at a time.
+
+    The next chunk is read, and the previous one written, while the current
+    chunk is priced (read_ahead, WriteBehind); ``processes`` > 1 renders a
+    CSV output across that many worker processes (BookWriter).
+
+    An ``.xlsx`` output gets one workbook with every quote's cost stack
+    (export_tariffs_to_excel) instead of the flat priced book.
+    ``band_dataset`` also writes the per-band cost stacks, in the same pass,
+    as a dataset partitioned by market/commodity/segment (BandDatasetWriter).
+
+    ``on_breach`` (default: the config's ``sanity.on_breach``, else "raise")
+    decides what happens to quotes outside the sanity bounds: "flag" keeps
+    them and adds a ``sanity_breach`` column, "drop" leaves them out. Either
+    way the run completes, ``stats.violations`` summarises every breach and
+    ``violations_path`` (.csv or .parquet) lists them by quote and band.
+    """
+    on_breach = on_breach or engine.settings.sanity.get("on_breach", "raise")
+    stats = RepriceStats()
+    start = time.perf_counter()
+    summaries: List[pd.DataFrame] = []
+
+    def chunks() -> Iterator[pd.DataFrame]:
+        for chunk in read_ahead(iter_book_chunks(input_path, chunk_size)):
+            yield chunk
+            stats.rows += len(chunk)
+            stats.chunks += 1
+            stats.seconds = time.perf_counter() - start
+            if progress is not None:
+                progress(stats)
+
+    def priced_chunks(
+        violations: Optional[BookWriter],
+    ) -> Iterator[Tuple[pd.DataFrame, List[Any], TariffResultBatch]]:
+        policy = "raise" if on_breach == "raise" else "flag"
+        for chunk in chunks():
+            quote_ids = _quote_ids(chunk, stats.rows)
+            priced = _price_chunk(engine, chunk, year, include_vat, policy)
+            if priced.breach is not None and priced.breach.any():
+                table = batch_bounds_violations(
+                    priced,
+                    min_bounds=engine.settings.sanity["min_unit_rate_eur_per_kwh"],
+                    max_bounds=engine.settings.sanity["max_unit_rate_eur_per_kwh"],
+                ).table(quote_ids)
+                stats.breaches += int(priced.breach.sum())
+                summaries.append(summarise_violations([table]))
+                if violations is not None:
+                    violations.write(table)
+                if on_breach == "drop":
+                    keep = np.flatnonzero(~priced.breach)
+                    stats.dropped += len(chunk) - len(keep)
+                    chunk = chunk.iloc[keep]
+                    quote_ids = [quote_ids[i] for i in keep]
+                    priced = priced.take(keep)
+            if on_breach == "drop":
+                priced = replace(priced, breach=None)
+            yield chunk, quote_ids, priced
+
+    violations = BookWriter(violations_path) if violations_path is not None else None
+    try:
+        if _is_excel(output_path):
+            from .export_excel import export_tariffs_to_excel
+
+            if band_dataset is not None:
+                raise ValueError("A band dataset cannot be written alongside an .xlsx output")
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            quotes = (
+                (quote_id, priced.result(i))
+                for _, quote_ids, priced in priced_chunks(violations)
+                for i, quote_id in enumerate(quote_ids)
+            )
+            export_tariffs_to_excel(quotes, output_path)
+        else:
+            from .export_batch import BandDatasetWriter
+
+            bands = (
+                BandDatasetWriter(band_dataset, band_format) if band_dataset is not None else None
+            )
+
+            def write(chunk: pd.DataFrame, quote_ids: List[Any], priced: TariffResultBatch) -> None:
+                writer.write(_summary_frame(chunk, priced))
+                if bands is not None:
+                    bands.write(priced, quote_ids)
+
+            with BookWriter(output_path, processes) as writer:
+                try:
+                    with WriteBehind() as background:
+                        for chunk, quote_ids, priced in priced_chunks(violations):
+                            background.submit(write, chunk, quote_ids, priced)
+                finally:
+                    if bands is not None:
+                        bands.close()
+        if violations is not None and not stats.breaches:
+            violations.write(pd.DataFrame(columns=VIOLATION_COLUMNS))
+    finally:
+        if violations is not None:
+            violations.close()
+    stats.violations = summarise_violations(summaries)
+    stats.seconds = time.perf_counter() - start
+    return stats
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import date
-from typing import List
+from typing import Sequence
 
+import numpy as np
 import pandas as pd
 
+from .effective_dates import ChargeTotals, EffectiveDateIndex
 from .schemas import Commodity, Market, Segment, TimeBand
 
 
@@ -16,13 +18,36 @@ class PassThroughSelection:
     raw_rows: pd.DataFrame
 
 
+KEY_COLS = ["region", "commodity", "segment", "year", "band"]
+CHARGE_KEY_COLS = KEY_COLS + ["charge_type", "name"]
+
+
 class PassThroughLibrary:
     def __init__(self, df: pd.DataFrame):
         if df.empty:
             raise ValueError("Pass-through charge dataset is empty for requested slice.")
         self.df = df.copy()
-        self.df["effective_from"] = pd.to_datetime(self.df["effective_from"]).dt.date
-        self.df["effective_to"] = pd.to_datetime(self.df["effective_to"]).dt.date
+        effective_from = pd.to_datetime(self.df["effective_from"])
+        effective_to = pd.to_datetime(self.df["effective_to"])
+        self._effective_from = effective_from.to_numpy(dtype="datetime64[D]")
+        self._effective_to = effective_to.to_numpy(dtype="datetime64[D]")
+        self.df["effective_from"] = effective_from.dt.date
+        self.df["effective_to"] = effective_to.dt.date
+        self._index: EffectiveDateIndex | None = None
+        self._versions: tuple[np.ndarray, np.ndarray] | None = None
+
+    @property
+    def index(self) -> EffectiveDateIndex:
+        """Point-in-time index, built on first lookup so validation-only use skips it."""
+        if self._index is None:
+            self._index = EffectiveDateIndex(
+                keys=list(zip(*(self.df[c].tolist() for c in KEY_COLS))),
+                effective_from=self._effective_from,
+                effective_to=self._effective_to,
+                charge_types=self.df["charge_type"].tolist(),
+                values=self.df["value"].tolist(),
+            )
+        return self._index
 
     def select_for_band(
         self,
@@ -34,62 +59,80 @@ class PassThroughLibrary:
         as_of: date | None = None,
     ) -> PassThroughSelection:
         as_of = as_of or date(year, 6, 30)
-        mask = (
-            (self.df["region"] == region.value)
-            & (self.df["commodity"] == commodity.value)
-            & (self.df["segment"] == segment.value)
-            & (self.df["year"] == year)
-            & (self.df["band"] == band.value)
-            & (self.df["effective_from"] <= as_of)
-            & (self.df["effective_to"] >= as_of)
-        )
-        subset = self.df[mask]
-        if subset.empty:
+        key = (region.value, commodity.value, segment.value, year, band.value)
+        hit = self.index.lookup(key, as_of)
+        if hit is None:
             raise ValueError(f"No pass-through charges for band {band.value} @ {region.value} {year}")
-
-        network = subset.loc[subset["charge_type"] == "NETWORK", "value"].sum()
-        levies = subset.loc[subset["charge_type"] == "LEVY", "value"].sum()
+        network, levies, rows = hit
 
         return PassThroughSelection(
-            network_eur_per_mwh=float(network),
-            levies_eur_per_mwh=float(levies),
-            raw_rows=subset,
+            network_eur_per_mwh=network,
+            levies_eur_per_mwh=levies,
+            raw_rows=self.df.iloc[rows],
+        )
+
+    def select_many(
+        self,
+        region: Market,
+        commodity: Commodity,
+        segment: Segment,
+        year: int,
+        band: TimeBand,
+        as_of: Sequence[date] | np.ndarray,
+    ) -> ChargeTotals:
+        """Network/levy totals for one band on many dates (e.g. contract start dates)."""
+        return self.index.lookup_many(
+            (region.value, commodity.value, segment.value, year, band.value), as_of
+        )
+
+    def _sorted_versions(self) -> tuple[np.ndarray, np.ndarray]:
+        """Row order by charge key then effective_from, and a same-key-as-previous mask."""
+        if self._versions is not None:
+            return self._versions
+        group_id = self.df.groupby(CHARGE_KEY_COLS, sort=True).ngroup().to_numpy()
+        order = np.lexsort((self._effective_from, group_id))
+        gid = group_id[order]
+        same_key = np.zeros(len(order), dtype=bool)
+        same_key[1:] = gid[1:] == gid[:-1]
+        self._versions = (order, same_key)
+        return self._versions
+
+    def find_overlaps(self) -> pd.DataFrame:
+        """Detect overlapping effective date ranges for same charge key.
+
+        One row per version whose ``effective_from`` falls on or before the
+        previous version's ``effective_to``.
+        """
+        order, same_key = self._sorted_versions()
+        ordered = self.df.iloc[order].reset_index(drop=True)
+        start = self._effective_from[order]
+        prev_end = np.roll(self._effective_to[order], 1)
+        overlap = same_key & (start <= prev_end)
+
+        prev = np.flatnonzero(overlap) - 1
+        findings = ordered.loc[overlap, CHARGE_KEY_COLS + ["version", "effective_from"]]
+        findings.insert(len(CHARGE_KEY_COLS), "prev_version", ordered["version"].to_numpy()[prev])
+        findings.insert(
+            len(CHARGE_KEY_COLS) + 1, "prev_effective_to", ordered["effective_to"].to_numpy()[prev]
         )
+        return findings.reset_index(drop=True)
 
-    def find_overlaps(self) -> List[str]:
-        """Detect overlapping effective date ranges for same charge key."""
-        errors: List[str] = []
-        group_cols = ["region", "commodity", "segment", "year", "band", "charge_type", "name"]
-        for key, grp in self.df.groupby(group_cols):
-            grp_sorted = grp.sort_values("effective_from")
-            prev_end: date | None = None
-            for _, row in grp_sorted.iterrows():
-                start = row["effective_from"]
-                end = row["effective_to"]
-                if prev_end is not None and start <= prev_end:
-                    errors.append(
-                        f"Overlap for {key} between {prev_end} and {start} (version {row['version']})"
-                    )
-                prev_end = end
-        return errors
-
-    def detect_large_changes(self, threshold_pct: float = 0.2) -> List[str]:
+    def detect_large_changes(self, threshold_pct: float = 0.2) -> pd.DataFrame:
         """Flag step changes > threshold_pct between sequential versions."""
-        warnings: List[str] = []
-        group_cols = ["region", "commodity", "segment", "year", "band", "charge_type", "name"]
-        for key, grp in self.df.groupby(group_cols):
-            grp_sorted = grp.sort_values("effective_from")
-            prev_val: float | None = None
-            prev_ver: int | None = None
-            for _, row in grp_sorted.iterrows():
-                val = float(row["value"])
-                ver = int(row["version"])
-                if prev_val is not None and prev_val != 0:
-                    change = abs(val - prev_val) / abs(prev_val)
-                    if change > threshold_pct:
-                        warnings.append(
-                            f"Large change for {key}: v{prev_ver}={prev_val} -> v{ver}={val} ({change:.0%})"
-                        )
-                prev_val = val
-                prev_ver = ver
-        return warnings
+        order, same_key = self._sorted_versions()
+        ordered = self.df.iloc[order].reset_index(drop=True)
+        value = ordered["value"].to_numpy(dtype=float)
+        prev_value = np.roll(value, 1)
+        candidate = same_key & (prev_value != 0)
+        change = np.zeros(len(value))
+        change[candidate] = np.abs(value[candidate] - prev_value[candidate]) / np.abs(
+            prev_value[candidate]
+        )
+        flagged = candidate & (change > threshold_pct)
+
+        prev = np.flatnonzero(flagged) - 1
+        findings = ordered.loc[flagged, CHARGE_KEY_COLS + ["version", "value"]]
+        findings.insert(len(CHARGE_KEY_COLS), "prev_version", ordered["version"].to_numpy()[prev])
+        findings.insert(len(CHARGE_KEY_COLS) + 1, "prev_value", prev_value[flagged])
+        findings["change_pct"] = change[flagged]
+        return findings.reset_index(drop=True)
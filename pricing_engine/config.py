@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import yaml
 from pydantic import BaseModel
@@ -13,6 +13,8 @@ class Settings(BaseModel):
     risk_pct: Dict[str, float]
     sanity: Dict[str, Any]
     file_paths: Dict[str, Any]
+    # Optional Monte Carlo risk premium replacing risk_pct (see pricing_engine.risk).
+    risk_model: Optional[Dict[str, Any]] = None
 
 
 def load_settings(config_path: str | Path) -> Settings:
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Any, NamedTuple, Sequence
+
+# The functions here are written with plain arithmetic operators so that they
+# accept either Python floats (single quote) or NumPy arrays of any shape
+# (batches, scenario grids). Both evaluate the same IEEE operations in the same
+# order, which keeps the scalar and vectorised paths bit-for-bit identical.
+
+
+class CostStack(NamedTuple):
+    wholesale: Any
+    shaping: Any
+    losses: Any
+    network: Any
+    levies: Any
+    margin: Any
+    risk: Any
+
+    @property
+    def energy_only(self) -> Any:
+        return self.wholesale + self.shaping + self.losses
+
+    @property
+    def all_in(self) -> Any:
+        return self.energy_only + self.network + self.levies + self.margin + self.risk
+
+
+def band_cost_stack(
+    wholesale: Any,
+    shaping: Any,
+    loss_factor: Any,
+    network: Any,
+    levies: Any,
+    margin_pct: Any,
+    risk_pct: Any,
+) -> CostStack:
+    """Build the €/MWh cost stack for one or many bands."""
+    energy_ex_losses = wholesale + shaping
+    losses = energy_ex_losses * (loss_factor - 1.0)
+
+    subtotal_before_margin_risk = wholesale + shaping + losses + network + levies
+
+    margin = subtotal_before_margin_risk * margin_pct
+    risk = subtotal_before_margin_risk * risk_pct
+    return CostStack(wholesale, shaping, losses, network, levies, margin, risk)
+
+
+def weighted_rate(weights: Sequence[Any], rates: Sequence[Any]) -> Any:
+    """Band-split weighted rate, accumulated in band order."""
+    total: Any = 0.0
+    for w, r in zip(weights, rates):
+        total = total + w * r
+    return total
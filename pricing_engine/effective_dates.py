@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Hashable, List, NamedTuple, Sequence
+
+import numpy as np
+
+ONE_DAY = np.timedelta64(1, "D")
+
+
+def to_day(value: Any) -> np.ndarray:
+    """Dates, ISO strings or datetime64 values as datetime64[D]."""
+    return np.asarray(value).astype("datetime64[D]")
+
+
+class ChargeTotals(NamedTuple):
+    network_eur_per_mwh: np.ndarray
+    levies_eur_per_mwh: np.ndarray
+    found: np.ndarray  # False where no charge row is active on that date
+
+
+@dataclass
+class _KeyIntervals:
+    # Sorted boundaries split the key's timeline into elementary intervals
+    # [bounds[i], bounds[i + 1]) on which the set of active rows is constant.
+    bounds: np.ndarray
+    network: np.ndarray
+    levies: np.ndarray
+    found: np.ndarray
+    rows: np.ndarray  # row positions for the key
+    active: np.ndarray  # (interval, row) bool
+
+    def position(self, as_of: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        pos = np.searchsorted(self.bounds, as_of, side="right") - 1
+        inside = (pos >= 0) & (pos < len(self.bounds) - 1)
+        pos = np.where(inside, pos, 0)
+        return pos, inside & self.found[pos]
+
+
+class EffectiveDateIndex:
+    """Point-in-time index over effective-dated charge rows.
+
+    Rows are grouped by key; each key's effective ranges (inclusive of
+    ``effective_to``) are flattened into sorted elementary intervals with the
+    network and levy totals precomputed, so a lookup is one ``searchsorted``.
+    Overlapping versions are summed, as a full scan would.
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[Hashable],
+        effective_from: Any,
+        effective_to: Any,
+        charge_types: Sequence[str],
+        values: Sequence[float],
+    ):
+        starts = to_day(effective_from)
+        ends = to_day(effective_to) + ONE_DAY
+        charge_types = np.asarray(charge_types)
+        values = np.asarray(values, dtype=float)
+        network_values = np.where(charge_types == "NETWORK", values, 0.0)
+        levy_values = np.where(charge_types == "LEVY", values, 0.0)
+
+        rows_by_key: Dict[Hashable, List[int]] = {}
+        for i, key in enumerate(keys):
+            rows_by_key.setdefault(key, []).append(i)
+
+        self._by_key: Dict[Hashable, _KeyIntervals] = {}
+        for key, row_list in rows_by_key.items():
+            rows = np.asarray(row_list)
+            bounds = np.unique(np.concatenate([starts[rows], ends[rows]]))
+            seg_start = bounds[:-1]
+            active = (starts[rows][None, :] <= seg_start[:, None]) & (
+                ends[rows][None, :] > seg_start[:, None]
+            )
+            self._by_key[key] = _KeyIntervals(
+                bounds=bounds,
+                network=np.where(active, network_values[rows], 0.0).sum(axis=1),
+                levies=np.where(active, levy_values[rows], 0.0).sum(axis=1),
+                found=active.any(axis=1),
+                rows=rows,
+                active=active,
+            )
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._by_key
+
+    def keys(self) -> List[Hashable]:
+        return list(self._by_key)
+
+    def lookup(
+        self, key: Hashable, as_of: date | np.datetime64
+    ) -> tuple[float, float, np.ndarray] | None:
+        """(network, levies, active row positions) on ``as_of``, or None if nothing is active."""
+        intervals = self._by_key.get(key)
+        if intervals is None:
+            return None
+        pos, found = intervals.position(np.datetime64(as_of, "D"))
+        if not found:
+            return None
+        p = int(pos)
+        rows = intervals.rows[intervals.active[p]]
+        return float(intervals.network[p]), float(intervals.levies[p]), rows
+
+    def lookup_many(self, key: Hashable, as_of: Any) -> ChargeTotals:
+        """Vectorised lookup of one key on many dates."""
+        dates = to_day(as_of)
+        intervals = self._by_key.get(key)
+        if intervals is None:
+            empty = np.zeros(dates.shape)
+            return ChargeTotals(empty, empty.copy(), np.zeros(dates.shape, dtype=bool))
+        pos, found = intervals.position(dates)
+        return ChargeTotals(
+            np.where(found, intervals.network[pos], 0.0),
+            np.where(found, intervals.levies[pos], 0.0),
+            found,
+        )
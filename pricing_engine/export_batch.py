@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch import BANDS, REQUEST_CATEGORIES, SLOT_BAND_CODES, TariffResultBatch
+from .cost_stack import CostStack
+from .instrumentation import METRICS
+
+PARTITION_COLUMNS = ("market", "commodity", "segment")
+FORMATS = ("csv", "parquet")
+
+
+def band_columns(
+    priced: TariffResultBatch, quote_ids: Optional[Sequence[Any]] = None
+) -> Dict[str, np.ndarray]:
+    """One row per quote and band, in export_tariff_to_csv's columns, straight from the arrays.
+
+    ``quote_ids`` labels the quotes (default: their position in the batch).
+    ``band`` is an integer code into BANDS; the partition columns are codes
+    into REQUEST_CATEGORIES. Rows are quote-major, bands in tariff order.
+    """
+    batch = priced.batch
+    quote, slot = np.nonzero(priced.valid.T)
+    ids = np.arange(len(batch)) if quote_ids is None else np.asarray(quote_ids)
+    if len(ids) != len(batch):
+        raise ValueError(f"Got {len(ids)} quote ids for {len(batch)} quotes")
+
+    columns: Dict[str, np.ndarray] = {"quote_id": ids[quote]}
+    columns.update({name: getattr(batch, name)[quote] for name in PARTITION_COLUMNS})
+    columns["band"] = SLOT_BAND_CODES[batch.tariff_structure[quote], slot]
+    for name, values in zip(CostStack._fields, priced.stack):
+        columns[f"{name}_eur_per_mwh"] = values[slot, quote]
+    energy_only = priced.energy_only[slot, quote]
+    all_in = priced.all_in[slot, quote]
+    columns["energy_only_eur_per_mwh"] = energy_only
+    columns["all_in_eur_per_mwh"] = all_in
+    columns["energy_only_eur_per_kwh"] = energy_only / 1000.0
+    columns["all_in_eur_per_kwh"] = all_in / 1000.0
+    band_kwh = batch.annual_consumption_kwh[quote] * batch.band_weights[quote, slot]
+    columns["annual_consumption_kwh"] = band_kwh
+    columns["annual_cost_ex_vat"] = columns["all_in_eur_per_kwh"] * band_kwh
+    return columns
+
+
+def _partitions(columns: Dict[str, np.ndarray]) -> Iterator[Tuple[Tuple[int, ...], np.ndarray]]:
+    """(partition codes, row indices) per market/commodity/segment present."""
+    codes = np.stack([columns[name] for name in PARTITION_COLUMNS]).astype(np.int64)
+    keys, inverse = np.unique(codes, axis=1, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.searchsorted(inverse[order], np.arange(keys.shape[1] + 1))
+    for k in range(keys.shape[1]):
+        yield tuple(int(c) for c in keys[:, k]), order[bounds[k] : bounds[k + 1]]
+
+
+class BandDatasetWriter:
+    """Band-level results as a CSV or Parquet dataset, partitioned hive-style.
+
+    Files go to ``root/market=ROI/commodity=ELEC/segment=SME/part-0.<format>``;
+    the partition columns live in the directory names, as pyarrow and
+    pandas.read_parquet expect. Each ``write`` appends a priced batch in
+    chunks of ``chunk_quotes`` quotes, so a whole book can be streamed
+    through one writer. Parquet needs pyarrow; CSV uses it when installed,
+    unless ``use_arrow`` is False.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        format: str = "csv",
+        chunk_quotes: int = 100_000,
+        use_arrow: Optional[bool] = None,
+    ):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown dataset format '{format}' (expected one of {FORMATS})")
+        if format == "parquet" and use_arrow is False:
+            raise ValueError("Parquet datasets are written with pyarrow")
+        self.root = Path(root)
+        if self.root.exists() and any(self.root.iterdir()):
+            raise FileExistsError(f"Dataset directory is not empty: {self.root}")
+        self.format = format
+        self.chunk_quotes = chunk_quotes
+        self.rows = 0
+        # Open writers (pyarrow) or started CSV paths (pandas) per partition.
+        self._files: Dict[Tuple[int, ...], Any] = {}
+        # pyarrow writes CSV about ten times faster than pandas; it is optional for CSV.
+        if use_arrow is None:
+            use_arrow = format == "parquet" or importlib.util.find_spec("pyarrow") is not None
+        self._arrow = use_arrow
+
+    def _path(self, key: Tuple[int, ...]) -> Path:
+        parts = [
+            f"{name}={REQUEST_CATEGORIES[name][code].value}"
+            for name, code in zip(PARTITION_COLUMNS, key)
+        ]
+        directory = self.root.joinpath(*parts)
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / f"part-0.{self.format}"
+
+    @METRICS.timed("export_band_dataset")
+    def write(self, priced: TariffResultBatch, quote_ids: Optional[Sequence[Any]] = None) -> None:
+        ids = np.arange(len(priced)) if quote_ids is None else np.asarray(quote_ids)
+        for start in range(0, len(priced), self.chunk_quotes):
+            rows = slice(start, start + self.chunk_quotes)
+            chunk = priced if len(priced) <= self.chunk_quotes else priced.slice(rows)
+            columns = band_columns(chunk, ids[rows])
+            for key, index in _partitions(columns):
+                part = {
+                    name: values[index]
+                    for name, values in columns.items()
+                    if name not in PARTITION_COLUMNS
+                }
+                self._write_part(key, part)
+                self.rows += len(index)
+
+    def _write_part(self, key: Tuple[int, ...], columns: Dict[str, np.ndarray]) -> None:
+        band_values = [b.value for b in BANDS]
+        if self._arrow:
+            from .book import _require_pyarrow
+
+            pa, pq = _require_pyarrow()
+            data: Dict[str, Any] = dict(columns)
+            data["band"] = pa.DictionaryArray.from_arrays(
+                columns["band"].astype(np.int8), pa.array(band_values)
+            )
+            if self.format == "csv":
+                data["band"] = data["band"].cast(pa.string())
+            table = pa.table(data)
+            writer = self._files.get(key)
+            if writer is None:
+                if self.format == "parquet":
+                    writer = pq.ParquetWriter(self._path(key), table.schema)
+                else:
+                    import pyarrow.csv as pa_csv
+
+                    writer = pa_csv.CSVWriter(self._path(key), table.schema)
+                self._files[key] = writer
+            writer.write_table(table)
+            return
+
+        import pandas as pd
+
+        data = dict(columns)
+        data["band"] = pd.Categorical.from_codes(columns["band"], categories=band_values)
+        new = key not in self._files
+        path = self._path(key) if new else self._files[key]
+        self._files[key] = path
+        pd.DataFrame(data, copy=False).to_csv(
+            path, mode="w" if new else "a", header=new, index=False
+        )
+
+    def close(self) -> None:
+        if self._arrow:
+            for writer in self._files.values():
+                writer.close()
+        self._files.clear()
+
+    def __enter__(self) -> "BandDatasetWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def export_batch_bands(
+    priced: TariffResultBatch,
+    root: str | Path,
+    format: str = "csv",
+    quote_ids: Optional[Sequence[Any]] = None,
+) -> int:
+    """Write one priced batch as a partitioned band dataset; returns the number of rows."""
+    with BandDatasetWriter(root, format) as writer:
+        writer.write(priced, quote_ids)
+    return writer.rows
@@ -4,10 +4,12 @@ from pathlib import Path
 
 import pandas as pd
 
+from .instrumentation import METRICS
 from .schemas import TariffResult
 from .waterfall import tariff_components_to_dataframe
 
 
+@METRICS.timed("export_csv")
 def export_tariff_to_csv(tariff_result: TariffResult, path: str | Path) -> None:
     path = Path(path)
     df_components = tariff_components_to_dataframe(tariff_result.components)
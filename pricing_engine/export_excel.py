@@ -1,17 +1,60 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any, Dict, Iterable, Tuple
 
 import pandas as pd
 
+from .instrumentation import METRICS
 from .schemas import TariffResult
-from .waterfall import tariff_components_to_dataframe, waterfall_long_format
+from .waterfall import (
+    COMPONENT_COLUMNS,
+    COST_COMPONENTS,
+    component_record,
+    tariff_components_to_dataframe,
+    waterfall_long_format,
+)
 
+# Rows per worksheet, header included.
+EXCEL_MAX_ROWS = 1_048_576
+METADATA_NOTE = "Cost_Stack_Data is intended as the source for Excel cost stack charts."
+QUOTE_SUMMARY_COLUMNS = (
+    "market",
+    "commodity",
+    "segment",
+    "tariff_structure",
+    "contract_type",
+    "annual_consumption_kwh",
+    "standing_charge_eur_per_year",
+    "weighted_energy_only_eur_per_kwh",
+    "weighted_all_in_eur_per_kwh",
+    "estimated_annual_bill_ex_vat",
+    "estimated_annual_bill_inc_vat",
+)
 
-def export_tariff_to_excel(tariff_result: TariffResult, path: str | Path) -> None:
-    path = Path(path)
+
+def quote_summary_record(tariff_result: TariffResult) -> Dict[str, Any]:
+    """One Quote_Summary row, in QUOTE_SUMMARY_COLUMNS order."""
+    request = tariff_result.request
+    return {
+        "market": request.market.value,
+        "commodity": request.commodity.value,
+        "segment": request.segment.value,
+        "tariff_structure": request.tariff_structure.value,
+        "contract_type": request.contract_type.value,
+        "annual_consumption_kwh": request.annual_consumption_kwh,
+        "standing_charge_eur_per_year": request.standing_charge_eur_per_year,
+        "weighted_energy_only_eur_per_kwh": tariff_result.weighted_energy_only_eur_per_kwh,
+        "weighted_all_in_eur_per_kwh": tariff_result.weighted_all_in_eur_per_kwh,
+        "estimated_annual_bill_ex_vat": tariff_result.estimated_annual_bill_ex_vat,
+        "estimated_annual_bill_inc_vat": tariff_result.estimated_annual_bill_inc_vat,
+    }
+
+
+def workbook_sheets(tariff_result: TariffResult) -> Dict[str, pd.DataFrame]:
+    """The sheets of a single-quote workbook, building the component frame once."""
     components_df = tariff_components_to_dataframe(tariff_result.components)
-    waterfall_df = waterfall_long_format(tariff_result)
+    waterfall_df = waterfall_long_format(tariff_result, components_df)
 
     band_split = tariff_result.request.band_split
     annual_kwh = tariff_result.request.annual_consumption_kwh
@@ -21,36 +64,75 @@ def export_tariff_to_excel(tariff_result: TariffResult, path: str | Path) -> Non
         components_df["all_in_eur_per_kwh"] * components_df["annual_consumption_kwh"]
     )
 
-    quote_summary = pd.DataFrame(
-        [
-            {
-                "market": tariff_result.request.market.value,
-                "commodity": tariff_result.request.commodity.value,
-                "segment": tariff_result.request.segment.value,
-                "tariff_structure": tariff_result.request.tariff_structure.value,
-                "contract_type": tariff_result.request.contract_type.value,
-                "annual_consumption_kwh": annual_kwh,
-                "standing_charge_eur_per_year": tariff_result.request.standing_charge_eur_per_year,
-                "weighted_energy_only_eur_per_kwh": tariff_result.weighted_energy_only_eur_per_kwh,
-                "weighted_all_in_eur_per_kwh": tariff_result.weighted_all_in_eur_per_kwh,
-                "estimated_annual_bill_ex_vat": tariff_result.estimated_annual_bill_ex_vat,
-                "estimated_annual_bill_inc_vat": tariff_result.estimated_annual_bill_inc_vat,
-            }
-        ]
-    )
+    return {
+        "Tariff_Build": components_df,
+        "Cost_Stack_Data": waterfall_df,
+        "Quote_Summary": pd.DataFrame([quote_summary_record(tariff_result)]),
+        # A light metadata sheet so Excel users know config
+        "Inputs_Metadata": pd.DataFrame([{"key": "note", "value": METADATA_NOTE}]),
+    }
+
 
+def write_workbook(sheets: Dict[str, pd.DataFrame], path: str | Path) -> None:
     with pd.ExcelWriter(path, engine="openpyxl") as writer:
-        components_df.to_excel(writer, sheet_name="Tariff_Build", index=False)
-        waterfall_df.to_excel(writer, sheet_name="Cost_Stack_Data", index=False)
-        quote_summary.to_excel(writer, sheet_name="Quote_Summary", index=False)
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
 
-        # A light metadata sheet so Excel users know config
-        meta = pd.DataFrame(
-            [
-                {
-                    "key": "note",
-                    "value": "Cost_Stack_Data is intended as the source for Excel cost stack charts.",
-                }
-            ]
-        )
-        meta.to_excel(writer, sheet_name="Inputs_Metadata", index=False)
+
+@METRICS.timed("export_excel")
+def export_tariff_to_excel(tariff_result: TariffResult, path: str | Path) -> None:
+    write_workbook(workbook_sheets(tariff_result), Path(path))
+
+
+@METRICS.timed("export_excel_pack")
+def export_tariffs_to_excel(quotes: Iterable[Tuple[Any, TariffResult]], path: str | Path) -> int:
+    """Write many quotes to one workbook; returns the number written.
+
+    ``quotes`` yields (quote_id, result) pairs, e.g. ``enumerate(results, 1)``
+    or a generator over a priced book, and is consumed once. The sheets match
+    export_tariff_to_excel with a leading quote_id column. XlsxWriter's
+    constant_memory mode flushes every row to a temporary file as it is
+    written, so memory stays flat however many quotes are written.
+    """
+    import xlsxwriter
+
+    # Closing writes the file; on error it is skipped, leaving no partial workbook.
+    workbook = xlsxwriter.Workbook(str(path), {"constant_memory": True})
+    build = workbook.add_worksheet("Tariff_Build")
+    stack = workbook.add_worksheet("Cost_Stack_Data")
+    summary = workbook.add_worksheet("Quote_Summary")
+    build.write_row(
+        0, 0, ["quote_id", *COMPONENT_COLUMNS, "annual_consumption_kwh", "annual_cost_ex_vat"]
+    )
+    stack.write_row(0, 0, ["quote_id", "band", "component", "value_eur_per_mwh"])
+    summary.write_row(0, 0, ["quote_id", *QUOTE_SUMMARY_COLUMNS])
+
+    n = build_row = stack_row = 0
+    for quote_id, result in quotes:
+        request = result.request
+        records = [component_record(c) for c in result.components]
+        if stack_row + len(records) * len(COST_COMPONENTS) >= EXCEL_MAX_ROWS:
+            raise ValueError(
+                f"Quote {quote_id!r} would take Cost_Stack_Data past Excel's "
+                f"{EXCEL_MAX_ROWS:,} rows after {n:,} quotes; split the pack"
+            )
+        for c, record in zip(result.components, records):
+            share = request.band_split.get(c.band)
+            band_kwh = request.annual_consumption_kwh * share if share is not None else None
+            cost = c.all_in_eur_per_kwh * band_kwh if band_kwh is not None else None
+            build_row += 1
+            build.write_row(build_row, 0, [quote_id, *record.values(), band_kwh, cost])
+        for name in COST_COMPONENTS:
+            column = f"{name}_eur_per_mwh"
+            for record in records:
+                stack_row += 1
+                stack.write_row(stack_row, 0, [quote_id, record["band"], name, record[column]])
+        n += 1
+        summary.write_row(n, 0, [quote_id, *quote_summary_record(result).values()])
+
+    meta = workbook.add_worksheet("Inputs_Metadata")
+    meta.write_row(0, 0, ["key", "value"])
+    meta.write_row(1, 0, ["note", METADATA_NOTE])
+    meta.write_row(2, 0, ["quotes", n])
+    workbook.close()
+    return n
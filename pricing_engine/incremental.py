@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .batch import (
+    COMMODITIES,
+    CONTRACT_TYPES,
+    MARKETS,
+    SEGMENTS,
+    TARIFF_STRUCTURES,
+    PricingTables,
+    RequestBatch,
+)
+from .book import BookWriter, iter_book_chunks, read_ahead
+from .config import Settings
+from .market_index import MarketIndex
+from .schemas import (
+    Commodity,
+    ContractType,
+    Market,
+    Segment,
+    TariffRequest,
+    TIME_BANDS_BY_TARIFF,
+    TimeBand,
+)
+
+
+class InputKey(NamedTuple):
+    """One priced input. Fields that do not apply to ``source`` are "" (or 0 for year)."""
+
+    # wholesale, shaping, loss_factor, pass_through, margin_pct, risk_pct, vat, risk_model
+    source: str
+    market: str = ""
+    commodity: str = ""
+    segment: str = ""
+    year: int = 0
+    band: str = ""
+    charge: str = ""
+
+    @property
+    def label(self) -> str:
+        parts = [self.market, self.commodity, self.segment, str(self.year or ""), self.band]
+        parts.append(self.charge)
+        path = "/".join(p for p in parts if p)
+        return f"{self.source}:{path}" if path else self.source
+
+
+RISK_MODEL = InputKey("risk_model")
+
+
+class InputChange(NamedTuple):
+    key: InputKey
+    # A float, or the risk_model settings for RISK_MODEL.
+    old: Optional[Any]  # None where the input was added
+    new: Optional[Any]  # None where the input was removed
+
+
+def input_values(index: MarketIndex, settings: Optional[Settings] = None) -> Dict[InputKey, Any]:
+    """Every input a quote can depend on, keyed by InputKey."""
+    values: Dict[InputKey, Any] = {}
+    for (m, c, y, b), price in index.wholesale.items():
+        values[InputKey("wholesale", m, c, "", y, b)] = price
+    for (m, c, y, b), adder in index.shaping.items():
+        values[InputKey("shaping", m, c, "", y, b)] = adder
+    for (m, c, s, y, b), factor in index.losses.items():
+        values[InputKey("loss_factor", m, c, s, y, b)] = factor
+    for (m, c, s, y, b), named in index.pass_through_charges.items():
+        for charge, value in named.items():
+            values[InputKey("pass_through", m, c, s, y, b, charge)] = value
+    if settings is not None:
+        for s, pct in settings.margin_pct.items():
+            values[InputKey("margin_pct", segment=s)] = float(pct)
+        for s, pct in settings.risk_pct.items():
+            values[InputKey("risk_pct", segment=s)] = float(pct)
+        for m, rate in settings.vat.items():
+            values[InputKey("vat", market=m)] = float(rate)
+        if settings.risk_model:
+            values[RISK_MODEL] = dict(settings.risk_model)
+    return values
+
+
+def diff_inputs(
+    old: MarketIndex,
+    new: MarketIndex,
+    old_settings: Optional[Settings] = None,
+    new_settings: Optional[Settings] = None,
+) -> List[InputChange]:
+    """Inputs added, removed or changed between two versions."""
+    before = input_values(old, old_settings)
+    after = input_values(new, new_settings)
+    changes = [
+        InputChange(key, before.get(key), after.get(key))
+        for key in sorted(set(before) | set(after))
+        if before.get(key) != after.get(key)
+    ]
+    return changes
+
+
+def quote_dependencies(
+    request: TariffRequest, index: MarketIndex, include_settings: bool = True
+) -> List[InputKey]:
+    """The input keys a quote is priced from."""
+    m, c, s, y = (
+        request.market.value,
+        request.commodity.value,
+        request.segment.value,
+        request.year,
+    )
+    keys: List[InputKey] = []
+    for band in TIME_BANDS_BY_TARIFF[request.tariff_structure]:
+        b = band.value
+        keys.append(InputKey("wholesale", m, c, "", y, b))
+        keys.append(InputKey("shaping", m, c, "", y, b))
+        keys.append(InputKey("loss_factor", m, c, s, y, b))
+        for charge in index.pass_through_charges.get((m, c, s, y, b), {}):
+            keys.append(InputKey("pass_through", m, c, s, y, b, charge))
+    if include_settings:
+        keys += [InputKey("margin_pct", segment=s), InputKey("risk_pct", segment=s), RISK_MODEL]
+        if request.vat_rate is None:
+            keys.append(InputKey("vat", market=m))
+    return keys
+
+
+def affected_cells(tables: PricingTables, changes: List[InputChange]) -> np.ndarray:
+    """Labels of the changes touching each (year, market, commodity, segment, tariff) cell.
+
+    Object array shaped like ``tables.available``; "" where nothing changed.
+    """
+    labels = np.full(tables.available.shape, "", dtype=object)
+    year_pos = {int(y): i for i, y in enumerate(tables.years)}
+    for change in changes:
+        key = change.key
+        if key.year and key.year not in year_pos:
+            continue
+        cell: List[Any] = [
+            year_pos[key.year] if key.year else slice(None),
+            MARKETS.index(Market(key.market)) if key.market else slice(None),
+            COMMODITIES.index(Commodity(key.commodity)) if key.commodity else slice(None),
+            SEGMENTS.index(Segment(key.segment)) if key.segment else slice(None),
+        ]
+        for t, structure in enumerate(TARIFF_STRUCTURES):
+            if key.band and TimeBand(key.band) not in TIME_BANDS_BY_TARIFF[structure]:
+                continue
+            view = labels[tuple(cell + [t])]
+            if isinstance(view, np.ndarray):
+                view[...] = np.where(view == "", key.label, view + ";" + key.label)
+            else:
+                labels[tuple(cell + [t])] = f"{view};{key.label}" if view else key.label
+    return labels
+
+
+def affected_quotes(
+    tables: PricingTables, batch: RequestBatch, changes: List[InputChange]
+) -> np.ndarray:
+    """Per quote, the labels of the changed inputs it depends on ("" if unaffected).
+
+    ``vat`` changes only affect quotes whose VAT came from the settings; pass
+    a batch built with the book's own ``vat_rate`` column to leave them out.
+    A ``risk_model`` change moves every non-indexed quote, and indexed ones
+    too when the model is switched on or off (they carry no premium under it
+    but the flat risk_pct without it).
+    """
+    labels = affected_cells(tables, [c for c in changes if c.key != RISK_MODEL])
+    key, _ = tables.locate(batch)
+    out = labels[key]
+    for change in changes:
+        if change.key == RISK_MODEL:
+            moved = batch.contract_type != CONTRACT_TYPES.index(ContractType.INDEXED)
+            if change.old is None or change.new is None:
+                moved[:] = True
+            out[moved] = np.where(
+                out[moved] == "", RISK_MODEL.label, out[moved] + ";" + RISK_MODEL.label
+            )
+    # Quotes for years outside the tables cannot have changed.
+    out[tables.years[key[0]] != batch.year] = ""
+    return out
+
+
+@dataclass
+class IncrementalStats:
+    rows: int = 0
+    repriced: int = 0
+    changes: int = 0
+    breaches: int = 0  # repriced quotes flagged outside the sanity bounds
+    seconds: float = 0.0
+
+
+FEED_COLUMNS = (
+    "weighted_all_in_eur_per_kwh",
+    "estimated_annual_bill_ex_vat",
+    "estimated_annual_bill_inc_vat",
+)
+
+
+def _paired_chunks(
+    book_path: str | Path, previous_path: str | Path, chunk_size: int
+) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """Walk the book and its previous priced output together, in chunks of equal rows.
+
+    The two files may be chunked differently (e.g. Parquet row groups), so
+    the longer side of each pair is split and its remainder carried over.
+    """
+    books = iter_book_chunks(book_path, chunk_size)
+    priced = iter_book_chunks(previous_path, chunk_size)
+    book_rows = priced_rows = 0
+    left: Optional[pd.DataFrame] = None
+    right: Optional[pd.DataFrame] = None
+    while True:
+        if left is None or not len(left):
+            left = next(books, None)
+            book_rows += 0 if left is None else len(left)
+        if right is None or not len(right):
+            right = next(priced, None)
+            priced_rows += 0 if right is None else len(right)
+        if left is None or right is None:
+            break
+        n = min(len(left), len(right))
+        yield left.iloc[:n].reset_index(drop=True), right.iloc[:n].reset_index(drop=True)
+        left, right = left.iloc[n:], right.iloc[n:]
+
+    book_rows += sum(len(chunk) for chunk in books)
+    priced_rows += sum(len(chunk) for chunk in priced)
+    if book_rows != priced_rows:
+        raise ValueError(
+            f"Previous priced book has {priced_rows} rows but the book has {book_rows}"
+        )
+
+
+def reprice_changes(
+    engine: Any,
+    changes: List[InputChange],
+    book_path: str | Path,
+    previous_path: str | Path,
+    output_path: str | Path,
+    feed_path: Optional[str | Path] = None,
+    year: Optional[int] = None,
+    include_vat: bool = True,
+    chunk_size: int = 50_000,
+    on_breach: Optional[str] = None,
+) -> IncrementalStats:
+    """Update a priced book for ``changes``, repricing only the quotes they touch.
+
+    ``previous_path`` is the ``reprice-book`` output for ``book_path`` under the
+    old inputs (same rows, same order). Both are read ``chunk_size`` rows at
+    a time and each updated chunk is written before the next is read.
+    Unaffected rows are carried over and only re-stamped with the new
+    snapshot id. The optional change feed lists old and new rates for each
+    repriced quote and the inputs that moved it.
+
+    ``on_breach`` (default: the config's ``sanity.on_breach``, else "raise")
+    should match the ``reprice-book`` run: "flag" re-flags repriced quotes in
+    ``sanity_breach``. A "drop" output no longer lines up row for row with
+    the book, so it cannot be updated.
+    """
+    on_breach = on_breach or engine.settings.sanity.get("on_breach", "raise")
+    if on_breach == "drop":
+        raise ValueError(
+            "A book priced with on_breach='drop' has rows missing and cannot be updated "
+            "incrementally; price it with 'flag' (or 'raise') instead"
+        )
+    start = time.perf_counter()
+    stats = IncrementalStats(changes=len(changes))
+    tables = engine.market_tables()
+    vat_by_market = engine.settings.vat if include_vat else None
+    empty_feed: Optional[pd.DataFrame] = None
+
+    with ExitStack() as stack:
+        writer = stack.enter_context(BookWriter(output_path))
+        feed_writer = None if feed_path is None else stack.enter_context(BookWriter(feed_path))
+        for book, priced in read_ahead(_paired_chunks(book_path, previous_path, chunk_size)):
+            batch = RequestBatch.from_columns(book, year=year, vat_by_market=vat_by_market)
+            # A book with its own VAT rates is not moved by the settings' VAT.
+            moved = [c for c in changes if c.key.source != "vat" or "vat_rate" not in book]
+            reasons = affected_quotes(tables, batch, moved)
+            rows = np.flatnonzero(reasons != "")
+
+            updated = priced.copy()
+            if on_breach == "flag" and "sanity_breach" not in updated:
+                updated["sanity_breach"] = False  # previous run raised, so nothing breached
+            if len(rows):
+                repriced = engine.price_batch(batch.take(rows), on_breach).summary_columns()
+                if "sanity_breach" in updated:
+                    repriced.setdefault("sanity_breach", np.zeros(len(rows), dtype=bool))
+                    stats.breaches += int(repriced["sanity_breach"].sum())
+                for column, values in repriced.items():
+                    merged = updated[column].to_numpy(copy=True)
+                    merged[rows] = values
+                    updated[column] = merged
+            updated["snapshot_id"] = tables.version
+            writer.write(updated)
+
+            if feed_writer is not None:
+                feed = pd.DataFrame({"row": stats.rows + rows})
+                if "customer_id" in book:
+                    feed["customer_id"] = book["customer_id"].to_numpy()[rows]
+                for column in FEED_COLUMNS:
+                    feed[f"old_{column}"] = priced[column].to_numpy()[rows]
+                    feed[f"new_{column}"] = updated[column].to_numpy()[rows]
+                feed["changed_inputs"] = reasons[rows]
+                if len(feed):
+                    feed_writer.write(feed)
+                else:
+                    empty_feed = feed
+            stats.rows += len(book)
+            stats.repriced += len(rows)
+        if feed_writer is not None and not stats.repriced and empty_feed is not None:
+            feed_writer.write(empty_feed)  # nothing repriced: header only
+
+    stats.seconds = time.perf_counter() - start
+    return stats
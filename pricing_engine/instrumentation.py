@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Callable, ContextManager, Dict, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_DISABLED = nullcontext()
+
+# (metric suffix, type, help, StageStats attribute) exported next to the duration summary.
+_EXTRA_METRICS = (
+    ("stage_max_seconds", "gauge", "Slowest single pass through each stage.", "max_s"),
+    ("stage_items", "counter", "Quotes or rows processed by each stage.", "items"),
+    ("stage_errors", "counter", "Stage passes that raised.", "errors"),
+)
+
+
+@dataclass
+class StageStats:
+    count: int = 0
+    items: int = 0
+    errors: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_s / self.count * 1000.0 if self.count else 0.0
+
+
+class _Stage:
+    __slots__ = ("registry", "name", "items", "start")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, items: int):
+        self.registry = registry
+        self.name = name
+        self.items = items
+
+    def __enter__(self) -> "_Stage":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        self.registry.record(
+            self.name, time.perf_counter() - self.start, self.items, error=exc_type is not None
+        )
+
+
+class Laps:
+    """Stopwatch for consecutive sections of one hot function.
+
+    Each call records the time since the previous call (or since creation)
+    under ``name``; ``total`` records the time since creation. A section
+    that raises is not recorded.
+    """
+
+    __slots__ = ("registry", "start", "last")
+
+    def __init__(self, registry: "MetricsRegistry"):
+        self.registry = registry
+        self.start = self.last = time.perf_counter()
+
+    def __call__(self, name: str, items: int = 1) -> None:
+        now = time.perf_counter()
+        self.registry.record(name, now - self.last, items)
+        self.last = now
+
+    def total(self, name: str, items: int = 1) -> None:
+        self.registry.record(name, time.perf_counter() - self.start, items)
+
+
+class MetricsRegistry:
+    """Counts and durations of named pipeline stages.
+
+    Disabled by default: ``stage()`` then returns a shared no-op context and
+    ``laps()`` returns None, so per-quote code guarded by ``if laps:`` pays a
+    single check per section. Stages can nest (e.g. ``sanity`` inside
+    ``price_batch``); each is timed on its own.
+    Only the current process is recorded, not ParallelPricer workers.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._stages: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+
+    def stage(self, name: str, items: int = 1) -> ContextManager[Any]:
+        """Context manager that times one pass through ``name``."""
+        if not self.enabled:
+            return _DISABLED
+        return _Stage(self, name, items)
+
+    def laps(self) -> Optional[Laps]:
+        """A Laps stopwatch, or None when disabled."""
+        return Laps(self) if self.enabled else None
+
+    def record(self, name: str, seconds: float, items: int = 1, error: bool = False) -> None:
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = StageStats()
+            stats.count += 1
+            stats.items += items
+            stats.errors += error
+            stats.total_s += seconds
+            stats.max_s = max(stats.max_s, seconds)
+
+    def stages(self) -> Dict[str, StageStats]:
+        """Copy of the per-stage statistics, in first-seen order."""
+        with self._lock:
+            return {name: StageStats(**vars(s)) for name, s in self._stages.items()}
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {**vars(s), "mean_ms": s.mean_ms} for name, s in self.stages().items()
+        }
+
+    def to_openmetrics(self, prefix: str = "pricing_engine") -> str:
+        """Prometheus/OpenMetrics text exposition of the stage statistics."""
+        stages = self.stages()
+        metric = f"{prefix}_stage_seconds"
+        lines: List[str] = [
+            f"# TYPE {metric} summary",
+            f"# UNIT {metric} seconds",
+            f"# HELP {metric} Time spent in each pipeline stage.",
+        ]
+        for name, s in stages.items():
+            label = _label(name)
+            lines.append(f"{metric}_count{{stage={label}}} {s.count}")
+            lines.append(f"{metric}_sum{{stage={label}}} {s.total_s!r}")
+        for suffix, kind, help_text, attr in _EXTRA_METRICS:
+            family = f"{prefix}_{suffix}"
+            sample = f"{family}_total" if kind == "counter" else family
+            lines += [f"# TYPE {family} {kind}", f"# HELP {family} {help_text}"]
+            for name, s in stages.items():
+                lines.append(f"{sample}{{stage={_label(name)}}} {getattr(s, attr)!r}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def format_table(self, wall_s: Optional[float] = None) -> str:
+        """Human-readable stage breakdown, slowest first."""
+        rows = sorted(self.stages().items(), key=lambda kv: kv[1].total_s, reverse=True)
+        header = ("stage", "calls", "items", "total s", "mean ms", "max ms")
+        out = ["{:<22} {:>8} {:>10} {:>10} {:>10} {:>10}".format(*header)]
+        for name, s in rows:
+            share = f" {s.total_s / wall_s:6.1%}" if wall_s else ""
+            out.append(
+                f"{name:<22} {s.count:>8,} {s.items:>10,} {s.total_s:>10.4f} "
+                f"{s.mean_ms:>10.3f} {s.max_s * 1000:>10.3f}{share}"
+            )
+        if wall_s:
+            out.append(f"{'wall clock':<22} {'':>8} {'':>10} {wall_s:>10.4f}")
+        return "\n".join(out)
+
+    def timed(self, name: str) -> Callable[[F], F]:
+        """Decorator form of ``stage`` for whole functions."""
+
+        def decorate(fn: F) -> F:
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Stage(self, name, 1):
+                    return fn(*args, **kwargs)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorate
+
+
+def _label(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
+
+
+# Process-wide registry used by the engine, the market data store and the exporters.
+METRICS = MetricsRegistry()
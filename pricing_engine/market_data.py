@@ -1,44 +1,289 @@
 from __future__ import annotations
 
+import csv
+import hashlib
+import io
+import os
+import sys
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
-import pandas as pd
+import numpy as np
 
 from .config import Settings
+from .instrumentation import METRICS
+from .market_index import archetype_band_split
 from .schemas import (
     Commodity,
     CustomerArchetype,
     Market,
     Segment,
     TariffStructure,
-    TimeBand,
 )
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-def _read_csv(path: Path) -> pd.DataFrame:
+
+def _read_csv(path: Path, store: Optional[MarketDataStore] = None) -> pd.DataFrame:
+    if store is not None:
+        return store.read(path)
     if not path.exists():
         raise FileNotFoundError(f"Required input file not found: {path}")
+    import pandas as pd
+
     return pd.read_csv(path)
 
 
+# pandas.read_csv's default NA and boolean tokens, so both parsers give the same columns.
+_NA_VALUES = frozenset(
+    {
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "None",
+        "n/a",
+        "nan",
+        "null",
+    }
+)
+_TRUE_VALUES = frozenset({"True", "TRUE", "true"})
+_FALSE_VALUES = frozenset({"False", "FALSE", "false"})
+
+
+def _infer_column(values: Sequence[str]) -> np.ndarray:
+    """Integer, float, bool or text, in the order pandas tries them; NA tokens become NaN."""
+    missing = [v in _NA_VALUES for v in values]
+    present = [v for v, na in zip(values, missing) if not na]
+    # Python's int() and float() accept "1_000"; pandas reads it as text.
+    numeric = not any("_" in v for v in present)
+    if numeric and present and not any(missing):
+        try:
+            return np.array([int(v) for v in present], dtype=np.int64)
+        except ValueError:
+            pass
+    if numeric:
+        try:
+            return np.array(
+                [np.nan if na else float(v) for v, na in zip(values, missing)], dtype=np.float64
+            )
+        except ValueError:
+            pass
+    if present and all(v in _TRUE_VALUES or v in _FALSE_VALUES for v in present):
+        flags = [np.nan if na else v in _TRUE_VALUES for v, na in zip(values, missing)]
+        return np.array(flags, dtype=object if any(missing) else bool)
+    return np.array([np.nan if na else v for v, na in zip(values, missing)], dtype=object)
+
+
+def parse_csv_columns(raw: bytes) -> Dict[str, np.ndarray]:
+    """Parse a simple CSV into NumPy columns without importing pandas."""
+    reader = csv.reader(io.StringIO(raw.decode("utf-8-sig")))
+    header = next(reader, [])
+    rows = [row for row in reader if row]
+    columns = list(zip(*rows)) if rows else [() for _ in header]
+    return {name: _infer_column(values) for name, values in zip(header, columns)}
+
+
+def _iter_file_paths(node: Any) -> List[str]:
+    """Flatten the nested ``file_paths`` config section into relative paths."""
+    if isinstance(node, dict):
+        paths: List[str] = []
+        for value in node.values():
+            paths.extend(_iter_file_paths(value))
+        return paths
+    return [str(node)]
+
+
+@dataclass
+class StoreStats:
+    hits: int = 0
+    misses: int = 0
+    reloads: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses + self.reloads
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class _StoreEntry:
+    mtime_ns: int
+    size: int
+    digest: str
+    raw: Optional[bytes] = None  # file content, kept only until first parsed
+    frame: Optional[pd.DataFrame] = None
+    columns: Optional[Dict[str, np.ndarray]] = None
+
+    def take_raw(self, path: str) -> bytes:
+        raw = self.raw if self.raw is not None else Path(path).read_bytes()
+        self.raw = None
+        return raw
+
+
+class MarketDataStore:
+    """In-memory cache of the input CSVs listed in ``settings.file_paths``.
+
+    Each file is parsed once. Later reads only ``stat`` the file: if its mtime
+    and size are unchanged the cached frame is returned, otherwise the content
+    is hashed and the file is re-parsed only when the hash differs.
+
+    ``read`` returns a DataFrame and ``read_columns`` a dict of NumPy columns;
+    the latter does not import pandas, which keeps single quotes fast to start.
+
+    ``check_interval_s`` lets ``version()`` reuse its last answer for that many
+    seconds instead of stat-ing every input, for latency-sensitive callers.
+    """
+
+    def __init__(
+        self, settings: Settings, data_root: str | Path, check_interval_s: float = 0.0
+    ):
+        self.settings = settings
+        self.data_root = Path(data_root)
+        self.check_interval_s = check_interval_s
+        self._checked_at = float("-inf")
+        self.stats = StoreStats()
+        self._entries: Dict[str, _StoreEntry] = {}
+        self._relative_paths = _iter_file_paths(settings.file_paths)
+        self._input_paths = [str(self.data_root / rel) for rel in self._relative_paths]
+        self._version_key: Tuple[str, ...] | None = None
+        self._version: str | None = None
+
+    def input_paths(self) -> List[Path]:
+        return [Path(p) for p in self._input_paths]
+
+    def read(self, path: str | Path) -> pd.DataFrame:
+        """Return the parsed frame for ``path``; callers must not mutate it."""
+        return self._frame(str(path), self._entry(str(path), count_hit=True))
+
+    def read_columns(self, path: str | Path) -> Dict[str, np.ndarray]:
+        """Return ``path`` as NumPy columns; callers must not mutate them."""
+        entry = self._entry(str(path), count_hit=True)
+        if entry.columns is None:
+            if entry.frame is not None or "pandas" in sys.modules:
+                # pandas is already paid for and parses large files faster.
+                frame = self._frame(str(path), entry)
+                entry.columns = {c: frame[c].to_numpy() for c in frame.columns}
+            else:
+                with METRICS.stage("parse_input"):
+                    entry.columns = parse_csv_columns(entry.take_raw(str(path)))
+        return entry.columns
+
+    def digest(self, path: str | Path) -> str:
+        return self._entry(str(path)).digest
+
+    def version(self) -> str:
+        """Combined content hash of every configured input file (missing files included).
+
+        Paths are hashed relative to ``data_root`` so the same data gives the same
+        version wherever it is checked out; compiled snapshots reuse it as their ID.
+        """
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval_s:
+            return self._version
+        self._checked_at = now
+
+        digests = []
+        for path in self._input_paths:
+            try:
+                digests.append(self._entry(path).digest)
+            except FileNotFoundError:
+                digests.append("missing")
+        key = tuple(digests)
+        if key != self._version_key:
+            h = hashlib.sha256()
+            for path, digest in zip(self._relative_paths, key):
+                h.update(path.encode())
+                h.update(digest.encode())
+            self._version_key = key
+            self._version = h.hexdigest()[:16]
+        assert self._version is not None
+        return self._version
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._version_key = None
+        self._version = None
+
+    def _frame(self, path: str, entry: _StoreEntry) -> pd.DataFrame:
+        if entry.frame is None:
+            import pandas as pd
+
+            with METRICS.stage("parse_input"):
+                entry.frame = pd.read_csv(io.BytesIO(entry.take_raw(path)))
+        return entry.frame
+
+    def _entry(self, path: str, count_hit: bool = False) -> _StoreEntry:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Required input file not found: {path}") from None
+
+        entry = self._entries.get(path)
+        if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+            self.stats.hits += count_hit
+            return entry
+
+        with METRICS.stage("read_input"), open(path, "rb") as f:
+            raw = f.read()
+            digest = hashlib.sha256(raw).hexdigest()
+        if entry is not None and entry.digest == digest:
+            # Touched but not modified: keep the parsed frame.
+            entry.mtime_ns = st.st_mtime_ns
+            entry.size = st.st_size
+            self.stats.hits += count_hit
+            return entry
+
+        if entry is None:
+            self.stats.misses += 1
+        else:
+            self.stats.reloads += 1
+        entry = _StoreEntry(mtime_ns=st.st_mtime_ns, size=st.st_size, digest=digest, raw=raw)
+        self._entries[path] = entry
+        return entry
+
+
 def load_wholesale_curve(
-    settings: Settings, data_root: str | Path, market: Market, commodity: Commodity, year: int
+    settings: Settings,
+    data_root: str | Path,
+    market: Market,
+    commodity: Commodity,
+    year: int,
+    store: Optional[MarketDataStore] = None,
 ) -> pd.DataFrame:
     data_root = Path(data_root)
     rel = settings.file_paths["wholesale"][commodity.value][market.value]
-    df = _read_csv(data_root / rel)
+    df = _read_csv(data_root / rel, store)
     df = df[df["year"] == year].copy()
     df["band"] = df["band"].astype(str)
     return df
 
 
 def load_shaping_adders(
-    settings: Settings, data_root: str | Path, market: Market, commodity: Commodity, year: int
+    settings: Settings,
+    data_root: str | Path,
+    market: Market,
+    commodity: Commodity,
+    year: int,
+    store: Optional[MarketDataStore] = None,
 ) -> pd.DataFrame:
     data_root = Path(data_root)
     rel = settings.file_paths["shaping_adders"]
-    df = _read_csv(data_root / rel)
+    df = _read_csv(data_root / rel, store)
     mask = (
         (df["year"] == year)
         & (df["market"] == market.value)
@@ -54,10 +299,11 @@ def load_losses(
     commodity: Commodity,
     segment: Segment,
     year: int,
+    store: Optional[MarketDataStore] = None,
 ) -> pd.DataFrame:
     data_root = Path(data_root)
     rel = settings.file_paths["losses"]
-    df = _read_csv(data_root / rel)
+    df = _read_csv(data_root / rel, store)
     mask = (
         (df["year"] == year)
         & (df["market"] == market.value)
@@ -74,10 +320,11 @@ def load_pass_through(
     commodity: Commodity,
     segment: Segment,
     year: int,
+    store: Optional[MarketDataStore] = None,
 ) -> pd.DataFrame:
     data_root = Path(data_root)
     rel = settings.file_paths["pass_through"]
-    df = _read_csv(data_root / rel)
+    df = _read_csv(data_root / rel, store)
     mask = (
         (df["region"] == market.value)
         & (df["commodity"] == commodity.value)
@@ -87,10 +334,13 @@ def load_pass_through(
     return df[mask].copy()
 
 
-def load_archetypes(settings: Settings, data_root: str | Path) -> pd.DataFrame:
+def load_archetypes(
+    settings: Settings, data_root: str | Path, store: Optional[MarketDataStore] = None
+) -> pd.DataFrame:
     data_root = Path(data_root)
     rel = settings.file_paths["customer_archetypes"]
-    return _read_csv(data_root / rel)
+    df = _read_csv(data_root / rel, store)
+    return df.copy() if store is not None else df
 
 
 def get_archetype(
@@ -100,8 +350,9 @@ def get_archetype(
     commodity: Commodity,
     segment: Segment,
     tariff_structure: TariffStructure,
+    store: Optional[MarketDataStore] = None,
 ) -> CustomerArchetype:
-    df = load_archetypes(settings, data_root)
+    df = load_archetypes(settings, data_root, store)
     mask = (
         (df["market"] == market.value)
         & (df["commodity"] == commodity.value)
@@ -115,18 +366,6 @@ def get_archetype(
         )
     row = sub.iloc[0]
 
-    band_split: Dict[TimeBand, float] = {}
-    if row["flat_share"]:
-        band_split[TimeBand.FLAT] = float(row["flat_share"])
-    if row["day_share"]:
-        band_split[TimeBand.DAY] = float(row["day_share"])
-    if row["night_share"]:
-        band_split[TimeBand.NIGHT] = float(row["night_share"])
-    if row["peak_share"]:
-        band_split[TimeBand.PEAK] = float(row["peak_share"])
-    if row["offpeak_share"]:
-        band_split[TimeBand.OFFPEAK] = float(row["offpeak_share"])
-
     return CustomerArchetype(
         archetype_id=row["archetype_id"],
         name=row["name"],
@@ -136,5 +375,5 @@ def get_archetype(
         tariff_structure=TariffStructure(row["tariff_structure"]),
         annual_consumption_kwh=float(row["annual_consumption_kwh"]),
         standing_charge_eur_per_year=float(row["standing_charge_eur_per_year"]),
-        band_split=band_split,
+        band_split=archetype_band_split(row),
     )
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .config import Settings
+from .effective_dates import EffectiveDateIndex
+from .instrumentation import METRICS
+from .schemas import (
+    Commodity,
+    CustomerArchetype,
+    Market,
+    Segment,
+    TariffStructure,
+    TimeBand,
+)
+
+# A "table" is anything that maps column name -> 1-D column: a DataFrame or a
+# dict of NumPy arrays (e.g. from a snapshot). Compiling from plain columns
+# keeps the lookup path free of pandas.
+Table = Mapping[str, Any]
+
+BandKey = Tuple[str, str, str, int, str]  # market, commodity, segment, year, band
+
+
+class BandInputs(NamedTuple):
+    wholesale_eur_per_mwh: float
+    shaping_eur_per_mwh: float
+    loss_factor: float
+    network_eur_per_mwh: float
+    levies_eur_per_mwh: float
+
+
+def _col(table: Table, name: str) -> List[Any]:
+    return np.asarray(table[name]).tolist()
+
+
+def archetype_band_split(row: Mapping[str, Any]) -> Dict[TimeBand, float]:
+    band_split: Dict[TimeBand, float] = {}
+    if row["flat_share"]:
+        band_split[TimeBand.FLAT] = float(row["flat_share"])
+    if row["day_share"]:
+        band_split[TimeBand.DAY] = float(row["day_share"])
+    if row["night_share"]:
+        band_split[TimeBand.NIGHT] = float(row["night_share"])
+    if row["peak_share"]:
+        band_split[TimeBand.PEAK] = float(row["peak_share"])
+    if row["offpeak_share"]:
+        band_split[TimeBand.OFFPEAK] = float(row["offpeak_share"])
+    return band_split
+
+
+class MarketIndex:
+    """Market data compiled into dicts keyed by (market, commodity, segment, year, band).
+
+    Lookups raise the same errors as the DataFrame loaders they replace.
+    """
+
+    def __init__(self, version: str = ""):
+        self.version = version
+        # (market, commodity) pairs with a configured wholesale curve; the
+        # value is the path of a curve file that could not be read, else None.
+        self.wholesale_sources: Dict[Tuple[str, str], Optional[str]] = {}
+        self.wholesale: Dict[Tuple[str, str, int, str], float] = {}
+        self.shaping: Dict[Tuple[str, str, int, str], float] = {}
+        self.losses: Dict[BandKey, float] = {}
+        self.pass_through_slices: set[Tuple[str, str, str, int]] = set()
+        self.pass_through: Dict[BandKey, Tuple[float, float]] = {}
+        # Charge name -> €/MWh of the rows behind each pass_through entry.
+        self.pass_through_charges: Dict[BandKey, Dict[str, float]] = {}
+        self.archetypes: Dict[Tuple[str, str, str, str], CustomerArchetype] = {}
+        self._archetype_rows: Dict[Tuple[str, str, str, str], Dict[str, Any]] = {}
+
+    @classmethod
+    def from_tables(
+        cls,
+        wholesale: Mapping[Tuple[str, str], Table | str],
+        shaping_adders: Table,
+        losses: Table,
+        pass_through: Table,
+        customer_archetypes: Table,
+        version: str = "",
+    ) -> "MarketIndex":
+        index = cls(version)
+        for (market, commodity), table in wholesale.items():
+            if isinstance(table, str):
+                index.wholesale_sources[(market, commodity)] = table
+            else:
+                index.add_wholesale(market, commodity, table)
+        index.add_shaping_adders(shaping_adders)
+        index.add_losses(losses)
+        with METRICS.stage("pass_through_select", items=len(pass_through["value"])):
+            index.add_pass_through(pass_through)
+        index.add_archetypes(customer_archetypes)
+        return index
+
+    @classmethod
+    def from_store(cls, store: Any) -> "MarketIndex":
+        """Compile from a MarketDataStore's cached columns."""
+        settings: Settings = store.settings
+        paths = settings.file_paths
+        root: Path = store.data_root
+
+        # A missing curve file only fails quotes that need it, as with the loaders.
+        wholesale: Dict[Tuple[str, str], Table | str] = {}
+        for commodity, by_market in paths["wholesale"].items():
+            for market, rel in by_market.items():
+                try:
+                    wholesale[(market, commodity)] = store.read_columns(root / rel)
+                except FileNotFoundError:
+                    wholesale[(market, commodity)] = str(root / rel)
+
+        return cls.from_tables(
+            wholesale=wholesale,
+            shaping_adders=store.read_columns(root / paths["shaping_adders"]),
+            losses=store.read_columns(root / paths["losses"]),
+            pass_through=store.read_columns(root / paths["pass_through"]),
+            customer_archetypes=store.read_columns(root / paths["customer_archetypes"]),
+            version=store.version(),
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Any) -> "MarketIndex":
+        """Compile from a MarketSnapshot's memory-mapped columns."""
+        wholesale: Dict[Tuple[str, str], Table | str] = {}
+        for name in snapshot.table_names() + list(snapshot.meta["missing"]):
+            kind, *rest = name.split("/")
+            if kind == "wholesale":
+                commodity, market = rest
+                missing = snapshot.missing(name)
+                wholesale[(market, commodity)] = missing or snapshot.table(name)
+
+        return cls.from_tables(
+            wholesale=wholesale,
+            shaping_adders=snapshot.table("shaping_adders"),
+            losses=snapshot.table("losses"),
+            pass_through=snapshot.table("pass_through"),
+            customer_archetypes=snapshot.table("customer_archetypes"),
+            version=snapshot.version(),
+        )
+
+    # -- compilation -------------------------------------------------------
+
+    def add_wholesale(self, market: str, commodity: str, table: Table) -> None:
+        self.wholesale_sources[(market, commodity)] = None
+        # Curves are keyed by the file they come from, as in load_wholesale_curve.
+        for year, band, price in zip(
+            _col(table, "year"), _col(table, "band"), _col(table, "price_eur_per_mwh")
+        ):
+            self.wholesale.setdefault((market, commodity, int(year), str(band)), float(price))
+
+    def add_shaping_adders(self, table: Table) -> None:
+        for year, market, commodity, band, adder in zip(
+            _col(table, "year"),
+            _col(table, "market"),
+            _col(table, "commodity"),
+            _col(table, "band"),
+            _col(table, "adder_eur_per_mwh"),
+        ):
+            self.shaping.setdefault((market, commodity, int(year), band), float(adder))
+
+    def add_losses(self, table: Table) -> None:
+        for year, market, commodity, segment, band, factor in zip(
+            _col(table, "year"),
+            _col(table, "market"),
+            _col(table, "commodity"),
+            _col(table, "segment"),
+            _col(table, "band"),
+            _col(table, "loss_factor"),
+        ):
+            self.losses.setdefault((market, commodity, segment, int(year), band), float(factor))
+
+    def add_pass_through(self, table: Table) -> None:
+        """Net network and levy charges active at mid-year, as priced by the engine."""
+        years = [int(y) for y in _col(table, "year")]
+        keys = list(
+            zip(
+                _col(table, "region"),
+                _col(table, "commodity"),
+                _col(table, "segment"),
+                years,
+                _col(table, "band"),
+            )
+        )
+        charge_types = _col(table, "charge_type")
+        values = _col(table, "value")
+        names = _col(table, "name") if "name" in table else charge_types
+        charges = EffectiveDateIndex(
+            keys=keys,
+            effective_from=table["effective_from"],
+            effective_to=table["effective_to"],
+            charge_types=charge_types,
+            values=values,
+        )
+        for key in charges.keys():
+            region, commodity, segment, year, _band = key
+            self.pass_through_slices.add((region, commodity, segment, year))
+            hit = charges.lookup(key, date(year, 6, 30))
+            if hit is not None:
+                self.pass_through[key] = (hit[0], hit[1])
+                named: Dict[str, float] = {}
+                for row in hit[2]:
+                    name = str(names[row])
+                    named[name] = named.get(name, 0.0) + float(values[row])
+                self.pass_through_charges[key] = named
+
+    def add_archetypes(self, table: Table) -> None:
+        columns = list(table.keys())
+        values = [_col(table, c) for c in columns]
+        for row_values in zip(*values):
+            row = dict(zip(columns, row_values))
+            key = (row["market"], row["commodity"], row["segment"], row["tariff_structure"])
+            self._archetype_rows.setdefault(key, row)
+
+    # -- lookups -----------------------------------------------------------
+
+    def archetype_rows(self) -> List[Dict[str, Any]]:
+        """The customer archetype table, one row per market/commodity/segment/tariff."""
+        return list(self._archetype_rows.values())
+
+    def years(self) -> List[int]:
+        years = {year for _m, _c, year, _b in self.wholesale}
+        years.update(year for _m, _c, _s, year, _b in self.losses)
+        years.update(year for _m, _c, _s, year in self.pass_through_slices)
+        return sorted(years)
+
+    def band_inputs(
+        self,
+        market: Market,
+        commodity: Commodity,
+        segment: Segment,
+        year: int,
+        bands: List[TimeBand],
+    ) -> List[BandInputs]:
+        m, c, s = market.value, commodity.value, segment.value
+        if (m, c) not in self.wholesale_sources:
+            raise KeyError(m)
+        missing_path = self.wholesale_sources[(m, c)]
+        if missing_path is not None:
+            raise FileNotFoundError(f"Required input file not found: {missing_path}")
+        if (m, c, s, year) not in self.pass_through_slices:
+            raise ValueError("Pass-through charge dataset is empty for requested slice.")
+
+        inputs: List[BandInputs] = []
+        for band in bands:
+            b = band.value
+            wholesale = self.wholesale.get((m, c, year, b))
+            if wholesale is None:
+                raise ValueError(f"No wholesale price for band {b}")
+            shaping = self.shaping.get((m, c, year, b), 0.0)
+            loss_factor = self.losses.get((m, c, s, year, b))
+            if loss_factor is None:
+                raise ValueError(f"No loss factor for band {b}")
+            pass_through = self.pass_through.get((m, c, s, year, b))
+            if pass_through is None:
+                raise ValueError(f"No pass-through charges for band {b} @ {m} {year}")
+            inputs.append(BandInputs(wholesale, shaping, loss_factor, *pass_through))
+        return inputs
+
+    def archetype(
+        self,
+        market: Market,
+        commodity: Commodity,
+        segment: Segment,
+        tariff_structure: TariffStructure,
+    ) -> CustomerArchetype:
+        key = (market.value, commodity.value, segment.value, tariff_structure.value)
+        archetype = self.archetypes.get(key)
+        if archetype is not None:
+            return archetype
+        row = self._archetype_rows.get(key)
+        if row is None:
+            raise ValueError(
+                f"No archetype found for {market.value}/{commodity.value}/{segment.value}/{tariff_structure.value}"
+            )
+        archetype = CustomerArchetype(
+            archetype_id=row["archetype_id"],
+            name=row["name"],
+            market=Market(row["market"]),
+            commodity=Commodity(row["commodity"]),
+            segment=Segment(row["segment"]),
+            tariff_structure=TariffStructure(row["tariff_structure"]),
+            annual_consumption_kwh=float(row["annual_consumption_kwh"]),
+            standing_charge_eur_per_year=float(row["standing_charge_eur_per_year"]),
+            band_split=archetype_band_split(row),
+        )
+        self.archetypes[key] = archetype
+        return archetype
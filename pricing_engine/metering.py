@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .book import BookWriter, iter_book_chunks
+from .schemas import Market, TariffStructure
+from .tou import INTERVAL, TouCalendar, intervals_in_year, local_to_utc
+
+# Interval-read files need these columns; ``market`` is optional per row.
+READ_COLUMNS = ["customer_id", "timestamp", "kwh"]
+
+
+@dataclass
+class IngestStats:
+    rows: int = 0
+    chunks: int = 0
+    customers: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def reads_to_utc(timestamps: pd.Series, local_time: bool = False) -> np.ndarray:
+    """Parse read timestamps to naive UTC datetime64[m].
+
+    Offset-aware values are converted. Naive values are taken as UTC unless
+    ``local_time`` is set, in which case they are Irish/UK local clock times.
+    """
+    parsed = pd.to_datetime(timestamps, format="ISO8601", utc=False)
+    if getattr(parsed.dt, "tz", None) is not None:
+        return parsed.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy().astype("datetime64[m]")
+    values = parsed.to_numpy().astype("datetime64[m]")
+    return local_to_utc(values) if local_time else values
+
+
+@dataclass
+class BandAccumulator:
+    """Running kWh per customer and band over chunks of interval reads."""
+
+    customer_ids: List[Any] = field(default_factory=list)
+    markets: List[Market] = field(default_factory=list)
+    _index: Dict[Any, int] = field(default_factory=dict)
+    _sums: np.ndarray = field(default_factory=lambda: np.zeros((6, 0)))
+
+    # Rows of _sums: reads, total, day, night, peak, offpeak
+    _ROWS = ("reads", "kwh", "day", "night", "peak", "offpeak")
+
+    def _customer_codes(self, ids: pd.Series, markets: np.ndarray) -> np.ndarray:
+        codes, uniques = pd.factorize(ids)
+        if (codes < 0).any():
+            raise ValueError("Meter reads with no customer_id")
+        _, first_row = np.unique(codes, return_index=True)
+        mapping = np.empty(len(uniques), dtype=np.int64)
+        for u, (customer, row) in enumerate(zip(uniques, first_row)):
+            position = self._index.get(customer)
+            if position is None:
+                position = self._index[customer] = len(self.customer_ids)
+                self.customer_ids.append(customer)
+                self.markets.append(Market(markets[row]))
+            mapping[u] = position
+        return mapping[codes]
+
+    def add(
+        self,
+        ids: pd.Series,
+        markets: np.ndarray,
+        kwh: np.ndarray,
+        day_night: np.ndarray,
+        peak_offpeak: np.ndarray,
+    ) -> None:
+        codes = self._customer_codes(ids, markets)
+        n = len(self.customer_ids)
+        if self._sums.shape[1] < n:
+            grown = np.zeros((len(self._ROWS), max(n, 2 * self._sums.shape[1])))
+            grown[:, : self._sums.shape[1]] = self._sums
+            self._sums = grown
+        weights = (
+            None,
+            kwh,
+            np.where(day_night == 0, kwh, 0.0),
+            np.where(day_night == 1, kwh, 0.0),
+            np.where(peak_offpeak == 0, kwh, 0.0),
+            np.where(peak_offpeak == 1, kwh, 0.0),
+        )
+        for row, w in enumerate(weights):
+            self._sums[row, :n] += np.bincount(codes, weights=w, minlength=n)
+
+    def table(self, annualise: bool = False, year: Optional[int] = None) -> pd.DataFrame:
+        """One row per customer with consumption and band shares as in customer_archetypes.csv."""
+        n = len(self.customer_ids)
+        reads, kwh, day, night, peak, offpeak = self._sums[:, :n]
+        annual = kwh
+        if annualise:
+            per_year = intervals_in_year(year) if year is not None else 17_520
+            annual = np.divide(kwh * per_year, reads, out=np.zeros(n), where=reads > 0)
+
+        def share(part: np.ndarray) -> np.ndarray:
+            return np.divide(part, kwh, out=np.zeros(n), where=kwh > 0)
+
+        return pd.DataFrame(
+            {
+                "customer_id": self.customer_ids,
+                "market": [m.value for m in self.markets],
+                "reads": reads.astype(np.int64),
+                "metered_kwh": kwh,
+                "annual_consumption_kwh": annual,
+                "flat_share": np.where(kwh > 0, 1.0, 0.0),
+                "day_share": share(day),
+                "night_share": share(night),
+                "peak_share": share(peak),
+                "offpeak_share": share(offpeak),
+            }
+        )
+
+
+def ingest_meter_reads(
+    input_path: str | Path,
+    output_path: Optional[str | Path] = None,
+    market: Optional[Market] = None,
+    chunk_size: int = 1_000_000,
+    local_time: bool = False,
+    interval_ending: bool = False,
+    annualise: bool = False,
+    year: Optional[int] = None,
+    defaults: Optional[Mapping[str, Any]] = None,
+    progress: Optional[Callable[[IngestStats], None]] = None,
+) -> Tuple[pd.DataFrame, IngestStats]:
+    """Stream interval reads (CSV or Parquet) into a per-customer band-split table.
+
+    Each read is mapped to DAY/NIGHT and PEAK/OFFPEAK by its market's TOU
+    calendar and summed per customer, one chunk in memory at a time. Rows
+    without a ``market`` column use ``market``. ``defaults`` adds constant
+    columns (e.g. segment, tariff_structure, contract_type, standing charge)
+    so the table can go straight into ``reprice-book``.
+    """
+    calendars: Dict[Market, TouCalendar] = {}
+    accumulator = BandAccumulator()
+    stats = IngestStats()
+    start = time.perf_counter()
+
+    for chunk in iter_book_chunks(input_path, chunk_size):
+        missing = [c for c in READ_COLUMNS if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Meter read file is missing columns: {missing}")
+        if "market" in chunk.columns:
+            markets = chunk["market"].to_numpy().astype(str)
+        elif market is not None:
+            markets = np.full(len(chunk), market.value)
+        else:
+            raise ValueError("Meter reads have no 'market' column and no market was given")
+
+        utc = reads_to_utc(chunk["timestamp"], local_time=local_time)
+        if interval_ending:
+            utc = utc - INTERVAL
+        day_night = np.empty(len(chunk), dtype=np.int8)
+        peak_offpeak = np.empty(len(chunk), dtype=np.int8)
+        for value in np.unique(markets):
+            rows = markets == value
+            calendar = calendars.setdefault(Market(value), TouCalendar(Market(value)))
+            day_night[rows] = calendar.slots(TariffStructure.DAY_NIGHT, utc[rows])
+            peak_offpeak[rows] = calendar.slots(TariffStructure.PEAK_OFFPEAK, utc[rows])
+
+        accumulator.add(
+            chunk["customer_id"],
+            markets,
+            chunk["kwh"].to_numpy(dtype=float),
+            day_night,
+            peak_offpeak,
+        )
+        stats.rows += len(chunk)
+        stats.chunks += 1
+        stats.customers = len(accumulator.customer_ids)
+        stats.seconds = time.perf_counter() - start
+        if progress is not None:
+            progress(stats)
+
+    table = accumulator.table(annualise=annualise, year=year)
+    for column, value in (defaults or {}).items():
+        table[column] = value
+    if output_path is not None:
+        with BookWriter(output_path) as writer:
+            writer.write(table)
+    stats.seconds = time.perf_counter() - start
+    return table, stats
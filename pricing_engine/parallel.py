@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import math
+import os
+import shutil
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch import (
+    MAX_BANDS,
+    PricingTables,
+    RequestBatch,
+    TariffResultBatch,
+    price_with_tables,
+)
+from .cost_stack import CostStack
+from .risk import MonteCarloRisk
+from .schemas import TariffRequest, TariffResult
+from .tariff_engine import TariffEngine
+
+REQUEST_ARRAYS = (
+    "market",
+    "commodity",
+    "segment",
+    "tariff_structure",
+    "contract_type",
+    "year",
+    "annual_consumption_kwh",
+    "standing_charge_eur_per_year",
+    "vat_rate",
+    "band_weights",
+)
+STACK_ARRAYS = tuple(f"stack_{name}" for name in CostStack._fields)
+BAND_ARRAYS = STACK_ARRAYS + ("energy_only", "all_in")
+TOTAL_ARRAYS = (
+    "weighted_energy_only_eur_per_kwh",
+    "weighted_all_in_eur_per_kwh",
+    "estimated_annual_bill_ex_vat",
+    "estimated_annual_bill_inc_vat",
+)
+
+# name -> (path, dtype, shape)
+ArraySpec = Dict[str, Tuple[str, str, Tuple[int, ...]]]
+
+
+def _shared_dir() -> str:
+    # /dev/shm keeps the mapped files in RAM on Linux; elsewhere use the temp dir.
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    return tempfile.mkdtemp(prefix="pricing_engine_", dir=base)
+
+
+class SharedArrays:
+    """NumPy arrays backed by memory-mapped files that worker processes open by path."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.spec: ArraySpec = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+
+    def put(self, name: str, array: np.ndarray) -> None:
+        out = self.empty(name, array.shape, array.dtype)
+        out[...] = array
+
+    def empty(self, name: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        path = self.directory / f"{name}-{uuid.uuid4().hex}.npy"
+        dtype = np.dtype(dtype)
+        arr = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+        self.spec[name] = (str(path), dtype.str, tuple(shape))
+        self.arrays[name] = arr
+        return arr
+
+    def unlink(self) -> None:
+        for path, _, _ in self.spec.values():
+            Path(path).unlink(missing_ok=True)
+
+
+def open_shared(spec: ArraySpec, mode: str) -> Dict[str, np.ndarray]:
+    return {name: np.load(path, mmap_mode=mode) for name, (path, _dtype, _shape) in spec.items()}
+
+
+# Per-worker cache of opened market tables, keyed by their spec paths.
+_worker_tables: Dict[Tuple[str, ...], PricingTables] = {}
+
+
+def _price_slice(
+    tables_spec: ArraySpec,
+    request_spec: ArraySpec,
+    output_spec: ArraySpec,
+    start: int,
+    stop: int,
+    risk_model: Optional[MonteCarloRisk] = None,
+) -> int:
+    key = tuple(path for path, _, _ in tables_spec.values())
+    tables = _worker_tables.get(key)
+    if tables is None:
+        _worker_tables.clear()
+        tables = PricingTables.from_arrays(open_shared(tables_spec, "r"))
+        _worker_tables[key] = tables
+
+    requests = open_shared(request_spec, "r")
+    batch = RequestBatch(
+        **{name: np.asarray(requests[name][start:stop]) for name in REQUEST_ARRAYS}
+    )
+    priced = price_with_tables(tables, batch, risk_model)
+
+    outputs = open_shared(output_spec, "r+")
+    for name, value in zip(STACK_ARRAYS, priced.stack):
+        outputs[name][:, start:stop] = value
+    outputs["energy_only"][:, start:stop] = priced.energy_only
+    outputs["all_in"][:, start:stop] = priced.all_in
+    outputs["valid"][:, start:stop] = priced.valid
+    for name in TOTAL_ARRAYS:
+        outputs[name][start:stop] = getattr(priced, name)
+    for arr in outputs.values():
+        arr.flush()
+    return stop - start
+
+
+@dataclass
+class ParallelPricer:
+    """Price large batches across a process pool.
+
+    The dense market tables are written once per data version to
+    memory-mapped files (under /dev/shm where available). Request and
+    output arrays are mapped the same way, so workers read market data and
+    write results in place. Tasks only carry file paths and row ranges, and
+    nothing is pickled per quote. The maths is the serial price_with_tables,
+    so results are identical to TariffEngine.price_batch.
+
+    Each batch is split into one task per process, of at least
+    ``min_task_rows`` rows; smaller batches are priced in this process.
+    """
+
+    engine: TariffEngine
+    processes: Optional[int] = None
+    min_task_rows: int = 1_000
+
+    def __post_init__(self) -> None:
+        self.processes = self.processes or os.cpu_count() or 1
+        self._dir = _shared_dir()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tables: Optional[SharedArrays] = None
+        self._tables_version: Optional[str] = None
+
+    @property
+    def settings(self):
+        return self.engine.settings
+
+    def __enter__(self) -> "ParallelPricer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def _shared_tables(self, tables: PricingTables) -> ArraySpec:
+        if self._tables is None or self._tables_version != tables.version:
+            if self._tables is not None:
+                self._tables.unlink()
+            self._tables = SharedArrays(self._dir)
+            for name, array in tables.arrays().items():
+                self._tables.put(name, array)
+            self._tables_version = tables.version
+        return self._tables.spec
+
+    def build_tariffs(self, requests: Sequence[TariffRequest]) -> List[TariffResult]:
+        return self.price_batch(RequestBatch.from_requests(requests)).results()
+
+    def task_rows(self, n: int) -> int:
+        """Rows per task for a batch of ``n``: an even share per process."""
+        return max(self.min_task_rows, math.ceil(n / self.processes))
+
+    def price_batch(self, batch: RequestBatch, on_breach: str = "raise") -> TariffResultBatch:
+        n = len(batch)
+        step = self.task_rows(n)
+        if self.processes == 1 or step >= n:
+            return self.engine.price_batch(batch, on_breach)
+
+        engine = self.engine
+        tables = engine.market_tables()
+        engine.require_inputs(tables, batch)
+        tables_spec = self._shared_tables(tables)
+
+        requests = SharedArrays(self._dir)
+        out = SharedArrays(self._dir)
+        try:
+            for name in REQUEST_ARRAYS:
+                requests.put(name, getattr(batch, name))
+            for name in BAND_ARRAYS:
+                out.empty(name, (MAX_BANDS, n), np.float64)
+            out.empty("valid", (MAX_BANDS, n), np.bool_)
+            for name in TOTAL_ARRAYS:
+                out.empty(name, (n,), np.float64)
+
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.processes)
+            futures = [
+                self._pool.submit(
+                    _price_slice,
+                    tables_spec,
+                    requests.spec,
+                    out.spec,
+                    start,
+                    min(start + step, n),
+                    engine.risk_model(),
+                )
+                for start in range(0, n, step)
+            ]
+            for future in futures:
+                future.result()
+
+            # Copy out of the mapped files so they can be removed.
+            arrays = {name: np.array(arr) for name, arr in out.arrays.items()}
+        finally:
+            requests.unlink()
+            out.unlink()
+
+        priced = TariffResultBatch(
+            batch=batch,
+            stack=CostStack(*(arrays[name] for name in STACK_ARRAYS)),
+            energy_only=arrays["energy_only"],
+            all_in=arrays["all_in"],
+            valid=arrays["valid"],
+            **{name: arrays[name] for name in TOTAL_ARRAYS},
+            snapshot_id=tables.version,
+        )
+        return engine.check_bounds(priced, on_breach)
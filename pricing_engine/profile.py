@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .batch import (
+    COMMODITIES,
+    CONTRACT_TYPES,
+    MARKETS,
+    MAX_BANDS,
+    SEGMENTS,
+    TARIFF_STRUCTURES,
+    RequestBatch,
+    TariffResultBatch,
+    price_band_inputs,
+)
+from .schemas import (
+    Commodity,
+    ContractType,
+    Market,
+    Segment,
+    TariffStructure,
+    TIME_BANDS_BY_TARIFF,
+)
+from .tariff_engine import TariffEngine
+from .tou import TouCalendar, intervals_in_year
+
+# Profiles are kWh per half-hour interval, one row per site, stored as float32:
+# a year for 50k sites is ~3.5 GB on disk and is paged in as needed.
+PROFILE_DTYPE = np.float32
+
+
+def create_profiles(path: str | Path, n_sites: int, year: int) -> np.ndarray:
+    """Writable (sites x intervals) float32 memory map, zero-filled."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return np.lib.format.open_memmap(
+        path, mode="w+", dtype=PROFILE_DTYPE, shape=(n_sites, intervals_in_year(year))
+    )
+
+
+def open_profiles(path: str | Path) -> np.ndarray:
+    """Read-only memory map of a profile file written by ``create_profiles``."""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Required input file not found: {path}")
+    return np.load(path, mmap_mode="r")
+
+
+def load_half_hourly_prices(path: str | Path, year: int) -> np.ndarray:
+    """Forward prices in €/MWh, one per interval, from a ``.npy`` or a CSV ``price_eur_per_mwh`` column."""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Required input file not found: {path}")
+    if path.suffix == ".npy":
+        prices = np.load(path)
+    else:
+        import pandas as pd
+
+        prices = pd.read_csv(path, usecols=["price_eur_per_mwh"])["price_eur_per_mwh"].to_numpy()
+    prices = np.asarray(prices, dtype=np.float64)
+    expected = intervals_in_year(year)
+    if prices.shape != (expected,):
+        raise ValueError(f"Expected {expected} half-hourly prices for {year}, got {len(prices)}")
+    return prices
+
+
+@dataclass
+class ProfilePricer:
+    """Price sites from half-hourly load profiles and a half-hourly forward curve.
+
+    Intervals are grouped into the tariff's bands by the market's TOU calendar.
+    Per band, wholesale is the time-weighted (baseload) price of the band's
+    intervals and shaping is the site's volume-weighted price minus that
+    baseload. Losses, network, levies, margin and risk then follow the
+    band model, so results come back as an ordinary TariffResultBatch.
+
+    Band volumes and costs for a chunk of sites are one matrix product,
+    (sites x intervals) @ (intervals x 2 * MAX_BANDS).
+    """
+
+    engine: TariffEngine
+    chunk_size: int = 2_048
+    _calendars: Dict[Market, TouCalendar] = field(default_factory=dict, init=False, repr=False)
+
+    def calendar(self, market: Market) -> TouCalendar:
+        if market not in self._calendars:
+            self._calendars[market] = TouCalendar(market)
+        return self._calendars[market]
+
+    def band_totals(
+        self, profiles: np.ndarray, prices: np.ndarray, slots: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(MAX_BANDS, N) kWh and kWh x €/MWh per band, accumulated in float64."""
+        n_sites, n_intervals = profiles.shape
+        if prices.shape != (n_intervals,) or slots.shape != (n_intervals,):
+            raise ValueError(
+                f"Profiles have {n_intervals} intervals but prices/calendar have {len(prices)}"
+            )
+        design = np.zeros((n_intervals, 2 * MAX_BANDS))
+        for b in range(MAX_BANDS):
+            in_band = slots == b
+            design[in_band, b] = 1.0
+            design[in_band, MAX_BANDS + b] = prices[in_band]
+
+        totals = np.empty((n_sites, 2 * MAX_BANDS))
+        for start in range(0, n_sites, self.chunk_size):
+            stop = min(start + self.chunk_size, n_sites)
+            totals[start:stop] = np.asarray(profiles[start:stop], dtype=np.float64) @ design
+        kwh = np.ascontiguousarray(totals[:, :MAX_BANDS].T)
+        cost = np.ascontiguousarray(totals[:, MAX_BANDS:].T)
+        return kwh, cost
+
+    def price_profiles(
+        self,
+        profiles: np.ndarray,
+        prices: np.ndarray,
+        market: Market,
+        commodity: Commodity,
+        segment: Segment,
+        tariff_structure: TariffStructure,
+        year: int,
+        contract_type: ContractType,
+        standing_charge_eur_per_year: float | np.ndarray = 0.0,
+        include_vat: bool = True,
+    ) -> TariffResultBatch:
+        engine = self.engine
+        bands = TIME_BANDS_BY_TARIFF[tariff_structure]
+        band_inputs = engine.market_index().band_inputs(market, commodity, segment, year, bands)
+
+        prices = np.asarray(prices, dtype=np.float64)
+        slots = self.calendar(market).year_slots(tariff_structure, year)
+        kwh, cost = self.band_totals(profiles, prices, slots)
+        n = kwh.shape[1]
+
+        baseload = np.zeros((MAX_BANDS, 1))
+        for b in range(len(bands)):
+            if (slots == b).any():
+                baseload[b] = prices[slots == b].mean()
+        volume_weighted = np.divide(cost, kwh, out=np.repeat(baseload, n, axis=1), where=kwh > 0)
+
+        def per_band(values: list, fill: float) -> np.ndarray:
+            column = np.full((MAX_BANDS, 1), fill)
+            column[: len(values), 0] = values
+            return np.repeat(column, n, axis=1)
+
+        annual_kwh = kwh.sum(axis=0)
+        weights = np.divide(kwh, annual_kwh, out=np.zeros_like(kwh), where=annual_kwh > 0)
+        vat_rate = engine.settings.vat[market.value] if include_vat else 0.0
+
+        batch = RequestBatch(
+            market=np.full(n, MARKETS.index(market), dtype=np.int8),
+            commodity=np.full(n, COMMODITIES.index(commodity), dtype=np.int8),
+            segment=np.full(n, SEGMENTS.index(segment), dtype=np.int8),
+            tariff_structure=np.full(n, TARIFF_STRUCTURES.index(tariff_structure), dtype=np.int8),
+            contract_type=np.full(n, CONTRACT_TYPES.index(contract_type), dtype=np.int8),
+            year=np.full(n, year, dtype=np.int32),
+            annual_consumption_kwh=annual_kwh,
+            standing_charge_eur_per_year=np.broadcast_to(
+                np.asarray(standing_charge_eur_per_year, dtype=float), (n,)
+            ).copy(),
+            vat_rate=np.full(n, vat_rate),
+            band_weights=np.ascontiguousarray(weights.T),
+        )
+        inputs = {
+            "wholesale": np.repeat(baseload, n, axis=1),
+            "shaping": volume_weighted - baseload,
+            "loss_factor": per_band([i.loss_factor for i in band_inputs], 1.0),
+            "network": per_band([i.network_eur_per_mwh for i in band_inputs], 0.0),
+            "levies": per_band([i.levies_eur_per_mwh for i in band_inputs], 0.0),
+        }
+        risk_model = engine.risk_model()
+        result = price_band_inputs(
+            batch,
+            **inputs,
+            margin_pct=float(engine.settings.margin_pct[segment.value]),
+            risk_pct=(
+                float(engine.settings.risk_pct[segment.value])
+                if risk_model is None
+                else risk_model.risk_pct(batch, inputs)
+            ),
+            valid=per_band([True] * len(bands), False).astype(bool),
+            snapshot_id=engine.market_index().version,
+        )
+        engine.check_bounds(result)
+        return result
@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import atexit
+import hashlib
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from .config import Settings
+from .schemas import TariffRequest, TariffResult, dump_model, load_model
+
+RequestKey = Tuple[Any, ...]
+
+
+def request_key(request: TariffRequest) -> RequestKey:
+    """Canonical, hashable form of a request; equal requests give equal keys."""
+    return (
+        request.market.value,
+        request.commodity.value,
+        request.segment.value,
+        request.tariff_structure.value,
+        request.year,
+        request.contract_type.value,
+        float(request.annual_consumption_kwh),
+        float(request.standing_charge_eur_per_year),
+        tuple(sorted((band.value, float(share)) for band, share in request.band_split.items())),
+        None if request.vat_rate is None else float(request.vat_rate),
+    )
+
+
+def request_fingerprint(request: TariffRequest) -> str:
+    """Stable hex digest of ``request_key``, e.g. for keys stored outside the process."""
+    return hashlib.sha256(repr(request_key(request)).encode()).hexdigest()[:32]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class QuoteCache:
+    """Size-bounded LRU of priced quotes with an optional time-to-live.
+
+    Entries belong to one ``version`` (market data plus settings); a new
+    version clears the cache. Cached results are shared between callers and
+    should be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_s: Optional[float] = None):
+        if max_entries < 1:
+            raise ValueError("Quote cache needs room for at least one entry")
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.version: Optional[Hashable] = None
+        self.stats = CacheStats()
+        self._entries: OrderedDict[RequestKey, Tuple[float, TariffResult]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def validate(self, version: Hashable) -> None:
+        """Drop every entry if ``version`` differs from the one they were priced on."""
+        if version != self.version:
+            if self._entries:
+                self.stats.invalidations += 1
+            self._entries.clear()
+            self.version = version
+
+    def get(self, key: RequestKey) -> Optional[TariffResult]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return result
+
+    def put(self, key: RequestKey, result: TariffResult) -> None:
+        expires_at = time.monotonic() + self.ttl_s if self.ttl_s is not None else float("inf")
+        self._entries[key] = (expires_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def content_key(parts: Tuple[Any, ...], data_version: str, settings: Settings) -> str:
+    """Hex key for a quote: what was asked (``parts``), the input data and the config."""
+    h = hashlib.sha256()
+    h.update(repr(parts).encode())
+    h.update(data_version.encode())
+    h.update(dump_model(settings))
+    return h.hexdigest()
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quotes (
+    key TEXT PRIMARY KEY,
+    result BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS quotes_accessed ON quotes (accessed_at);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO counters VALUES ('bytes', 0), ('hits', 0), ('misses', 0);
+CREATE TRIGGER IF NOT EXISTS quotes_insert AFTER INSERT ON quotes BEGIN
+    UPDATE counters SET value = value + NEW.size WHERE name = 'bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS quotes_update AFTER UPDATE OF size ON quotes BEGIN
+    UPDATE counters SET value = value + NEW.size - OLD.size WHERE name = 'bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS quotes_delete AFTER DELETE ON quotes BEGIN
+    UPDATE counters SET value = value - OLD.size WHERE name = 'bytes';
+END;
+"""
+
+
+class PersistentQuoteCache:
+    """SQLite file of serialized TariffResults shared between processes.
+
+    Keys come from ``content_key``, so a result is only found again for the
+    same request, input files and config. The database runs in WAL mode and
+    ``get`` only reads, so lookups do not wait for writers. Hit and miss
+    counts and access times are kept in memory and written in one
+    transaction every ``flush_every`` lookups or ``flush_interval_s``
+    seconds, and on ``put``, ``prune``, ``stats`` and ``close``; writers
+    queue for up to ``timeout_s``.
+    Once the stored results exceed ``max_bytes`` the least recently used
+    ones are evicted. A ``read_only`` cache (the default for a file this
+    process cannot write) serves lookups and stores nothing.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = 256 * 1024 * 1024,
+        timeout_s: float = 30.0,
+        read_only: Optional[bool] = None,
+        flush_every: int = 256,
+        flush_interval_s: float = 5.0,
+    ):
+        import sqlite3
+
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.flush_every = flush_every
+        self.flush_interval_s = flush_interval_s
+        if read_only is None:
+            read_only = self.path.exists() and not os.access(self.path, os.W_OK)
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        # Per key: [lookups since the last flush, last access time].
+        self._accessed: Dict[str, List[float]] = {}
+        self._misses = 0
+        self._lookups = 0
+        self._flushed_at = time.monotonic()
+        if read_only:
+            self._db = sqlite3.connect(
+                f"{self.path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                timeout=timeout_s,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(
+                str(self.path), timeout=timeout_s, isolation_level=None, check_same_thread=False
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+            atexit.register(_flush_at_exit, weakref.ref(self))
+
+    def close(self) -> None:
+        if self._db is None:
+            return
+        self.flush()
+        self._db.close()
+        self._db = None
+
+    @contextmanager
+    def _transaction(self) -> Iterator[Any]:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def _require_writable(self, action: str) -> None:
+        if self.read_only:
+            raise PermissionError(f"Cannot {action} the read-only result cache {self.path}")
+
+    def _write_counts(self, db: Any) -> None:
+        """Write the lookups gathered since the last flush; caller holds the lock."""
+        if self._accessed:
+            db.executemany(
+                "UPDATE quotes SET accessed_at = MAX(accessed_at, ?), hits = hits + ? "
+                "WHERE key = ?",
+                [(at, n, key) for key, (n, at) in self._accessed.items()],
+            )
+        hits = sum(int(n) for n, _ in self._accessed.values())
+        db.executemany(
+            "UPDATE counters SET value = value + ? WHERE name = ?",
+            [(hits, "hits"), (self._misses, "misses")],
+        )
+        self._accessed.clear()
+        self._misses = self._lookups = 0
+        self._flushed_at = time.monotonic()
+
+    def flush(self) -> None:
+        """Write pending hit/miss counts and access times (a no-op when read-only)."""
+        if self.read_only or not self._lookups:
+            return
+        with self._transaction() as db:
+            self._write_counts(db)
+
+    def get(self, key: str) -> Optional[TariffResult]:
+        with self._lock:
+            row = self._db.execute("SELECT result FROM quotes WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._misses += 1
+            else:
+                seen = self._accessed.setdefault(key, [0, 0.0])
+                seen[0] += 1
+                seen[1] = time.time()
+            self._lookups += 1
+            due = (
+                self._lookups >= self.flush_every
+                or time.monotonic() - self._flushed_at >= self.flush_interval_s
+            )
+        if due:
+            self.flush()
+        return None if row is None else load_model(TariffResult, row[0])
+
+    def put(self, key: str, result: TariffResult) -> None:
+        if self.read_only:
+            return
+        payload = dump_model(result)
+        now = time.time()
+        with self._transaction() as db:
+            self._write_counts(db)
+            db.execute(
+                "INSERT INTO quotes (key, result, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+                "result = excluded.result, size = excluded.size, accessed_at = excluded.accessed_at",
+                (key, payload, len(payload), now, now),
+            )
+            self._evict(db, self.max_bytes)
+
+    def _evict(self, db: Any, max_bytes: int) -> int:
+        (total,) = db.execute("SELECT value FROM counters WHERE name = 'bytes'").fetchone()
+        if total <= max_bytes:
+            return 0
+        # Walk from least recently used until enough bytes are freed.
+        excess, keys = total - max_bytes, []
+        for key, size in db.execute("SELECT key, size FROM quotes ORDER BY accessed_at"):
+            keys.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        db.executemany("DELETE FROM quotes WHERE key = ?", keys)
+        return len(keys)
+
+    def prune(self, max_bytes: Optional[int] = None, older_than_s: Optional[float] = None) -> int:
+        """Remove entries unused for ``older_than_s`` and shrink to ``max_bytes``."""
+        self._require_writable("prune")
+        with self._transaction() as db:
+            self._write_counts(db)
+            removed = 0
+            if older_than_s is not None:
+                cursor = db.execute(
+                    "DELETE FROM quotes WHERE accessed_at < ?", (time.time() - older_than_s,)
+                )
+                removed += cursor.rowcount
+            removed += self._evict(db, self.max_bytes if max_bytes is None else max_bytes)
+        with self._lock:
+            self._db.execute("VACUUM")
+        return removed
+
+    def clear(self) -> None:
+        self._require_writable("clear")
+        with self._transaction() as db:
+            self._accessed.clear()
+            self._misses = self._lookups = 0
+            db.execute("DELETE FROM quotes")
+            db.execute("UPDATE counters SET value = 0")
+
+    def stats(self) -> Dict[str, Any]:
+        self.flush()
+        with self._lock:
+            entries, oldest, newest = self._db.execute(
+                "SELECT COUNT(*), MIN(accessed_at), MAX(accessed_at) FROM quotes"
+            ).fetchone()
+            counters = dict(self._db.execute("SELECT name, value FROM counters"))
+            hits = counters["hits"] + sum(int(n) for n, _ in self._accessed.values())
+            misses = counters["misses"] + self._misses
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": counters["bytes"],
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "least_recently_used": oldest,
+            "most_recently_used": newest,
+        }
+
+
+def _flush_at_exit(ref: "weakref.ref[PersistentQuoteCache]") -> None:
+    cache = ref()
+    if cache is not None:
+        cache.close()
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import csv
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .book import BatchPricer, iter_book_chunks, iter_book_quotes
+from .config import Settings
+from .export_excel import workbook_sheets, write_workbook
+from .quote_cache import content_key, request_fingerprint
+from .schemas import TariffResult
+
+MANIFEST_NAME = "manifest.csv"
+MANIFEST_COLUMNS = ["quote_id", "file", "snapshot_id", "fingerprint", "bytes", "status", "error"]
+
+# (file name, quote id, fingerprint, result) for one workbook; a task renders a list of them.
+Job = Tuple[str, str, str, TariffResult]
+# (file name, quote id, snapshot id, fingerprint, bytes written, error message or "")
+Outcome = Tuple[str, str, str, str, int, str]
+
+
+@dataclass
+class QuotePackStats:
+    files: int = 0
+    skipped: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds else 0.0
+
+
+def pack_file_name(quote_id: object) -> str:
+    """Workbook name for a quote id, safe on any file system."""
+    name = re.sub(r"[^A-Za-z0-9._-]+", "_", str(quote_id)).strip("._")
+    if not name:
+        raise ValueError(f"Quote id {quote_id!r} gives an empty file name")
+    return f"{name}.xlsx"
+
+
+def pack_fingerprint(result: TariffResult, settings: Settings) -> str:
+    """What a workbook was priced from: the request, the market data and the config."""
+    return content_key(
+        ("quote-pack", request_fingerprint(result.request)), result.snapshot_id, settings
+    )
+
+
+def read_manifest(output_dir: str | Path) -> Dict[str, Dict[str, str]]:
+    """Latest manifest row per file; later rows (retries, re-runs) win."""
+    path = Path(output_dir) / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    with open(path, newline="") as f:
+        return {row["file"]: row for row in csv.DictReader(f)}
+
+
+def _render(output_dir: str, jobs: List[Job]) -> List[Outcome]:
+    """Worker task: write each workbook atomically; failures are reported, not raised."""
+    outcomes: List[Outcome] = []
+    for name, quote_id, fingerprint, result in jobs:
+        final = os.path.join(output_dir, name)
+        # pack_file_name never produces "~", so this cannot clash with a finished workbook.
+        partial = os.path.join(output_dir, f"~{name}")
+        try:
+            write_workbook(workbook_sheets(result), partial)
+            os.replace(partial, final)
+            size = os.path.getsize(final)
+            outcomes.append((name, quote_id, result.snapshot_id, fingerprint, size, ""))
+        except Exception as exc:  # noqa: BLE001 - one bad quote must not stop the pack
+            if os.path.exists(partial):
+                os.remove(partial)
+            error = f"{type(exc).__name__}: {exc}"
+            outcomes.append((name, quote_id, result.snapshot_id, fingerprint, 0, error))
+    return outcomes
+
+
+def build_quote_packs(
+    engine: BatchPricer,
+    input_path: str | Path,
+    output_dir: str | Path,
+    processes: Optional[int] = None,
+    chunk_size: int = 5_000,
+    files_per_task: int = 32,
+    year: Optional[int] = None,
+    include_vat: bool = True,
+    progress: Optional[Callable[[QuotePackStats], None]] = None,
+) -> QuotePackStats:
+    """One export_tariff_to_excel workbook per book row, rendered across a process pool.
+
+    Pricing runs in this process, a book chunk at a time; workers only
+    render workbooks. Each file is written under a temporary name and
+    renamed when complete, then logged to ``manifest.csv``. A re-run skips
+    files the manifest lists as written from the same request, market data
+    and config (pack_fingerprint), so a crashed or interrupted run resumes
+    where it stopped and changed quotes are rendered again. ``processes``
+    defaults to one per CPU core; 1 renders in this process.
+    """
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    manifest_path = out / MANIFEST_NAME
+    manifest_rows = read_manifest(out)
+    if manifest_rows and "fingerprint" not in next(iter(manifest_rows.values())):
+        # Written before fingerprints were recorded: nothing in it can be trusted.
+        manifest_path.unlink()
+        manifest_rows = {}
+    done = {
+        name: row["fingerprint"]
+        for name, row in manifest_rows.items()
+        if row["status"] == "ok" and (out / name).exists()
+    }
+    processes = processes or os.cpu_count() or 1
+    stats = QuotePackStats()
+    start = time.perf_counter()
+    reported = 0
+
+    new_manifest = not manifest_path.exists()
+    with open(manifest_path, "a", newline="") as manifest_file:
+        manifest = csv.writer(manifest_file)
+        if new_manifest:
+            manifest.writerow(MANIFEST_COLUMNS)
+
+        def record(outcomes: List[Outcome]) -> None:
+            nonlocal reported
+            for name, quote_id, snapshot_id, fingerprint, size, error in outcomes:
+                status = "failed" if error else "ok"
+                manifest.writerow([quote_id, name, snapshot_id, fingerprint, size, status, error])
+                if error:
+                    stats.failed += 1
+                else:
+                    stats.files += 1
+            manifest_file.flush()
+            stats.seconds = time.perf_counter() - start
+            processed = stats.files + stats.failed + stats.skipped
+            if progress is not None and processed // chunk_size > reported:
+                reported = processed // chunk_size
+                progress(stats)
+
+        tasks = _tasks(
+            engine, input_path, chunk_size, files_per_task, year, include_vat, done, stats
+        )
+        if processes == 1:
+            for jobs in tasks:
+                record(_render(str(out), jobs))
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                pending: Set[Future] = set()
+                for jobs in tasks:
+                    pending.add(pool.submit(_render, str(out), jobs))
+                    # Bound the queue so memory does not grow with the book.
+                    if len(pending) >= 4 * processes:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            record(future.result())
+                for future in pending:
+                    record(future.result())
+
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def _tasks(
+    engine: BatchPricer,
+    input_path: str | Path,
+    chunk_size: int,
+    files_per_task: int,
+    year: Optional[int],
+    include_vat: bool,
+    done: Dict[str, str],
+    stats: QuotePackStats,
+) -> Iterator[List[Job]]:
+    seen: Set[str] = set()
+    jobs: List[Job] = []
+    chunks = iter_book_chunks(input_path, chunk_size)
+    for quote_id, result in iter_book_quotes(engine, chunks, year=year, include_vat=include_vat):
+        name = pack_file_name(quote_id)
+        if name in seen:
+            raise ValueError(f"Quote id {quote_id!r} maps to {name}, which is already taken")
+        seen.add(name)
+        fingerprint = pack_fingerprint(result, engine.settings)
+        if done.get(name) == fingerprint:
+            stats.skipped += 1
+            continue
+        jobs.append((name, str(quote_id), fingerprint, result))
+        if len(jobs) >= files_per_task:
+            yield jobs
+            jobs = []
+    if jobs:
+        yield jobs
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+
+from .batch import CONTRACT_TYPES, MAX_BANDS, SEGMENTS, RequestBatch
+from .cost_stack import band_cost_stack, weighted_rate
+from .schemas import ContractType
+
+
+def _by_segment(value: Any, name: str) -> np.ndarray:
+    """A scalar or {segment: value} config entry as an array indexed by segment code."""
+    if isinstance(value, Mapping):
+        missing = [s.value for s in SEGMENTS if s.value not in value]
+        if missing:
+            raise ValueError(f"risk_model.{name} has no value for segments {missing}")
+        return np.array([float(value[s.value]) for s in SEGMENTS])
+    return np.full(len(SEGMENTS), float(value))
+
+
+@dataclass
+class MonteCarloRisk:
+    """Quote-specific risk premium from simulated wholesale price and volume paths.
+
+    For each path and band the spot price is lognormal around the wholesale
+    (forward) price and the customer's volume deviates from its expected
+    level, correlated with price. A fixed-price supplier that hedged the
+    expected volume settles the deviation at spot, so each path costs
+    ``sum_b w_b * loss_factor_b * (volume_b - 1) * (spot_b - forward_b)`` per
+    MWh of expected volume. The premium is the ``percentile`` of that cost
+    (floored at zero) and enters the cost stack as the risk component.
+    Indexed contracts pass wholesale through and carry no premium.
+
+    All quotes share one seeded set of draws, so a quote's premium depends only
+    on its own inputs (not on batch order or chunking) and single and batch
+    pricing agree exactly. Quotes are evaluated in chunks of at most
+    ``max_cells`` (path, quote) cells to bound memory.
+    """
+
+    paths: int = 5_000
+    percentile: float = 95.0
+    price_volatility: np.ndarray = field(default_factory=lambda: _by_segment(0.3, ""))
+    volume_volatility: np.ndarray = field(default_factory=lambda: _by_segment(0.1, ""))
+    price_volume_correlation: float = 0.4
+    band_correlation: float = 0.8
+    seed: int = 0
+    max_cells: int = 4_000_000
+    _draws: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "MonteCarloRisk":
+        """Build from the ``risk_model`` section of the settings."""
+        config = dict(config)
+        method = config.pop("method", "monte_carlo")
+        if method != "monte_carlo":
+            raise ValueError(f"Unknown risk_model method '{method}'")
+        for name in ("price_volatility", "volume_volatility"):
+            if name in config:
+                config[name] = _by_segment(config[name], name)
+        unknown = set(config) - {f for f in cls.__dataclass_fields__ if not f.startswith("_")}
+        if unknown:
+            raise ValueError(f"Unknown risk_model settings: {sorted(unknown)}")
+        model = cls(**config)
+        if not -1.0 <= model.price_volume_correlation <= 1.0:
+            raise ValueError("risk_model.price_volume_correlation must be between -1 and 1")
+        if not 0.0 <= model.band_correlation <= 1.0:
+            raise ValueError("risk_model.band_correlation must be between 0 and 1")
+        if not 0.0 <= model.percentile <= 100.0:
+            raise ValueError("risk_model.percentile must be between 0 and 100")
+        return model
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes regenerate the draws from the seed instead of receiving them.
+        return {**self.__dict__, "_draws": None}
+
+    def draws(self) -> tuple:
+        """(paths, MAX_BANDS) standard normal price and volume shocks."""
+        if self._draws is None:
+            rng = np.random.default_rng(self.seed)
+            common = rng.standard_normal((self.paths, 1))
+            own = rng.standard_normal((self.paths, MAX_BANDS))
+            c = self.band_correlation
+            price = np.sqrt(c) * common + np.sqrt(1 - c) * own
+            rho = self.price_volume_correlation
+            noise = rng.standard_normal((self.paths, MAX_BANDS))
+            volume = rho * price + np.sqrt(1 - rho**2) * noise
+            self._draws = (price, volume)
+        return self._draws
+
+    def premium(self, batch: RequestBatch, inputs: Mapping[str, np.ndarray]) -> np.ndarray:
+        """Risk premium in €/MWh per quote from (MAX_BANDS, N) band inputs."""
+        price_z, volume_z = self.draws()
+        indexed = batch.contract_type == CONTRACT_TYPES.index(ContractType.INDEXED)
+        weights = batch.band_weights.T
+        # € per MWh of expected volume for a 100% spot move in each band.
+        exposure = np.where(indexed, 0.0, weights * inputs["loss_factor"] * inputs["wholesale"])
+        sigma_p = self.price_volatility[batch.segment]
+        sigma_v = self.volume_volatility[batch.segment]
+
+        n = len(batch)
+        out = np.empty(n)
+        chunk = max(1, self.max_cells // self.paths)
+        for q0 in range(0, n, chunk):
+            q = slice(q0, min(q0 + chunk, n))
+            cost = np.zeros((self.paths, q.stop - q.start))
+            for b in range(MAX_BANDS):
+                spot_move = np.expm1(price_z[:, b, None] * sigma_p[q] - 0.5 * sigma_p[q] ** 2)
+                cost += exposure[b, q] * spot_move * (volume_z[:, b, None] * sigma_v[q])
+            out[q] = np.percentile(cost, self.percentile, axis=0)
+        return np.maximum(out, 0.0)
+
+    def risk_pct(self, batch: RequestBatch, inputs: Mapping[str, np.ndarray]) -> np.ndarray:
+        """Premium as a fraction of each quote's weighted pre-margin subtotal.
+
+        ``band_cost_stack`` multiplies every band's subtotal by this, so the
+        weighted risk component equals the premium.
+        """
+        indexed = batch.contract_type == CONTRACT_TYPES.index(ContractType.INDEXED)
+        before_risk = band_cost_stack(
+            np.where(indexed, 0.0, inputs["wholesale"]),
+            inputs["shaping"],
+            inputs["loss_factor"],
+            inputs["network"],
+            inputs["levies"],
+            0.0,
+            0.0,
+        )
+        weighted = weighted_rate(batch.band_weights.T, before_risk.all_in)
+        premium = self.premium(batch, inputs)
+        return np.divide(premium, weighted, out=np.zeros(len(batch)), where=weighted != 0)
+
+
+def risk_model_from_settings(settings: Any) -> Optional[MonteCarloRisk]:
+    config: Optional[Dict[str, Any]] = getattr(settings, "risk_model", None)
+    return MonteCarloRisk.from_config(config) if config else None
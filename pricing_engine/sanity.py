@@ -1,9 +1,16 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence
 
+import numpy as np
+
+from .batch import BANDS, SEGMENTS, SLOT_BAND_CODES, TariffResultBatch
 from .schemas import TariffResult
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 def check_tariff_bounds(
     tariff_result: TariffResult,
@@ -38,3 +45,121 @@ def assert_tariff_bounds(
     if warnings:
         msg = "Tariff out of configured bounds:\n" + "\n".join(warnings)
         raise ValueError(msg)
+
+
+# What a batch does with quotes outside the bounds: raise on the first (as
+# build_tariff does), flag them in a ``breach`` column, or drop them.
+BREACH_POLICIES = ("raise", "flag", "drop")
+VIOLATION_COLUMNS = [
+    "quote",
+    "segment",
+    "band",
+    "limit",
+    "all_in_eur_per_kwh",
+    "bound_eur_per_kwh",
+]
+
+
+@dataclass
+class BoundsViolations:
+    """Bounds breaches of a TariffResultBatch, as (MAX_BANDS, N) masks.
+
+    ``below``/``above`` mark band slots under the segment's minimum or over
+    its maximum all-in rate; ``mask`` is one flag per quote.
+    """
+
+    priced: TariffResultBatch
+    below: np.ndarray
+    above: np.ndarray
+    min_rate: np.ndarray  # €/kWh per quote
+    max_rate: np.ndarray
+
+    @property
+    def mask(self) -> np.ndarray:
+        return (self.below | self.above).any(axis=0)
+
+    def __len__(self) -> int:
+        return int(self.below.sum() + self.above.sum())
+
+    def table(self, quote_ids: Optional[Sequence[Any]] = None) -> pd.DataFrame:
+        """One row per breaching quote and band; ``quote`` is the position or ``quote_ids``."""
+        import pandas as pd
+
+        batch = self.priced.batch
+        ids = np.arange(len(batch)) if quote_ids is None else np.asarray(quote_ids)
+        rate = self.priced.all_in / 1000.0
+        frames = []
+        limits = (("min", self.below, self.min_rate), ("max", self.above, self.max_rate))
+        for limit, mask, bound in limits:
+            quote, slot = np.nonzero(mask.T)
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "quote": ids[quote],
+                        "segment": pd.Categorical.from_codes(
+                            batch.segment[quote], categories=[s.value for s in SEGMENTS]
+                        ),
+                        "band": pd.Categorical.from_codes(
+                            SLOT_BAND_CODES[batch.tariff_structure[quote], slot],
+                            categories=[b.value for b in BANDS],
+                        ),
+                        "limit": limit,
+                        "all_in_eur_per_kwh": rate[slot, quote],
+                        "bound_eur_per_kwh": bound[quote],
+                    }
+                )
+            )
+        table = pd.concat(frames, ignore_index=True)
+        return table.sort_values(["quote", "band"], kind="stable", ignore_index=True)
+
+    def summary(self) -> pd.DataFrame:
+        return summarise_violations([self.table()])
+
+
+def batch_bounds_violations(
+    priced: TariffResultBatch,
+    min_bounds: Dict[str, float],
+    max_bounds: Dict[str, float],
+) -> BoundsViolations:
+    """check_tariff_bounds for a whole batch in a few array operations."""
+    segment = priced.batch.segment
+    min_rate = np.array([float(min_bounds[s.value]) for s in SEGMENTS])[segment]
+    max_rate = np.array([float(max_bounds[s.value]) for s in SEGMENTS])[segment]
+    rate = priced.all_in / 1000.0
+    return BoundsViolations(
+        priced=priced,
+        below=priced.valid & (rate < min_rate),
+        above=priced.valid & (rate > max_rate),
+        min_rate=min_rate,
+        max_rate=max_rate,
+    )
+
+
+def summarise_violations(tables: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Breach counts and rate range by segment, band and limit.
+
+    Takes violation tables or earlier summaries, so a large run can keep
+    one small summary per chunk and combine them at the end.
+    """
+    import pandas as pd
+
+    parts = []
+    for table in tables:
+        if "breaches" not in table.columns:
+            table = table.assign(breaches=1)
+            table["min_all_in_eur_per_kwh"] = table["all_in_eur_per_kwh"]
+            table["max_all_in_eur_per_kwh"] = table["all_in_eur_per_kwh"]
+        parts.append(table)
+    keys = ["segment", "band", "limit"]
+    if not parts:
+        return pd.DataFrame(
+            columns=keys + ["breaches", "min_all_in_eur_per_kwh", "max_all_in_eur_per_kwh"]
+        )
+    combined = pd.concat(parts, ignore_index=True)
+    for key in ("segment", "band"):
+        combined[key] = combined[key].astype(str)
+    return combined.groupby(keys, as_index=False, sort=True).agg(
+        breaches=("breaches", "sum"),
+        min_all_in_eur_per_kwh=("min_all_in_eur_per_kwh", "min"),
+        max_all_in_eur_per_kwh=("max_all_in_eur_per_kwh", "max"),
+    )
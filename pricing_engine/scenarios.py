@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .batch import CONTRACT_TYPES, MAX_BANDS, RequestBatch
+from .cost_stack import CostStack, band_cost_stack, weighted_rate
+from .schemas import ContractType
+
+# Per-band shock fields accept (S,) or (S, MAX_BANDS); margin and risk are (S,).
+BAND_SHOCKS = ("wholesale", "shaping", "loss_factor", "network", "levies")
+GRID_TOTALS = (
+    "weighted_energy_only_eur_per_kwh",
+    "weighted_all_in_eur_per_kwh",
+    "estimated_annual_bill_ex_vat",
+    "estimated_annual_bill_inc_vat",
+)
+
+
+@dataclass
+class ScenarioShocks:
+    """S scenarios of shocks applied on top of the base pricing inputs.
+
+    All shocks are additive (€/MWh, loss-factor points, margin/risk fractions)
+    except ``wholesale_scale``, which multiplies wholesale before the
+    additive wholesale shock. Unset fields are zero (one for the scale).
+    """
+
+    names: List[str]
+    wholesale_scale: np.ndarray
+    wholesale: np.ndarray
+    shaping: np.ndarray
+    loss_factor: np.ndarray
+    network: np.ndarray
+    levies: np.ndarray
+    margin_pct: np.ndarray
+    risk_pct: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_columns(
+        cls, columns: Mapping[str, Any], names: Optional[Sequence[str]] = None
+    ) -> "ScenarioShocks":
+        """Build from shock arrays keyed by field name (a DataFrame or dict)."""
+        shock_fields = [f.name for f in fields(cls) if f.name != "names"]
+        unknown = [c for c in columns if c not in shock_fields and c != "scenario"]
+        if unknown:
+            raise ValueError(f"Unknown shock columns: {unknown}")
+        lengths = {len(np.asarray(columns[c])) for c in columns}
+        if len(lengths) != 1:
+            raise ValueError("Shock columns must all have one entry per scenario")
+        n = lengths.pop()
+        if names is None:
+            names = (
+                [str(v) for v in np.asarray(columns["scenario"])]
+                if "scenario" in columns
+                else [f"S{i}" for i in range(n)]
+            )
+
+        values: Dict[str, np.ndarray] = {}
+        for name in shock_fields:
+            fill = 1.0 if name == "wholesale_scale" else 0.0
+            shock = np.asarray(columns[name], dtype=float) if name in columns else np.full(n, fill)
+            per_band = name in BAND_SHOCKS or name == "wholesale_scale"
+            if shock.ndim == 2 and per_band and shock.shape[1] != MAX_BANDS:
+                raise ValueError(f"Per-band shock '{name}' must have {MAX_BANDS} columns")
+            if shock.ndim not in (1, 2) or (shock.ndim == 2 and not per_band):
+                raise ValueError(f"Shock '{name}' must be one value per scenario")
+            values[name] = shock
+        return cls(names=list(names), **values)
+
+    @classmethod
+    def grid(cls, **axes: Sequence[float]) -> "ScenarioShocks":
+        """Cartesian product of scalar shock levels, e.g. ``grid(wholesale=[-20, 0, 20])``."""
+        keys = list(axes)
+        combos = list(itertools.product(*(axes[k] for k in keys)))
+        columns = {k: np.array([c[i] for c in combos], dtype=float) for i, k in enumerate(keys)}
+        names = [",".join(f"{k}={v:g}" for k, v in zip(keys, c)) for c in combos]
+        return cls.from_columns(columns, names=names)
+
+    def band_shock(self, name: str, scenarios: slice) -> np.ndarray:
+        """Shock for a scenario range shaped to broadcast over (MAX_BANDS, S, N)."""
+        shock = getattr(self, name)[scenarios]
+        if shock.ndim == 2:
+            return shock.T[:, :, None]
+        return shock[None, :, None]
+
+
+@dataclass
+class ScenarioChunk:
+    """Results for ``scenarios`` x ``quotes`` of the grid.
+
+    ``stack`` fields are (MAX_BANDS, S, N) €/MWh; totals are (S, N).
+    """
+
+    scenarios: slice
+    quotes: slice
+    stack: CostStack
+    weighted_energy_only_eur_per_kwh: np.ndarray
+    weighted_all_in_eur_per_kwh: np.ndarray
+    estimated_annual_bill_ex_vat: np.ndarray
+    estimated_annual_bill_inc_vat: np.ndarray
+
+
+class ScenarioEngine:
+    """Evaluate a book of quotes under many input shocks at once.
+
+    Base inputs are looked up once from the engine's pricing tables, then the
+    cost stack is evaluated for the whole (bands x scenarios x quotes) grid with
+    broadcasting. With zero shocks each scenario reproduces ``price_batch``
+    exactly. Sanity bounds are not applied: stressed quotes may leave them.
+    With a Monte Carlo risk model the risk_pct is simulated once from the
+    unshocked inputs; ``risk_pct`` shocks add to it.
+    """
+
+    def __init__(self, engine: Any, max_cells: int = 1_000_000):
+        self.engine = engine
+        self.max_cells = max_cells
+
+    def iter_grid(
+        self, batch: RequestBatch, shocks: ScenarioShocks, quote_chunk: Optional[int] = None
+    ) -> Iterator[ScenarioChunk]:
+        """Yield the grid in chunks of at most ``max_cells`` (scenario, quote) cells."""
+        tables = self.engine.market_tables()
+        self.engine.require_inputs(tables, batch)
+        n = len(batch)
+        quote_chunk = max(1, min(n, quote_chunk or self.max_cells))
+        scenario_chunk = max(1, self.max_cells // quote_chunk)
+
+        for q0 in range(0, n, quote_chunk):
+            quotes = slice(q0, min(q0 + quote_chunk, n))
+            part = batch.slice(quotes)
+            base = tables.gather(part)
+            indexed = part.contract_type == CONTRACT_TYPES.index(ContractType.INDEXED)
+            margin_pct = tables.margin_pct[part.segment]
+            risk_model = self.engine.risk_model()
+            risk_pct = (
+                tables.risk_pct[part.segment]
+                if risk_model is None
+                else risk_model.risk_pct(part, base)
+            )
+            for s0 in range(0, len(shocks), scenario_chunk):
+                scenarios = slice(s0, min(s0 + scenario_chunk, len(shocks)))
+                yield self._evaluate(
+                    part, base, indexed, margin_pct, risk_pct, shocks, scenarios, quotes
+                )
+
+    def _evaluate(
+        self,
+        batch: RequestBatch,
+        base: Mapping[str, np.ndarray],
+        indexed: np.ndarray,
+        margin_pct: np.ndarray,
+        risk_pct: np.ndarray,
+        shocks: ScenarioShocks,
+        scenarios: slice,
+        quotes: slice,
+    ) -> ScenarioChunk:
+        def shocked(name: str) -> np.ndarray:
+            return base[name][:, None, :] + shocks.band_shock(name, scenarios)
+
+        wholesale = base["wholesale"][:, None, :] * shocks.band_shock("wholesale_scale", scenarios)
+        wholesale = wholesale + shocks.band_shock("wholesale", scenarios)
+        stack = band_cost_stack(
+            np.where(indexed, 0.0, wholesale),
+            shocked("shaping"),
+            shocked("loss_factor"),
+            shocked("network"),
+            shocked("levies"),
+            margin_pct + shocks.margin_pct[scenarios, None],
+            risk_pct + shocks.risk_pct[scenarios, None],
+        )
+
+        weights = batch.band_weights.T
+        energy_only = weighted_rate(weights, stack.energy_only) / 1000.0
+        all_in = weighted_rate(weights, stack.all_in) / 1000.0
+        bill_ex_vat = all_in * batch.annual_consumption_kwh + batch.standing_charge_eur_per_year
+        return ScenarioChunk(
+            scenarios=scenarios,
+            quotes=quotes,
+            stack=stack,
+            weighted_energy_only_eur_per_kwh=energy_only,
+            weighted_all_in_eur_per_kwh=all_in,
+            estimated_annual_bill_ex_vat=bill_ex_vat,
+            estimated_annual_bill_inc_vat=bill_ex_vat * (1.0 + batch.vat_rate),
+        )
+
+    def totals(self, batch: RequestBatch, shocks: ScenarioShocks) -> Dict[str, np.ndarray]:
+        """(S, N) totals for the whole grid, assembled in memory."""
+        out = {name: np.empty((len(shocks), len(batch))) for name in GRID_TOTALS}
+        for chunk in self.iter_grid(batch, shocks):
+            for name in GRID_TOTALS:
+                out[name][chunk.scenarios, chunk.quotes] = getattr(chunk, name)
+        return out
+
+    def write_grid(
+        self,
+        batch: RequestBatch | Iterable[RequestBatch],
+        shocks: ScenarioShocks,
+        directory: str | Path,
+        dtype: Any = np.float64,
+        quotes: Optional[int] = None,
+    ) -> Dict[str, Path]:
+        """Stream (S, N) totals into ``<directory>/<total>.npy`` files, one chunk at a time.
+
+        ``batch`` may also be an iterable of consecutive book chunks with
+        ``quotes`` rows between them; each is priced and written at its
+        offset, so the book never has to be in memory at once.
+        """
+        if isinstance(batch, RequestBatch):
+            batches: Iterable[RequestBatch] = [batch]
+            quotes = len(batch)
+        elif quotes is None:
+            raise ValueError("quotes (the total rows) is required when writing book chunks")
+        else:
+            batches = batch
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = {name: directory / f"{name}.npy" for name in GRID_TOTALS}
+        outputs = {
+            name: np.lib.format.open_memmap(
+                path, mode="w+", dtype=dtype, shape=(len(shocks), quotes)
+            )
+            for name, path in paths.items()
+        }
+        offset = 0
+        for part in batches:
+            if offset + len(part) > quotes:
+                raise ValueError(f"Book has more than the {quotes} rows the grid was sized for")
+            for chunk in self.iter_grid(part, shocks):
+                columns = slice(offset + chunk.quotes.start, offset + chunk.quotes.stop)
+                for name in GRID_TOTALS:
+                    outputs[name][chunk.scenarios, columns] = getattr(chunk, name)
+            offset += len(part)
+        if offset != quotes:
+            raise ValueError(f"Book has {offset} rows but the grid was sized for {quotes}")
+        for array in outputs.values():
+            array.flush()
+        (directory / "scenarios.txt").write_text("\n".join(shocks.names) + "\n")
+        return paths
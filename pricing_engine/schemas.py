@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Type, TypeVar
 
 from pydantic import BaseModel, Field, validator
 
@@ -174,3 +174,21 @@ class TariffResult(BaseModel):
     estimated_annual_bill_ex_vat: float
     estimated_annual_bill_inc_vat: float
     indexed_info: Optional[IndexedTariffInfo] = None  # populated for indexed products
+    snapshot_id: Optional[str] = None  # version of the market data the quote was priced on
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def dump_model(model: BaseModel) -> bytes:
+    """JSON bytes for a model under pydantic 1.x or 2.x."""
+    if hasattr(model, "model_dump_json"):
+        return model.model_dump_json().encode()
+    return model.json().encode()  # pydantic 1.x
+
+
+def load_model(cls: Type[ModelT], raw: bytes | str) -> ModelT:
+    """Parse ``dump_model`` output back into ``cls``."""
+    if hasattr(cls, "model_validate_json"):
+        return cls.model_validate_json(raw)
+    return cls.parse_raw(raw)  # pydantic 1.x
@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .batch import RequestBatch
+from .instrumentation import METRICS
+from .schemas import TariffRequest, TariffResult, dump_model, load_model
+
+
+def parse_request(body: bytes) -> TariffRequest:
+    return load_model(TariffRequest, body)
+
+
+class ServiceMetrics:
+    """Latency and throughput over the most recent ``window`` completed requests."""
+
+    def __init__(self, window: int = 100_000):
+        self.window = window
+        self._latency = np.zeros(window)
+        self._done_at = np.zeros(window)
+        self.completed = 0
+        self.failed = 0
+        self.deduplicated = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.started_at = time.perf_counter()
+
+    def record(self, started: float) -> None:
+        now = time.perf_counter()
+        slot = self.completed % self.window
+        self._latency[slot] = now - started
+        self._done_at[slot] = now
+        self.completed += 1
+
+    def snapshot(self, rate_window_s: float = 10.0) -> Dict[str, float]:
+        n = min(self.completed, self.window)
+        latency_ms = self._latency[:n] * 1000.0
+        now = time.perf_counter()
+        recent = int(np.count_nonzero(self._done_at[:n] >= now - rate_window_s))
+        uptime = now - self.started_at
+        return {
+            "requests": self.completed,
+            "failed": self.failed,
+            "deduplicated": self.deduplicated,
+            "batches": self.batches,
+            "mean_batch_size": self.batched_requests / self.batches if self.batches else 0.0,
+            "p50_ms": float(np.percentile(latency_ms, 50)) if n else 0.0,
+            "p99_ms": float(np.percentile(latency_ms, 99)) if n else 0.0,
+            "max_ms": float(latency_ms.max()) if n else 0.0,
+            "throughput_rps": recent / min(rate_window_s, uptime) if uptime else 0.0,
+            "uptime_s": uptime,
+        }
+
+
+@dataclass
+class _Pending:
+    key: bytes
+    request: TariffRequest
+    future: asyncio.Future
+
+
+class QuoteService:
+    """Warm engine behind an asyncio micro-batcher.
+
+    Requests queue up while the event loop is busy. The batcher waits at most
+    ``max_wait_ms`` after the first request (rounded up to the event loop's
+    timer resolution, 1 ms on Linux), then prices up to ``max_batch``
+    requests in one ``price_batch`` call. Identical requests that are in
+    flight at the same time share one pricing and one result. With an engine
+    ``quote_cache``, repeat requests are answered without queueing.
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        max_batch: int = 1_024,
+        max_wait_ms: float = 0.2,
+        reload_check_s: float = 1.0,
+    ):
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_ms / 1000.0
+        # Look for changed input files at most this often rather than on every batch.
+        if engine.store is not None:
+            engine.store.check_interval_s = max(engine.store.check_interval_s, reload_check_s)
+        self.metrics = ServiceMetrics()
+        self._queue: Optional[asyncio.Queue] = None
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+        self._batcher: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self.engine.market_tables()  # compile market data before the first request
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+
+    async def __aenter__(self) -> "QuoteService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def quote(self, request: TariffRequest, key: Optional[bytes] = None) -> TariffResult:
+        started = time.perf_counter()
+        cached = self.engine.cached_quote(request)
+        if cached is not None:
+            self.metrics.record(started)
+            return cached
+        key = key if key is not None else dump_model(request)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.metrics.deduplicated += 1
+        else:
+            assert self._queue is not None, "QuoteService.start() has not been called"
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+            self._queue.put_nowait(_Pending(key, request, future))
+        try:
+            result = await asyncio.shield(future)
+        except Exception:
+            self.metrics.failed += 1
+            raise
+        self.metrics.record(started)
+        return result
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await queue.get()]
+            try:
+                # Let requests that arrive before the deadline join this batch.
+                deadline = loop.time() + self.max_wait_s
+                while len(pending) < self.max_batch:
+                    if not queue.empty():
+                        pending.append(queue.get_nowait())
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        pending.append(await asyncio.wait_for(queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                self._price(pending)
+            except asyncio.CancelledError:
+                self._fail(pending, None)
+                raise
+            except Exception as exc:
+                # Fail this batch but keep the batcher alive for later requests.
+                self._fail(pending, exc)
+
+    def _fail(self, pending: List[_Pending], error: Optional[Exception]) -> None:
+        """Settle the futures of ``pending`` still waiting: with ``error``, else cancelled."""
+        for p in pending:
+            self._inflight.pop(p.key, None)
+            if p.future.done():
+                continue
+            if error is None:
+                p.future.cancel()
+            else:
+                p.future.set_exception(error)
+
+    def _price(self, pending: List[_Pending]) -> None:
+        self.metrics.batches += 1
+        self.metrics.batched_requests += len(pending)
+        try:
+            priced = self.engine.price_batch(
+                RequestBatch.from_requests([p.request for p in pending])
+            )
+            outcomes: List[Tuple[Optional[TariffResult], Optional[Exception]]] = [
+                (priced.result(i), None) for i in range(len(pending))
+            ]
+        except Exception:
+            # One bad request fails the whole batch; price them one by one instead.
+            outcomes = []
+            for p in pending:
+                try:
+                    single = self.engine.price_batch(RequestBatch.from_requests([p.request]))
+                    outcomes.append((single.result(0), None))
+                except Exception as exc:
+                    outcomes.append((None, exc))
+
+        for p, (result, error) in zip(pending, outcomes):
+            self._inflight.pop(p.key, None)
+            if p.future.done():
+                continue
+            if error is not None:
+                p.future.set_exception(error)
+            else:
+                self.engine.remember_quote(p.request, result)
+                p.future.set_result(result)
+
+
+# -- HTTP ---------------------------------------------------------------------
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 422: "Unprocessable Entity"}
+
+
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def _response(
+    status: int, body: bytes, keep_alive: bool, content_type: str = "application/json"
+) -> bytes:
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def _error(message: str) -> bytes:
+    return json.dumps({"error": message}).encode()
+
+
+class QuoteServer:
+    """Minimal HTTP/1.1 front end (keep-alive, JSON) for a QuoteService.
+
+    ``POST /quote`` takes a TariffRequest and returns the TariffResult.
+    ``GET /metrics`` returns ServiceMetrics (plus stage timings when the
+    instrumentation is enabled), ``GET /metrics/openmetrics`` the stage
+    timings as OpenMetrics text and ``GET /health`` the data version.
+    """
+
+    def __init__(self, service: QuoteService):
+        self.service = service
+        self._server: Optional[asyncio.Server] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> Tuple[str, int]:
+        await self.service.start()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.service.stop()
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        await self.start(host, port)
+        assert self._server is not None
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def route(self, method: str, path: str, body: bytes) -> Tuple[int, bytes]:
+        if method == "POST" and path == "/quote":
+            try:
+                request = parse_request(body)
+            except ValueError as exc:
+                return 400, _error(str(exc))
+            try:
+                result = await self.service.quote(request)
+            except (ValueError, KeyError, FileNotFoundError) as exc:
+                return 422, _error(str(exc))
+            return 200, dump_model(result)
+        if method == "GET" and path == "/metrics":
+            metrics: Dict[str, Any] = self.service.metrics.snapshot()
+            cache = self.service.engine.quote_cache
+            if cache is not None:
+                metrics["cache"] = {"entries": len(cache), **asdict(cache.stats)}
+                metrics["cache"]["hit_rate"] = cache.stats.hit_rate
+            if METRICS.enabled:
+                metrics["stages"] = METRICS.snapshot()
+            return 200, json.dumps(metrics).encode()
+        if method == "GET" and path == "/metrics/openmetrics":
+            return 200, METRICS.to_openmetrics().encode()
+        if method == "GET" and path == "/health":
+            version = self.service.engine.market_tables().version
+            return 200, json.dumps({"status": "ok", "snapshot_id": version}).encode()
+        return 404, _error(f"No route for {method} {path}")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, path, _version = line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length") or 0))
+
+                status, payload = await self.route(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                content_type = "application/json"
+                if path == "/metrics/openmetrics" and status == 200:
+                    content_type = OPENMETRICS_TYPE
+                writer.write(_response(status, payload, keep_alive, content_type))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+import numpy as np
+
+SNAPSHOT_FORMAT = 1
+META_MEMBER = "__meta__"
+
+
+def _iter_named_paths(node: Any, prefix: str = "") -> Iterator[Tuple[str, str]]:
+    """(table name, relative path) for each file in ``file_paths``, e.g. ``wholesale/ELEC/ROI``."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield from _iter_named_paths(value, f"{prefix}{key}/")
+    else:
+        yield prefix.rstrip("/"), str(node)
+
+
+def _code_dtype(n_categories: int) -> np.dtype:
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _encode_column(values: Any) -> Dict[str, np.ndarray]:
+    """Numeric columns as-is; anything else as integer codes plus unique categories."""
+    import pandas as pd
+
+    array = np.asarray(values)
+    if array.dtype.kind in "biufM":
+        return {"": array}
+    codes, categories = pd.factorize(values)  # missing values get code -1
+    return {
+        ":codes": codes.astype(_code_dtype(len(categories))),
+        ":categories": np.asarray(categories, dtype=str),
+    }
+
+
+def compile_snapshot(store: Any, output_path: str | Path) -> str:
+    """Write every input in ``store.settings.file_paths`` to one uncompressed ``.npz``.
+
+    Returns the snapshot ID, which is the store's content version. Missing
+    wholesale curves are recorded rather than failing, as the CSV path only
+    fails the quotes that need them.
+    """
+    output_path = Path(output_path)
+    root = Path(store.data_root)
+    snapshot_id = store.version()
+
+    arrays: Dict[str, np.ndarray] = {}
+    meta: Dict[str, Any] = {
+        "format": SNAPSHOT_FORMAT,
+        "snapshot_id": snapshot_id,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "tables": {},
+        "missing": {},
+    }
+    for name, rel in _iter_named_paths(store.settings.file_paths):
+        try:
+            df = store.read(root / rel)
+        except FileNotFoundError:
+            if not name.startswith("wholesale/"):
+                raise
+            meta["missing"][name] = str(root / rel)
+            continue
+        columns = []
+        for column in df.columns:
+            encoded = _encode_column(df[column])
+            for suffix, array in encoded.items():
+                arrays[f"{name}:{column}{suffix}"] = array
+            columns.append([column, "numeric" if "" in encoded else "categorical"])
+        meta["tables"][name] = {"source": rel, "rows": len(df), "columns": columns}
+
+    arrays[META_MEMBER] = np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, output_path)
+    return snapshot_id
+
+
+def _map_npz(path: Path) -> Dict[str, np.ndarray]:
+    """Memory-map every member of an uncompressed ``.npz`` without copying it."""
+    buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays: Dict[str, np.ndarray] = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Snapshot member {info.filename} is compressed: {path}")
+            # Local file header: 30 fixed bytes, then the name and extra field.
+            f.seek(info.header_offset + 26)
+            name_len, extra_len = struct.unpack("<HH", f.read(4))
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            start = f.tell()
+            nbytes = int(np.prod(shape)) * dtype.itemsize
+            array = buffer[start : start + nbytes].view(dtype)
+            arrays[info.filename[: -len(".npy")]] = array.reshape(
+                shape, order="F" if fortran_order else "C"
+            )
+    return arrays
+
+
+class MarketSnapshot:
+    """Read-only market data snapshot written by ``compile_snapshot``.
+
+    Columns are memory-mapped from the file; categorical columns are decoded
+    from their integer codes when a table is requested.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Required input file not found: {self.path}")
+        self._arrays = _map_npz(self.path)
+        if META_MEMBER not in self._arrays:
+            raise ValueError(f"Not a market data snapshot: {self.path}")
+        self.meta: Dict[str, Any] = json.loads(self._arrays[META_MEMBER].tobytes())
+        if self.meta.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(
+                f"Unsupported snapshot format {self.meta.get('format')!r}: {self.path}"
+            )
+        self.snapshot_id: str = self.meta["snapshot_id"]
+
+    def version(self) -> str:
+        return self.snapshot_id
+
+    def table_names(self) -> list[str]:
+        return list(self.meta["tables"])
+
+    def missing(self, name: str) -> str | None:
+        """Path of an input that was missing at compile time, else None."""
+        return self.meta["missing"].get(name)
+
+    def table(self, name: str) -> Dict[str, np.ndarray]:
+        if name not in self.meta["tables"]:
+            missing = self.missing(name)
+            if missing is not None:
+                raise FileNotFoundError(f"Required input file not found: {missing}")
+            raise KeyError(name)
+        table: Dict[str, np.ndarray] = {}
+        for column, kind in self.meta["tables"][name]["columns"]:
+            key = f"{name}:{column}"
+            if kind == "numeric":
+                table[column] = self._arrays[key]
+                continue
+            codes = self._arrays[key + ":codes"]
+            categories = self._arrays[key + ":categories"]
+            if (codes < 0).any():
+                categories = np.append(categories.astype(object), None)
+            table[column] = categories[codes]
+        return table
@@ -1,22 +1,32 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import date
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
-from .charges import PassThroughLibrary
+from .batch import (
+    MAX_BANDS,
+    PricingTables,
+    RequestBatch,
+    TariffResultBatch,
+    price_with_tables,
+)
 from .config import Settings, load_settings
-from .market_data import (
-    get_archetype,
-    load_losses,
-    load_pass_through,
-    load_shaping_adders,
-    load_wholesale_curve,
+from .cost_stack import band_cost_stack, weighted_rate
+from .instrumentation import METRICS
+from .market_data import MarketDataStore
+from .market_index import MarketIndex
+from .quote_cache import PersistentQuoteCache, QuoteCache, content_key, request_key
+from .risk import MonteCarloRisk, risk_model_from_settings
+from .sanity import (
+    BREACH_POLICIES,
+    BoundsViolations,
+    assert_tariff_bounds,
+    batch_bounds_violations,
 )
-from .sanity import assert_tariff_bounds
+from .snapshot import MarketSnapshot
 from .schemas import (
     Commodity,
     ContractType,
@@ -32,15 +42,54 @@ from .schemas import (
 )
 
 
+def _slot_inputs(band_inputs: Sequence[Tuple[float, ...]]) -> Dict[str, np.ndarray]:
+    """One quote's band inputs as (MAX_BANDS, 1) arrays, padded like PricingTables."""
+    names = ("wholesale", "shaping", "loss_factor", "network", "levies")
+    inputs = {name: np.zeros((MAX_BANDS, 1)) for name in names}
+    inputs["loss_factor"][:] = 1.0
+    for slot, values in enumerate(band_inputs):
+        for name, value in zip(names, values):
+            inputs[name][slot, 0] = value
+    return inputs
+
+
 @dataclass
 class TariffEngine:
     settings: Settings
     data_root: Path
+    store: Optional[MarketDataStore] = field(default=None, repr=False)
+    snapshot: Optional[MarketSnapshot] = field(default=None, repr=False)
+    quote_cache: Optional[QuoteCache] = field(default=None, repr=False, compare=False)
+    result_cache: Optional[PersistentQuoteCache] = field(default=None, repr=False, compare=False)
+    _index: Optional[MarketIndex] = field(default=None, init=False, repr=False, compare=False)
+    _tables: Optional[PricingTables] = field(default=None, init=False, repr=False, compare=False)
+    _risk: Optional[Tuple[str, Optional[MonteCarloRisk]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self.data_root = Path(self.data_root)
+        if self.store is None:
+            self.store = MarketDataStore(self.settings, self.data_root)
 
     @classmethod
     def from_config(cls, config_path: str | Path = "config/base.yaml", data_root: str | Path = "."):
         return cls(settings=load_settings(config_path), data_root=Path(data_root))
 
+    @classmethod
+    def from_snapshot(
+        cls,
+        snapshot_path: str | Path,
+        config_path: str | Path = "config/base.yaml",
+        data_root: str | Path = ".",
+    ):
+        """Price from a compiled snapshot instead of the CSVs in ``file_paths``."""
+        return cls(
+            settings=load_settings(config_path),
+            data_root=Path(data_root),
+            snapshot=MarketSnapshot(snapshot_path),
+        )
+
     def build_tariff_from_archetype(
         self,
         market: Market,
@@ -51,9 +100,16 @@ class TariffEngine:
         contract_type: ContractType,
         include_vat: bool = True,
     ) -> TariffResult:
-        archetype = get_archetype(
-            self.settings, self.data_root, market, commodity, segment, tariff_structure
-        )
+        key = None
+        if self.result_cache is not None:
+            # Looked up before compiling the index so repeat runs skip it entirely.
+            parts = ("archetype", market, commodity, segment, tariff_structure, year, contract_type)
+            key, version = self.result_key(parts + (include_vat,))
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached
+
+        archetype = self.market_index().archetype(market, commodity, segment, tariff_structure)
         vat_rate = self.settings.vat[market.value] if include_vat else 0.0
 
         request = TariffRequest(
@@ -68,97 +124,140 @@ class TariffEngine:
             band_split=archetype.band_split,
             vat_rate=vat_rate,
         )
-        return self.build_tariff(request)
+        if key is None:
+            return self.build_tariff(request)
+        # One result_cache entry per quote: the archetype key, not the request key too.
+        result = self.cached_quote(request)
+        if result is None:
+            result = self._build_tariff(request, self.market_index())
+            self.remember_quote(request, result)
+        if result.snapshot_id == version:
+            self.result_cache.put(key, result)
+        return result
+
+    def market_index(self) -> MarketIndex:
+        """Compiled lookup tables, rebuilt whenever the store sees changed inputs.
+
+        With a snapshot the tables are compiled once; the snapshot never changes.
+        """
+        if self.snapshot is not None:
+            if self._index is None:
+                self._index = MarketIndex.from_snapshot(self.snapshot)
+            return self._index
+        assert self.store is not None
+        version = self.store.version()
+        if self._index is None or self._index.version != version:
+            with METRICS.stage("compile_index"):
+                self._index = MarketIndex.from_store(self.store)
+        return self._index
+
+    def cache_version(self, index: MarketIndex) -> Tuple[str, str]:
+        """What cached quotes depend on besides the request: market data and settings."""
+        s = self.settings
+        return index.version, repr((s.vat, s.margin_pct, s.risk_pct, s.risk_model, s.sanity))
+
+    def data_version(self) -> str:
+        """Content hash of the market data, without compiling it."""
+        source = self.snapshot if self.snapshot is not None else self.store
+        assert source is not None
+        return source.version()
+
+    def result_key(self, parts: Tuple) -> Tuple[str, str]:
+        """``result_cache`` key for ``parts`` and the data version it was taken at."""
+        version = self.data_version()
+        return content_key(parts, version, self.settings), version
+
+    def cached_quote(self, request: TariffRequest) -> Optional[TariffResult]:
+        """The cached result for ``request`` if caching is on and the inputs are unchanged."""
+        if self.quote_cache is None:
+            return None
+        self.quote_cache.validate(self.cache_version(self.market_index()))
+        return self.quote_cache.get(request_key(request))
+
+    def remember_quote(self, request: TariffRequest, result: TariffResult) -> None:
+        """Cache ``result`` unless it was priced on market data that has since changed."""
+        if self.quote_cache is None:
+            return
+        version = self.cache_version(self.market_index())
+        self.quote_cache.validate(version)
+        if result.snapshot_id == version[0]:
+            self.quote_cache.put(request_key(request), result)
 
     def build_tariff(self, request: TariffRequest) -> TariffResult:
-        market = request.market
-        commodity = request.commodity
+        if self.quote_cache is None and self.result_cache is None:
+            return self._build_tariff(request, self.market_index())
+        cached = self.cached_quote(request)
+        if cached is not None:
+            return cached
+
+        key = None
+        if self.result_cache is not None:
+            key, version = self.result_key(("request",) + request_key(request))
+            cached = self.result_cache.get(key)
+        if cached is None:
+            cached = self._build_tariff(request, self.market_index())
+            if key is not None and cached.snapshot_id == version:
+                self.result_cache.put(key, cached)
+        self.remember_quote(request, cached)
+        return cached
+
+    def _build_tariff(self, request: TariffRequest, index: MarketIndex) -> TariffResult:
+        laps = METRICS.laps()
         segment = request.segment
-        year = request.year
-        tariff_structure = request.tariff_structure
-
-        bands: List[TimeBand] = TIME_BANDS_BY_TARIFF[tariff_structure]
+        bands: List[TimeBand] = TIME_BANDS_BY_TARIFF[request.tariff_structure]
 
-        # Load inputs
-        wholesale_df = load_wholesale_curve(self.settings, self.data_root, market, commodity, year)
-        shaping_df = load_shaping_adders(self.settings, self.data_root, market, commodity, year)
-        losses_df = load_losses(self.settings, self.data_root, market, commodity, segment, year)
-        pass_df = load_pass_through(self.settings, self.data_root, market, commodity, segment, year)
-        pass_lib = PassThroughLibrary(pass_df)
+        band_inputs = index.band_inputs(
+            request.market, request.commodity, segment, request.year, bands
+        )
+        if laps:
+            laps("market_inputs")
 
         margin_pct = float(self.settings.margin_pct[segment.value])
-        risk_pct = float(self.settings.risk_pct[segment.value])
+        risk_model = self.risk_model()
+        if risk_model is None:
+            risk_pct = float(self.settings.risk_pct[segment.value])
+        else:
+            single = RequestBatch.from_requests([request])
+            risk_pct = float(risk_model.risk_pct(single, _slot_inputs(band_inputs))[0])
+            if laps:
+                laps("risk")
 
         components: List[TariffComponent] = []
-        energy_only_band_rates: dict[TimeBand, float] = {}
-        all_in_band_rates: dict[TimeBand, float] = {}
-
-        for band in bands:
-            wh_row = wholesale_df[wholesale_df["band"] == band.value]
-            if wh_row.empty:
-                raise ValueError(f"No wholesale price for band {band.value}")
-            wholesale_price = float(wh_row.iloc[0]["price_eur_per_mwh"])
-
-            sh_row = shaping_df[shaping_df["band"] == band.value]
-            shaping_adder = float(sh_row.iloc[0]["adder_eur_per_mwh"]) if not sh_row.empty else 0.0
-
-            loss_row = losses_df[losses_df["band"] == band.value]
-            if loss_row.empty:
-                raise ValueError(f"No loss factor for band {band.value}")
-            loss_factor = float(loss_row.iloc[0]["loss_factor"])
-
-            pt_sel = pass_lib.select_for_band(
-                region=market,
-                commodity=commodity,
-                segment=segment,
-                year=year,
-                band=band,
-                as_of=date(year, 6, 30),
-            )
-
+        for band, (wholesale_price, shaping_adder, loss_factor, network, levies) in zip(
+            bands, band_inputs
+        ):
             # For INDEXED product, treat wholesale as 0 for the numeric stack and report it as an index.
             if request.contract_type == ContractType.INDEXED:
                 wholesale_used = 0.0
             else:
                 wholesale_used = wholesale_price
 
-            energy_ex_losses = wholesale_used + shaping_adder
-            losses_component = energy_ex_losses * (loss_factor - 1.0)
-
-            subtotal_before_margin_risk = (
-                wholesale_used
-                + shaping_adder
-                + losses_component
-                + pt_sel.network_eur_per_mwh
-                + pt_sel.levies_eur_per_mwh
+            stack = band_cost_stack(
+                wholesale_used, shaping_adder, loss_factor, network, levies, margin_pct, risk_pct
             )
-
-            margin_component = subtotal_before_margin_risk * margin_pct
-            risk_component = subtotal_before_margin_risk * risk_pct
-
-            comp = TariffComponent(
-                band=band,
-                wholesale_eur_per_mwh=wholesale_used,
-                shaping_eur_per_mwh=shaping_adder,
-                losses_eur_per_mwh=losses_component,
-                network_eur_per_mwh=pt_sel.network_eur_per_mwh,
-                levies_eur_per_mwh=pt_sel.levies_eur_per_mwh,
-                margin_eur_per_mwh=margin_component,
-                risk_eur_per_mwh=risk_component,
+            components.append(
+                TariffComponent(
+                    band=band,
+                    wholesale_eur_per_mwh=stack.wholesale,
+                    shaping_eur_per_mwh=stack.shaping,
+                    losses_eur_per_mwh=stack.losses,
+                    network_eur_per_mwh=stack.network,
+                    levies_eur_per_mwh=stack.levies,
+                    margin_eur_per_mwh=stack.margin,
+                    risk_eur_per_mwh=stack.risk,
+                )
             )
-            components.append(comp)
-            energy_only_band_rates[band] = comp.energy_only_eur_per_mwh
-            all_in_band_rates[band] = comp.all_in_eur_per_mwh
 
         # Weighted averages using band split
-        band_split = request.band_split
-        weights = np.array([band_split[b] for b in bands], dtype=float)
-
-        energy_only_array = np.array([energy_only_band_rates[b] for b in bands], dtype=float)
-        all_in_array = np.array([all_in_band_rates[b] for b in bands], dtype=float)
-
-        weighted_energy_only_eur_per_mwh = float(np.dot(weights, energy_only_array))
-        weighted_all_in_eur_per_mwh = float(np.dot(weights, all_in_array))
+        weights = [request.band_split[b] for b in bands]
+        weighted_energy_only_eur_per_mwh = weighted_rate(
+            weights, [c.energy_only_eur_per_mwh for c in components]
+        )
+        weighted_all_in_eur_per_mwh = weighted_rate(
+            weights, [c.all_in_eur_per_mwh for c in components]
+        )
+        if laps:
+            laps("cost_stack")
 
         weighted_energy_only_eur_per_kwh = weighted_energy_only_eur_per_mwh / 1000.0
         weighted_all_in_eur_per_kwh = weighted_all_in_eur_per_mwh / 1000.0
@@ -175,19 +274,12 @@ class TariffEngine:
 
         indexed_info: IndexedTariffInfo | None = None
         if request.contract_type == ContractType.INDEXED:
-            # For indexed, compute adders vs wholesale curve (which we know from file)
-            band_adders_energy_only: dict[TimeBand, float] = {}
-            band_adders_all_in: dict[TimeBand, float] = {}
-            for band in bands:
-                wh_row = wholesale_df[wholesale_df["band"] == band.value]
-                wholesale_price = float(wh_row.iloc[0]["price_eur_per_mwh"])
-                energy_add = energy_only_band_rates[band]
-                all_in_add = all_in_band_rates[band]
-                band_adders_energy_only[band] = energy_add
-                band_adders_all_in[band] = all_in_add
+            # For indexed, the stack already excludes wholesale so the rates are the adders vs index
             indexed_info = IndexedTariffInfo(
-                band_adders_energy_only_eur_per_mwh=band_adders_energy_only,
-                band_adders_all_in_eur_per_mwh=band_adders_all_in,
+                band_adders_energy_only_eur_per_mwh={
+                    c.band: c.energy_only_eur_per_mwh for c in components
+                },
+                band_adders_all_in_eur_per_mwh={c.band: c.all_in_eur_per_mwh for c in components},
             )
 
         result = TariffResult(
@@ -198,8 +290,12 @@ class TariffEngine:
             estimated_annual_bill_ex_vat=annual_bill_ex_vat,
             estimated_annual_bill_inc_vat=annual_bill_inc_vat,
             indexed_info=indexed_info,
+            snapshot_id=index.version,
         )
 
+        if laps:
+            laps("assemble_result")
+
         # Run sanity checks (raises if outside range)
         sanity_cfg = self.settings.sanity
         assert_tariff_bounds(
@@ -207,5 +303,92 @@ class TariffEngine:
             min_bounds=sanity_cfg["min_unit_rate_eur_per_kwh"],
             max_bounds=sanity_cfg["max_unit_rate_eur_per_kwh"],
         )
+        if laps:
+            laps("sanity")
+            laps.total("build_tariff")
 
         return result
+
+    def build_tariffs(self, requests: Sequence[TariffRequest]) -> List[TariffResult]:
+        """Price many requests in one vectorised pass; matches build_tariff exactly."""
+        return self.price_batch(RequestBatch.from_requests(requests)).results()
+
+    def risk_model(self) -> Optional[MonteCarloRisk]:
+        """The configured Monte Carlo risk model, or None to use the flat risk_pct."""
+        key = repr(self.settings.risk_model)
+        if self._risk is None or self._risk[0] != key:
+            self._risk = (key, risk_model_from_settings(self.settings))
+        return self._risk[1]
+
+    def market_tables(self) -> PricingTables:
+        """Dense array form of the market index, shared by batch and parallel pricing."""
+        index = self.market_index()
+        if self._tables is None or self._tables.version != index.version:
+            self._tables = PricingTables.build(index, self.settings, index.years())
+        return self._tables
+
+    def price_batch(self, batch: RequestBatch, on_breach: str = "raise") -> TariffResultBatch:
+        """Price a batch; ``on_breach`` chooses what check_bounds does with outliers."""
+        tables = self.market_tables()
+        with METRICS.stage("price_batch", items=len(batch)):
+            self.require_inputs(tables, batch)
+            with METRICS.stage("cost_stack", items=len(batch)):
+                priced = price_with_tables(tables, batch, self.risk_model())
+            with METRICS.stage("sanity", items=len(batch)):
+                priced = self.check_bounds(priced, on_breach)
+        return priced
+
+    def require_inputs(self, tables: PricingTables, batch: RequestBatch) -> None:
+        """Raise the single-quote error for the first request with missing inputs."""
+        if not len(batch):
+            return
+        _, ok = tables.locate(batch)
+        if ok.all():
+            return
+        i = int(np.flatnonzero(~ok)[0])
+        request = batch.request(i)
+        self.market_index().band_inputs(
+            request.market,
+            request.commodity,
+            request.segment,
+            request.year,
+            TIME_BANDS_BY_TARIFF[request.tariff_structure],
+        )
+        raise ValueError(f"No market data for request {i} ({request.year})")
+
+    def bounds_violations(self, priced: TariffResultBatch) -> BoundsViolations:
+        """Every quote and band outside the configured sanity bounds."""
+        sanity_cfg = self.settings.sanity
+        return batch_bounds_violations(
+            priced,
+            min_bounds=sanity_cfg["min_unit_rate_eur_per_kwh"],
+            max_bounds=sanity_cfg["max_unit_rate_eur_per_kwh"],
+        )
+
+    def check_bounds(
+        self, priced: TariffResultBatch, on_breach: str = "raise"
+    ) -> TariffResultBatch:
+        """Apply the sanity bounds to a priced batch under a BREACH_POLICIES policy.
+
+        "raise" fails like build_tariff on the first quote outside them;
+        "flag" keeps every quote and sets ``priced.breach``; "drop" returns
+        only the quotes inside them.
+        """
+        if on_breach not in BREACH_POLICIES:
+            raise ValueError(
+                f"Unknown breach policy '{on_breach}' (expected one of {BREACH_POLICIES})"
+            )
+        breach = self.bounds_violations(priced).mask
+        if on_breach == "raise":
+            if breach.any():
+                sanity_cfg = self.settings.sanity
+                assert_tariff_bounds(
+                    priced.result(int(np.flatnonzero(breach)[0])),
+                    min_bounds=sanity_cfg["min_unit_rate_eur_per_kwh"],
+                    max_bounds=sanity_cfg["max_unit_rate_eur_per_kwh"],
+                )
+            return priced
+        priced = replace(priced, breach=breach)
+        if on_breach == "drop" and breach.any():
+            return priced.take(np.flatnonzero(~breach))
+        return priced
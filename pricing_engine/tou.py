@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from .schemas import Market, TariffStructure, TIME_BANDS_BY_TARIFF, TimeBand
+
+INTERVAL = np.timedelta64(30, "m")
+ONE_HOUR = np.timedelta64(60, "m")
+
+
+def interval_starts(year: int) -> np.ndarray:
+    """Start of every half-hour settlement interval in ``year`` (UTC, datetime64[m])."""
+    return np.arange(
+        np.datetime64(f"{year}-01-01T00:00", "m"),
+        np.datetime64(f"{year + 1}-01-01T00:00", "m"),
+        INTERVAL,
+    )
+
+
+def intervals_in_year(year: int) -> int:
+    return len(interval_starts(year))
+
+
+# -- calendar helpers -------------------------------------------------------
+
+
+def easter_sunday(year: int) -> date:
+    """Gregorian Easter (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _first_monday(year: int, month: int) -> date:
+    first = date(year, month, 1)
+    return first + timedelta(days=(7 - first.weekday()) % 7)
+
+
+def _last_weekday(year: int, month: int, weekday: int) -> date:
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _with_substitutes(fixed: List[date], others: List[date]) -> Set[date]:
+    """UK rule: a fixed-date holiday on a weekend moves to the next free weekday."""
+    holidays = set(others)
+    for day in fixed:
+        if day.weekday() < 5:
+            holidays.add(day)
+            continue
+        holidays.add(day)
+        sub = day
+        while sub.weekday() >= 5 or sub in holidays:
+            sub += timedelta(days=1)
+        holidays.add(sub)
+    return holidays
+
+
+def public_holidays(market: Market, year: int) -> Set[date]:
+    easter = easter_sunday(year)
+    if market == Market.ROI:
+        days = {
+            date(year, 1, 1),
+            date(year, 3, 17),
+            easter + timedelta(days=1),
+            _first_monday(year, 5),
+            _first_monday(year, 6),
+            _first_monday(year, 8),
+            _last_weekday(year, 10, 0),
+            date(year, 12, 25),
+            date(year, 12, 26),
+        }
+        if year >= 2023:
+            # St Brigid's Day: first Monday of February, or 1 February if a Friday.
+            feb1 = date(year, 2, 1)
+            days.add(feb1 if feb1.weekday() == 4 else _first_monday(year, 2))
+        return days
+    return _with_substitutes(
+        fixed=[
+            date(year, 1, 1),
+            date(year, 3, 17),
+            date(year, 7, 12),
+            date(year, 12, 25),
+            date(year, 12, 26),
+        ],
+        others=[
+            easter - timedelta(days=2),
+            easter + timedelta(days=1),
+            _first_monday(year, 5),
+            _last_weekday(year, 5, 0),
+            _last_weekday(year, 8, 0),
+        ],
+    )
+
+
+def summer_time(utc: np.ndarray) -> np.ndarray:
+    """True where Irish/UK summer time (UTC+1) applies.
+
+    Both jurisdictions follow the EU rule: from 01:00 UTC on the last Sunday
+    of March to 01:00 UTC on the last Sunday of October.
+    """
+    utc = np.asarray(utc).astype("datetime64[m]")
+    years = utc.astype("datetime64[Y]").astype(np.int64) + 1970
+    out = np.zeros(utc.shape, dtype=bool)
+    for year in np.unique(years):
+        start = np.datetime64(_last_weekday(int(year), 3, 6), "m") + ONE_HOUR
+        end = np.datetime64(_last_weekday(int(year), 10, 6), "m") + ONE_HOUR
+        rows = years == year
+        out[rows] = (utc[rows] >= start) & (utc[rows] < end)
+    return out
+
+
+def local_to_utc(local: np.ndarray) -> np.ndarray:
+    """Naive Irish/UK local times to UTC.
+
+    In the repeated hour at the end of summer time the first (summer) occurrence is
+    assumed. Local times skipped at the start of summer time are treated as winter.
+    """
+    local = np.asarray(local).astype("datetime64[m]")
+    # Local summer time runs from 02:00 on the start day to 02:00 (first pass) on the
+    # end day, i.e. one hour after the UTC transition instants.
+    return local - ONE_HOUR * summer_time(local - ONE_HOUR)
+
+
+# -- time-of-use rules ------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class TouRule:
+    """``band`` applies from ``start_hour`` to ``end_hour`` (may wrap midnight), else ``otherwise``.
+
+    ``standard_time`` rules run on a clock that ignores summer time, like
+    day/night meters. ``weekdays_only`` windows do not apply on weekends or
+    public holidays.
+    """
+
+    band: TimeBand
+    start_hour: int
+    end_hour: int
+    otherwise: TimeBand
+    weekdays_only: bool = False
+    standard_time: bool = False
+
+
+# Stylised time-of-use windows per market.
+TOU_RULES: Dict[Market, Dict[TariffStructure, TouRule]] = {
+    Market.ROI: {
+        TariffStructure.DAY_NIGHT: TouRule(TimeBand.NIGHT, 23, 8, TimeBand.DAY, standard_time=True),
+        TariffStructure.PEAK_OFFPEAK: TouRule(
+            TimeBand.PEAK, 8, 20, TimeBand.OFFPEAK, weekdays_only=True
+        ),
+    },
+    Market.NI: {
+        TariffStructure.DAY_NIGHT: TouRule(TimeBand.NIGHT, 0, 7, TimeBand.DAY, standard_time=True),
+        TariffStructure.PEAK_OFFPEAK: TouRule(
+            TimeBand.PEAK, 8, 20, TimeBand.OFFPEAK, weekdays_only=True
+        ),
+    },
+}
+
+
+class TouCalendar:
+    """Precomputed mapping from UTC timestamps to the band slots of a market's tariffs.
+
+    The slot of every half-hour interval of a year is evaluated once, with
+    summer time and public holidays applied. Any timestamp is then mapped
+    by indexing into that table.
+    """
+
+    def __init__(self, market: Market):
+        self.market = market
+        self._year_slots: Dict[tuple[TariffStructure, int], np.ndarray] = {}
+
+    def rule(self, tariff_structure: TariffStructure) -> Optional[TouRule]:
+        return TOU_RULES[self.market].get(tariff_structure)
+
+    def _evaluate(self, tariff_structure: TariffStructure, utc: np.ndarray) -> np.ndarray:
+        rule = self.rule(tariff_structure)
+        if rule is None:
+            return np.zeros(utc.shape, dtype=np.int8)
+
+        clock = utc if rule.standard_time else utc + ONE_HOUR * summer_time(utc)
+        days = clock.astype("datetime64[D]")
+        minute = (clock - days).astype(np.int64)
+        start, end = rule.start_hour * 60, rule.end_hour * 60
+        if start < end:
+            inside = (minute >= start) & (minute < end)
+        else:
+            inside = (minute >= start) | (minute < end)
+        if rule.weekdays_only:
+            weekday = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+            years = np.unique(days.astype("datetime64[Y]").astype(np.int64) + 1970)
+            holidays = np.array(
+                sorted(h for y in years for h in public_holidays(self.market, int(y))),
+                dtype="datetime64[D]",
+            )
+            inside &= (weekday < 5) & ~np.isin(days, holidays)
+
+        bands = TIME_BANDS_BY_TARIFF[tariff_structure]
+        return np.where(inside, bands.index(rule.band), bands.index(rule.otherwise)).astype(
+            np.int8
+        )
+
+    def year_slots(self, tariff_structure: TariffStructure, year: int) -> np.ndarray:
+        """Band slot of every half-hour interval in ``year``; cached."""
+        key = (tariff_structure, year)
+        if key not in self._year_slots:
+            self._year_slots[key] = self._evaluate(tariff_structure, interval_starts(year))
+        return self._year_slots[key]
+
+    def slots(self, tariff_structure: TariffStructure, timestamps: np.ndarray) -> np.ndarray:
+        """Band slot (position in TIME_BANDS_BY_TARIFF) of the interval holding each UTC timestamp."""
+        timestamps = np.asarray(timestamps).astype("datetime64[m]")
+        years = timestamps.astype("datetime64[Y]")
+        out = np.empty(timestamps.shape, dtype=np.int8)
+        for year in np.unique(years):
+            rows = years == year
+            table = self.year_slots(tariff_structure, int(year.astype(np.int64)) + 1970)
+            offsets = (timestamps[rows] - year.astype("datetime64[m]")) // INTERVAL
+            out[rows] = table[offsets]
+        return out
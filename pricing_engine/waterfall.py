@@ -1,46 +1,56 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
 from .schemas import TariffComponent, TariffResult
 
+# Cost stack components in waterfall order; each is a ``<name>_eur_per_mwh`` column.
+COST_COMPONENTS = ("wholesale", "shaping", "losses", "network", "levies", "margin", "risk")
+COMPONENT_COLUMNS = (
+    "band",
+    *(f"{name}_eur_per_mwh" for name in COST_COMPONENTS),
+    "energy_only_eur_per_mwh",
+    "all_in_eur_per_mwh",
+    "energy_only_eur_per_kwh",
+    "all_in_eur_per_kwh",
+)
+
+
+def component_record(c: TariffComponent) -> Dict[str, Any]:
+    """One Tariff_Build row: the band's cost stack and totals, in COMPONENT_COLUMNS order."""
+    return {
+        "band": c.band.value,
+        "wholesale_eur_per_mwh": c.wholesale_eur_per_mwh,
+        "shaping_eur_per_mwh": c.shaping_eur_per_mwh,
+        "losses_eur_per_mwh": c.losses_eur_per_mwh,
+        "network_eur_per_mwh": c.network_eur_per_mwh,
+        "levies_eur_per_mwh": c.levies_eur_per_mwh,
+        "margin_eur_per_mwh": c.margin_eur_per_mwh,
+        "risk_eur_per_mwh": c.risk_eur_per_mwh,
+        "energy_only_eur_per_mwh": c.energy_only_eur_per_mwh,
+        "all_in_eur_per_mwh": c.all_in_eur_per_mwh,
+        "energy_only_eur_per_kwh": c.energy_only_eur_per_kwh,
+        "all_in_eur_per_kwh": c.all_in_eur_per_kwh,
+    }
+
 
 def tariff_components_to_dataframe(components: List[TariffComponent]) -> pd.DataFrame:
-    rows = []
-    for c in components:
-        rows.append(
-            {
-                "band": c.band.value,
-                "wholesale_eur_per_mwh": c.wholesale_eur_per_mwh,
-                "shaping_eur_per_mwh": c.shaping_eur_per_mwh,
-                "losses_eur_per_mwh": c.losses_eur_per_mwh,
-                "network_eur_per_mwh": c.network_eur_per_mwh,
-                "levies_eur_per_mwh": c.levies_eur_per_mwh,
-                "margin_eur_per_mwh": c.margin_eur_per_mwh,
-                "risk_eur_per_mwh": c.risk_eur_per_mwh,
-                "energy_only_eur_per_mwh": c.energy_only_eur_per_mwh,
-                "all_in_eur_per_mwh": c.all_in_eur_per_mwh,
-                "energy_only_eur_per_kwh": c.energy_only_eur_per_kwh,
-                "all_in_eur_per_kwh": c.all_in_eur_per_kwh,
-            }
-        )
-    return pd.DataFrame(rows)
-
-
-def waterfall_long_format(tariff_result: TariffResult) -> pd.DataFrame:
-    """Return long format suitable for cost stack charts."""
-    df = tariff_components_to_dataframe(tariff_result.components)
-    comp_cols = [
-        "wholesale_eur_per_mwh",
-        "shaping_eur_per_mwh",
-        "losses_eur_per_mwh",
-        "network_eur_per_mwh",
-        "levies_eur_per_mwh",
-        "margin_eur_per_mwh",
-        "risk_eur_per_mwh",
-    ]
+    return pd.DataFrame([component_record(c) for c in components])
+
+
+def waterfall_long_format(
+    tariff_result: TariffResult, components_df: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """Return long format suitable for cost stack charts.
+
+    Pass ``components_df`` to reuse an existing tariff_components_to_dataframe result.
+    """
+    df = components_df
+    if df is None:
+        df = tariff_components_to_dataframe(tariff_result.components)
+    comp_cols = [f"{name}_eur_per_mwh" for name in COST_COMPONENTS]
     long_df = df.melt(
         id_vars=["band"],
         value_vars=comp_cols,
@@ -1,15 +1,72 @@
+import hashlib
+import threading
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
 import streamlit as st
 
+from pricing_engine.archetype_grid import ArchetypeGrid, sample_portfolio
+from pricing_engine.batch import RequestBatch
+from pricing_engine.sanity import check_tariff_bounds
 from pricing_engine.tariff_engine import TariffEngine
 from pricing_engine.schemas import Commodity, ContractType, Market, Segment, TariffStructure
 from pricing_engine.waterfall import tariff_components_to_dataframe
 
+CONFIG_PATH = "config/base.yaml"
+DATA_ROOT = "."
+
+
+def config_hash() -> str:
+    """Content hash of the config file; the caches below are keyed by it."""
+    return hashlib.sha256(Path(CONFIG_PATH).read_bytes()).hexdigest()
+
+
+@st.cache_resource(max_entries=1)
+def load_engine(config: str) -> Tuple[TariffEngine, threading.Lock]:
+    """One engine per server process and config hash, shared by every session and rerun.
+
+    Its MarketDataStore re-reads a CSV only when the file changes; an edited
+    config file builds a new engine. The lock serialises pricing calls from
+    concurrent sessions.
+    """
+    return TariffEngine.from_config(CONFIG_PATH, DATA_ROOT), threading.Lock()
 
-def main() -> None:
-    st.title("ROI + NI All-In Tariff Builder")
 
-    engine = TariffEngine.from_config("config/base.yaml", ".")
+@st.cache_resource(max_entries=2)
+def load_grid(version: str, config: str) -> ArchetypeGrid:
+    """All archetypes priced in one batch for market data ``version``."""
+    engine, lock = load_engine(config)
+    with lock:
+        return ArchetypeGrid.build(engine)
 
+
+@st.cache_data(max_entries=8)
+def price_portfolio(book: pd.DataFrame, year: int, include_vat: bool, version: str, config: str):
+    """Priced summary rows for a book, in one price_batch call, and the rows left unpriced."""
+    engine, lock = load_engine(config)
+    with lock:
+        batch = RequestBatch.from_columns(
+            book, year=year, vat_by_market=engine.settings.vat if include_vat else None
+        )
+        _, ok = engine.market_tables().locate(batch)
+        rows = np.flatnonzero(ok)
+        priced = engine.price_batch(batch.take(rows), on_breach="flag")
+    summary = pd.DataFrame(priced.summary_columns())
+    if "customer_id" in book.columns:
+        summary.insert(0, "customer_id", book["customer_id"].to_numpy()[rows])
+    return summary, len(book) - len(rows)
+
+
+@st.cache_data(max_entries=8)
+def sample_book(quotes: int, year: int, version: str, config: str) -> pd.DataFrame:
+    engine, lock = load_engine(config)
+    with lock:
+        return sample_portfolio(engine.market_index(), quotes, year)
+
+
+def quote_view(engine: TariffEngine, grid: ArchetypeGrid) -> None:
     col1, col2, col3 = st.columns(3)
     with col1:
         market = st.selectbox("Market", [m.value for m in Market], index=0)
@@ -18,33 +75,114 @@ def main() -> None:
         segment = st.selectbox("Segment", [s.value for s in Segment], index=0)
         tariff = st.selectbox("Tariff structure", [t.value for t in TariffStructure], index=1)
     with col3:
-        year = st.number_input("Year", value=2026, step=1)
+        year = st.selectbox("Year", grid.years(), index=len(grid.years()) - 1)
         contract = st.selectbox("Contract type", [c.value for c in ContractType], index=0)
 
     include_vat = st.checkbox("Include VAT in quote", value=True)
 
-    if st.button("Run Pricing"):
-        result = engine.build_tariff_from_archetype(
-            market=Market(market),
-            commodity=Commodity(commodity),
-            segment=Segment(segment),
-            tariff_structure=TariffStructure(tariff),
-            year=int(year),
-            contract_type=ContractType(contract),
-            include_vat=include_vat,
+    key = (
+        Market(market),
+        Commodity(commodity),
+        Segment(segment),
+        TariffStructure(tariff),
+        int(year),
+        ContractType(contract),
+        include_vat,
+    )
+    result = grid.results.get(key)
+    if result is None:
+        st.error(f"No archetype or market data for {market}/{commodity}/{segment}/{tariff}.")
+        return
+    if key in grid.breached:
+        warnings = check_tariff_bounds(
+            result,
+            min_bounds=engine.settings.sanity["min_unit_rate_eur_per_kwh"],
+            max_bounds=engine.settings.sanity["max_unit_rate_eur_per_kwh"],
         )
+        st.error("Tariff out of configured bounds:\n\n" + "\n\n".join(warnings))
+        return
 
-        st.subheader("Quote Summary")
-        st.write(
-            f"Weighted energy-only: **{result.weighted_energy_only_eur_per_kwh:.5f} €/kWh**"
-        )
-        st.write(f"Weighted all-in: **{result.weighted_all_in_eur_per_kwh:.5f} €/kWh**")
-        st.write(f"Annual bill ex VAT: **€{result.estimated_annual_bill_ex_vat:,.2f}**")
-        st.write(f"Annual bill inc VAT: **€{result.estimated_annual_bill_inc_vat:,.2f}**")
+    st.subheader("Quote Summary")
+    st.write(f"Weighted energy-only: **{result.weighted_energy_only_eur_per_kwh:.5f} €/kWh**")
+    st.write(f"Weighted all-in: **{result.weighted_all_in_eur_per_kwh:.5f} €/kWh**")
+    st.write(f"Annual bill ex VAT: **€{result.estimated_annual_bill_ex_vat:,.2f}**")
+    st.write(f"Annual bill inc VAT: **€{result.estimated_annual_bill_inc_vat:,.2f}**")
+
+    st.subheader("Price Waterfall (€/MWh)")
+    df = tariff_components_to_dataframe(result.components)
+    st.dataframe(df)
+
+
+def portfolio_view(grid: ArchetypeGrid, version: str, config: str) -> None:
+    upload = st.file_uploader("Customer book (reprice-book layout)", type=["csv", "parquet"])
+    col1, col2 = st.columns(2)
+    with col1:
+        year = st.selectbox("Pricing year", grid.years(), index=len(grid.years()) - 1)
+    with col2:
+        include_vat = st.checkbox("Include VAT in bills", value=True)
+    if upload is None:
+        quotes = st.slider("Sample quotes", 1_000, 50_000, 5_000, step=1_000)
+        book = sample_book(quotes, int(year), version, config)
+    elif upload.name.endswith(".parquet"):
+        book = pd.read_parquet(upload)
+    else:
+        book = pd.read_csv(upload)
+
+    try:
+        priced, unpriced = price_portfolio(book, int(year), include_vat, version, config)
+    except (KeyError, ValueError) as exc:
+        st.error(f"Could not price the book: {exc}")
+        return
+    if unpriced:
+        st.warning(f"{unpriced:,} rows have no market data for their year and were skipped.")
+    if priced.empty:
+        return
+
+    bill_ex = priced["estimated_annual_bill_ex_vat"]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Quotes", f"{len(priced):,}")
+    col2.metric("Annual bills ex VAT", f"€{bill_ex.sum():,.0f}")
+    rate = np.average(
+        priced["weighted_all_in_eur_per_kwh"], weights=priced["annual_consumption_kwh"]
+    )
+    col3.metric("Volume-weighted all-in", f"{rate:.4f} €/kWh")
+    col4.metric("Out of bounds", f"{int(priced['sanity_breach'].sum()):,}")
+
+    st.subheader("Annual bills ex VAT by segment and market (€)")
+    by_segment = priced.pivot_table(
+        index="segment", columns="market", values="estimated_annual_bill_ex_vat", aggfunc="sum"
+    )
+    st.bar_chart(by_segment)
+
+    st.subheader("Weighted all-in rate (quotes per €/kWh bin)")
+    counts, edges = np.histogram(priced["weighted_all_in_eur_per_kwh"], bins=40)
+    st.bar_chart(pd.DataFrame({"quotes": counts}, index=np.round((edges[:-1] + edges[1:]) / 2, 5)))
+
+    st.subheader("Priced quotes")
+    st.dataframe(priced.head(1_000))
+    st.download_button(
+        "Download priced book (CSV)",
+        priced.to_csv(index=False).encode(),
+        file_name=f"priced_book_{year}.csv",
+        mime="text/csv",
+    )
+
+
+def main() -> None:
+    st.title("ROI + NI All-In Tariff Builder")
+
+    config = config_hash()
+    engine, lock = load_engine(config)
+    with lock:
+        # Cheap when nothing changed; a new version re-prices the grid once.
+        version = engine.market_index().version
+    grid = load_grid(version, config)
 
-        st.subheader("Price Waterfall (€/MWh)")
-        df = tariff_components_to_dataframe(result.components)
-        st.dataframe(df)
+    quote_tab, portfolio_tab = st.tabs(["Quote", "Portfolio"])
+    with quote_tab:
+        quote_view(engine, grid)
+    with portfolio_tab:
+        portfolio_view(grid, version, config)
 
 
 if __name__ == "__main__":
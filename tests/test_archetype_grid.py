@@ -0,0 +1,33 @@
+import pytest
+
+from pricing_engine.archetype_grid import ArchetypeGrid, sample_portfolio
+from pricing_engine.batch import RequestBatch
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def test_grid_matches_single_archetype_quotes() -> None:
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    grid = ArchetypeGrid.build(engine)
+
+    assert grid.results and grid.years() == [2026]
+    for key, result in grid.results.items():
+        market, commodity, segment, tariff, year, contract, include_vat = key
+        args = (market, commodity, segment, tariff, year, contract)
+        if key in grid.breached:
+            with pytest.raises(ValueError, match="out of configured bounds"):
+                engine.build_tariff_from_archetype(*args, include_vat=include_vat)
+        else:
+            single = engine.build_tariff_from_archetype(*args, include_vat=include_vat)
+            assert result == single
+
+
+def test_sample_portfolio_prices_in_one_batch() -> None:
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    book = sample_portfolio(engine.market_index(), 2_000, year=2026, seed=1)
+    batch = RequestBatch.from_columns(book)
+    _, ok = engine.market_tables().locate(batch)  # not every archetype has market data
+    priced = engine.price_batch(batch.take(ok.nonzero()[0]), on_breach="flag")
+
+    assert 0 < len(priced) < 2_000
+    assert book["customer_id"].is_unique
+    assert (priced.estimated_annual_bill_ex_vat > 0).all()
@@ -0,0 +1,87 @@
+import numpy as np
+
+from pricing_engine.batch import RequestBatch
+from pricing_engine.schemas import (
+    Commodity,
+    ContractType,
+    Market,
+    Segment,
+    TariffRequest,
+    TariffStructure,
+    TimeBand,
+)
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def _requests() -> list:
+    requests = []
+    for i in range(50):
+        day = 0.5 + i / 200
+        for contract in ContractType:
+            requests.append(
+                TariffRequest(
+                    market=Market.ROI,
+                    commodity=Commodity.ELEC,
+                    segment=Segment.SME,
+                    tariff_structure=TariffStructure.DAY_NIGHT,
+                    year=2026,
+                    contract_type=contract,
+                    annual_consumption_kwh=10_000 + 1_234.5 * i,
+                    standing_charge_eur_per_year=300,
+                    band_split={TimeBand.DAY: day, TimeBand.NIGHT: 1 - day},
+                    vat_rate=0.23 if i % 2 else None,
+                )
+            )
+            requests.append(
+                TariffRequest(
+                    market=Market.NI,
+                    commodity=Commodity.ELEC,
+                    segment=Segment.SME,
+                    tariff_structure=TariffStructure.FLAT,
+                    year=2026,
+                    contract_type=contract,
+                    annual_consumption_kwh=30_000 / (i + 1),
+                    standing_charge_eur_per_year=250,
+                    band_split={TimeBand.FLAT: 1.0},
+                    vat_rate=0.2,
+                )
+            )
+    return requests
+
+
+def test_build_tariffs_matches_scalar_path() -> None:
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    # Indexed quotes sit below the default unit-rate floor since wholesale is excluded.
+    engine.settings.sanity["min_unit_rate_eur_per_kwh"] = {"SME": 0.0, "IC": 0.0}
+
+    requests = _requests()
+    batch_results = engine.build_tariffs(requests)
+
+    assert len(batch_results) == len(requests)
+    for request, batch_result in zip(requests, batch_results):
+        assert batch_result == engine.build_tariff(request)
+
+
+def test_result_batch_is_columnar_and_converts_without_copies() -> None:
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    engine.settings.sanity["min_unit_rate_eur_per_kwh"] = {"SME": 0.0, "IC": 0.0}
+    requests = _requests()
+    batch = engine.price_batch(RequestBatch.from_requests(requests))
+
+    assert batch[3] == engine.build_tariff(requests[3])
+
+    df = batch.to_dataframe()
+    assert len(df) == len(requests)
+    assert np.shares_memory(df["band1_all_in_eur_per_mwh"].to_numpy(), batch.all_in)
+    assert df.loc[0, "band2"] == "NIGHT" and df.loc[1, "band1"] == "FLAT"
+    assert df.attrs["snapshot_id"] == batch.snapshot_id
+
+    table = batch.to_arrow()
+    assert table.column("band2").null_count == len(requests) // 2
+    assert np.shares_memory(
+        table.column("estimated_annual_bill_inc_vat").chunk(0).to_numpy(),
+        batch.estimated_annual_bill_inc_vat,
+    )
+
+    # A few hundred bytes per quote, against several KB for a TariffResult.
+    assert batch.nbytes / len(batch) < 300
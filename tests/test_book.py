@@ -0,0 +1,134 @@
+import pandas as pd
+import pytest
+
+from pricing_engine.book import read_ahead, reprice_book
+from pricing_engine.schemas import (
+    Commodity,
+    ContractType,
+    Market,
+    Segment,
+    TariffRequest,
+    TariffStructure,
+    TimeBand,
+)
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def test_reprice_book_streams_chunks_and_matches_engine(tmp_path) -> None:
+    book = pd.DataFrame(
+        {
+            "customer_id": [f"C{i}" for i in range(7)],
+            "market": ["ROI", "NI"] * 3 + ["ROI"],
+            "commodity": "ELEC",
+            "segment": "SME",
+            "tariff_structure": ["daynight", "flat"] * 3 + ["daynight"],
+            "contract_type": "fixed",
+            "annual_consumption_kwh": [10_000.0 * (i + 1) for i in range(7)],
+            "standing_charge_eur_per_year": 300.0,
+            "flat_share": [0.0, 1.0] * 3 + [0.0],
+            "day_share": [0.6, 0.0] * 3 + [0.7],
+            "night_share": [0.4, 0.0] * 3 + [0.3],
+            "peak_share": 0.0,
+            "offpeak_share": 0.0,
+        }
+    )
+    book.to_csv(tmp_path / "book.csv", index=False)
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+
+    stats = reprice_book(
+        engine, tmp_path / "book.csv", tmp_path / "priced.csv", chunk_size=3, year=2026
+    )
+    priced = pd.read_csv(tmp_path / "priced.csv")
+
+    assert (stats.rows, stats.chunks) == (7, 3)
+    assert priced["customer_id"].tolist() == book["customer_id"].tolist()
+
+    expected = engine.build_tariff(
+        TariffRequest(
+            market=Market.ROI,
+            commodity=Commodity.ELEC,
+            segment=Segment.SME,
+            tariff_structure=TariffStructure.DAY_NIGHT,
+            year=2026,
+            contract_type=ContractType.FIXED,
+            annual_consumption_kwh=70_000.0,
+            standing_charge_eur_per_year=300.0,
+            band_split={TimeBand.DAY: 0.7, TimeBand.NIGHT: 0.3},
+            vat_rate=engine.settings.vat["ROI"],
+        )
+    )
+    last = priced.iloc[-1]
+    assert last["estimated_annual_bill_inc_vat"] == pytest.approx(
+        expected.estimated_annual_bill_inc_vat, rel=1e-12
+    )
+    assert last["day_all_in_eur_per_kwh"] == pytest.approx(expected.components[0].all_in_eur_per_kwh)
+    assert pd.isna(last["flat_all_in_eur_per_kwh"])
+
+
+def test_reprice_book_worker_processes_write_identical_csv(tmp_path) -> None:
+    book = pd.DataFrame(
+        {
+            "customer_id": [f"C{i}" for i in range(9)],
+            "market": "ROI",
+            "commodity": "ELEC",
+            "segment": "SME",
+            "tariff_structure": "daynight",
+            "contract_type": "fixed",
+            "annual_consumption_kwh": [10_000.0 * (i + 1) for i in range(9)],
+            "standing_charge_eur_per_year": 300.0,
+            "day_share": 0.6,
+            "night_share": 0.4,
+        }
+    )
+    book.to_csv(tmp_path / "book.csv", index=False)
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+
+    for processes, name in ((1, "serial.csv"), (2, "pool.csv")):
+        reprice_book(
+            engine, tmp_path / "book.csv", tmp_path / name, 2, 2026, processes=processes
+        )
+    assert (tmp_path / "pool.csv").read_bytes() == (tmp_path / "serial.csv").read_bytes()
+
+
+def test_read_ahead_keeps_order_and_raises_reader_errors() -> None:
+    def chunks():
+        yield from range(5)
+        raise OSError("disk gone")
+
+    seen = []
+    with pytest.raises(OSError, match="disk gone"):
+        for item in read_ahead(chunks()):
+            seen.append(item)
+    assert seen == [0, 1, 2, 3, 4]
+
+
+def test_book_rows_with_bad_shares_or_blank_vat(tmp_path) -> None:
+    book = pd.DataFrame(
+        {
+            "customer_id": ["A", "B", "C"],
+            "market": "ROI",
+            "commodity": "ELEC",
+            "segment": "SME",
+            "tariff_structure": "daynight",
+            "contract_type": "fixed",
+            "annual_consumption_kwh": 20_000.0,
+            "standing_charge_eur_per_year": 300.0,
+            "day_share": [0.6, 0.6, 0.6],
+            "night_share": [0.4, 0.4, 0.4],
+            "vat_rate": [0.0, None, 0.1],
+        }
+    )
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+
+    book.to_csv(tmp_path / "book.csv", index=False)
+    reprice_book(engine, tmp_path / "book.csv", tmp_path / "priced.csv", year=2026)
+    priced = pd.read_csv(tmp_path / "priced.csv")
+    vat = priced["estimated_annual_bill_inc_vat"] / priced["estimated_annual_bill_ex_vat"] - 1
+    # A blank cell falls back to the market's configured rate; explicit rates are kept.
+    assert vat.round(6).tolist() == [0.0, engine.settings.vat["ROI"], 0.1]
+
+    for day, night in ((None, 0.4), (0.9, 0.9), (-0.2, 1.2)):
+        book.loc[1, ["day_share", "night_share"]] = [day, night]
+        book.to_csv(tmp_path / "book.csv", index=False)
+        with pytest.raises(ValueError, match=r"Row 1 \(customer_id B\): daynight band shares"):
+            reprice_book(engine, tmp_path / "book.csv", tmp_path / "priced.csv", year=2026)
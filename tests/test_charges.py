@@ -1,3 +1,5 @@
+from datetime import date
+
 import pandas as pd
 
 from pricing_engine.charges import PassThroughLibrary
@@ -33,3 +35,89 @@ def test_pass_through_select() -> None:
     )
     assert selection.network_eur_per_mwh == 40
     assert selection.levies_eur_per_mwh == 0
+
+
+def test_select_many_uses_effective_dated_versions() -> None:
+    base = dict(
+        region="ROI",
+        commodity="ELEC",
+        segment="SME",
+        year=2026,
+        band="DAY",
+        charge_type="NETWORK",
+        name="DUoS",
+        unit="EUR_MWH",
+    )
+    df = pd.DataFrame(
+        [
+            dict(base, value=40, effective_from="2026-01-01", effective_to="2026-03-31", version=1),
+            dict(base, value=44, effective_from="2026-04-01", effective_to="2026-09-30", version=2),
+            dict(
+                base,
+                charge_type="LEVY",
+                name="PSO Levy",
+                value=5,
+                effective_from="2026-01-01",
+                effective_to="2026-12-31",
+                version=1,
+            ),
+        ]
+    )
+    lib = PassThroughLibrary(df)
+
+    totals = lib.select_many(
+        Market.ROI,
+        Commodity.ELEC,
+        Segment.SME,
+        2026,
+        TimeBand.DAY,
+        ["2025-12-31", "2026-01-01", "2026-03-31", "2026-04-01", "2026-10-01", "2027-01-01"],
+    )
+    assert totals.network_eur_per_mwh.tolist() == [0, 40, 40, 44, 0, 0]
+    assert totals.levies_eur_per_mwh.tolist() == [0, 5, 5, 5, 5, 0]
+    assert totals.found.tolist() == [False, True, True, True, True, False]
+
+    selection = lib.select_for_band(
+        Market.ROI, Commodity.ELEC, Segment.SME, 2026, TimeBand.DAY, as_of=date(2026, 5, 1)
+    )
+    assert selection.network_eur_per_mwh == 44
+    assert selection.raw_rows["version"].tolist() == [2, 1]
+
+
+def test_charge_book_validation_returns_findings() -> None:
+    base = dict(
+        region="NI",
+        commodity="ELEC",
+        segment="SME",
+        year=2026,
+        band="FLAT",
+        charge_type="NETWORK",
+        name="Use of System",
+        unit="EUR_MWH",
+    )
+    df = pd.DataFrame(
+        [
+            dict(base, value=50, effective_from="2026-07-01", effective_to="2026-12-31", version=2),
+            dict(base, value=35, effective_from="2026-01-01", effective_to="2026-07-01", version=1),
+            dict(base, value=36, effective_from="2027-01-01", effective_to="2027-12-31", version=3),
+            dict(
+                base,
+                name="Other",
+                value=1,
+                effective_from="2026-01-01",
+                effective_to="2026-12-31",
+                version=1,
+            ),
+        ]
+    )
+    lib = PassThroughLibrary(df)
+
+    overlaps = lib.find_overlaps()
+    assert overlaps[["name", "prev_version", "version"]].values.tolist() == [
+        ["Use of System", 1, 2]
+    ]
+    assert overlaps["effective_from"].tolist() == [date(2026, 7, 1)]
+
+    changes = lib.detect_large_changes(threshold_pct=0.2)
+    assert changes[["prev_version", "version"]].values.tolist() == [[1, 2], [2, 3]]
+    assert changes["change_pct"].round(4).tolist() == [round(15 / 35, 4), 0.28]
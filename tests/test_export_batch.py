@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+
+from pricing_engine.batch import RequestBatch
+from pricing_engine.book import reprice_book
+from pricing_engine.export_batch import BandDatasetWriter, export_batch_bands
+from pricing_engine.export_csv import export_tariff_to_csv
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def _book() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "customer_id": [f"C{i}" for i in range(6)],
+            "market": ["ROI", "NI"] * 3,
+            "commodity": "ELEC",
+            "segment": "SME",
+            "tariff_structure": ["daynight", "flat"] * 3,
+            "contract_type": "fixed",
+            "annual_consumption_kwh": [10_000.0 * (i + 1) for i in range(6)],
+            "standing_charge_eur_per_year": 300.0,
+            "flat_share": [0.0, 1.0] * 3,
+            "day_share": [0.6, 0.0] * 3,
+            "night_share": [0.4, 0.0] * 3,
+        }
+    )
+
+
+@pytest.mark.parametrize("arrow", [True, False])
+def test_band_dataset_matches_per_quote_csv(tmp_path, arrow) -> None:
+    if arrow:
+        pytest.importorskip("pyarrow")
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    book = _book()
+    priced = engine.price_batch(RequestBatch.from_columns(book, year=2026))
+
+    with BandDatasetWriter(tmp_path / "bands", "csv", chunk_quotes=4, use_arrow=arrow) as writer:
+        writer.write(priced, book["customer_id"].tolist())
+    assert writer.rows == 9  # three day/night quotes with two bands, three flat
+
+    roi = pd.read_csv(tmp_path / "bands/market=ROI/commodity=ELEC/segment=SME/part-0.csv")
+    assert roi["quote_id"].tolist() == ["C0", "C0", "C2", "C2", "C4", "C4"]
+    export_tariff_to_csv(priced.result(2), tmp_path / "single.csv")
+    single = pd.read_csv(tmp_path / "single.csv")
+    c2 = roi[roi["quote_id"] == "C2"].drop(columns="quote_id").reset_index(drop=True)
+    # pyarrow writes whole floats without ".0", so they read back as integers.
+    pd.testing.assert_frame_equal(c2, single, check_dtype=False)
+
+
+def test_band_dataset_as_parquet(tmp_path) -> None:
+    pytest.importorskip("pyarrow")
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    priced = engine.price_batch(RequestBatch.from_columns(_book(), year=2026))
+
+    assert export_batch_bands(priced, tmp_path / "parquet", "parquet") == 9
+    dataset = pd.read_parquet(tmp_path / "parquet")
+    assert sorted(dataset["market"].astype(str).unique()) == ["NI", "ROI"]
+    energy = priced.estimated_annual_bill_ex_vat - priced.batch.standing_charge_eur_per_year
+    assert dataset["annual_cost_ex_vat"].sum() == pytest.approx(energy.sum())
+    with pytest.raises(ValueError, match="pyarrow"):
+        BandDatasetWriter(tmp_path / "other", "parquet", use_arrow=False)
+
+
+def test_reprice_book_writes_band_dataset_in_same_pass(tmp_path) -> None:
+    _book().to_csv(tmp_path / "book.csv", index=False)
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+
+    reprice_book(
+        engine,
+        tmp_path / "book.csv",
+        tmp_path / "priced.csv",
+        chunk_size=4,
+        year=2026,
+        band_dataset=tmp_path / "bands",
+    )
+    priced = pd.read_csv(tmp_path / "priced.csv")
+    parts = sorted((tmp_path / "bands").rglob("*.csv"))
+    bands = pd.concat([pd.read_csv(p) for p in parts])
+
+    assert len(parts) == 2
+    totals = bands.groupby("quote_id")["annual_cost_ex_vat"].sum()
+    priced = priced.set_index("customer_id")
+    expected = priced["weighted_all_in_eur_per_kwh"] * priced["annual_consumption_kwh"]
+    pd.testing.assert_series_equal(
+        totals.sort_index(), expected.sort_index(), check_names=False, check_index_type=False
+    )
+    with pytest.raises(FileExistsError):
+        BandDatasetWriter(tmp_path / "bands")
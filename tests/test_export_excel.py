@@ -0,0 +1,73 @@
+import pandas as pd
+
+from pricing_engine.book import reprice_book
+from pricing_engine.export_excel import export_tariff_to_excel, export_tariffs_to_excel
+from pricing_engine.schemas import (
+    Commodity,
+    ContractType,
+    Market,
+    Segment,
+    TariffRequest,
+    TariffStructure,
+    TimeBand,
+)
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def _request(kwh: float, day: float) -> TariffRequest:
+    return TariffRequest(
+        market=Market.ROI,
+        commodity=Commodity.ELEC,
+        segment=Segment.SME,
+        tariff_structure=TariffStructure.DAY_NIGHT,
+        year=2026,
+        contract_type=ContractType.FIXED,
+        annual_consumption_kwh=kwh,
+        standing_charge_eur_per_year=300,
+        band_split={TimeBand.DAY: day, TimeBand.NIGHT: round(1 - day, 6)},
+    )
+
+
+def test_pack_matches_single_quote_workbooks(tmp_path) -> None:
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    results = [engine.build_tariff(_request(10_000.0 * (i + 1), 0.5 + i / 10)) for i in range(3)]
+
+    assert export_tariffs_to_excel(enumerate(results, 1), tmp_path / "pack.xlsx") == 3
+    export_tariff_to_excel(results[1], tmp_path / "single.xlsx")
+    pack = pd.read_excel(tmp_path / "pack.xlsx", sheet_name=None)
+    single = pd.read_excel(tmp_path / "single.xlsx", sheet_name=None)
+
+    assert list(pack) == list(single)
+    for sheet in ("Tariff_Build", "Cost_Stack_Data", "Quote_Summary"):
+        assert pack[sheet].columns[0] == "quote_id"
+        assert pack[sheet]["quote_id"].unique().tolist() == [1, 2, 3]
+        second = pack[sheet][pack[sheet]["quote_id"] == 2].drop(columns="quote_id")
+        pd.testing.assert_frame_equal(second.reset_index(drop=True), single[sheet])
+
+
+def test_reprice_book_writes_pack_keyed_by_customer(tmp_path) -> None:
+    book = pd.DataFrame(
+        {
+            "customer_id": [f"C{i}" for i in range(5)],
+            "market": "ROI",
+            "commodity": "ELEC",
+            "segment": "SME",
+            "tariff_structure": "daynight",
+            "contract_type": "fixed",
+            "annual_consumption_kwh": [20_000.0 * (i + 1) for i in range(5)],
+            "standing_charge_eur_per_year": 300.0,
+            "day_share": 0.6,
+            "night_share": 0.4,
+        }
+    )
+    book.to_csv(tmp_path / "book.csv", index=False)
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+
+    stats = reprice_book(
+        engine, tmp_path / "book.csv", tmp_path / "pack.xlsx", chunk_size=2, year=2026
+    )
+    summary = pd.read_excel(tmp_path / "pack.xlsx", sheet_name="Quote_Summary")
+
+    assert (stats.rows, stats.chunks) == (5, 3)
+    assert summary["quote_id"].tolist() == book["customer_id"].tolist()
+    assert summary["annual_consumption_kwh"].tolist() == book["annual_consumption_kwh"].tolist()
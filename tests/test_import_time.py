@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+# Generous wall-clock budgets (seconds) so slow CI machines do not flake; the
+# heavy-module checks below are the precise guard against regressions.
+LIBRARY_BUDGET_S = 1.0
+CLI_BUDGET_S = 1.5
+HEAVY_MODULES = {"pandas", "openpyxl", "xlsxwriter", "pyarrow", "streamlit"}
+
+
+def _importtime(*args: str) -> tuple[float, set]:
+    """Total import seconds and the set of top-level packages imported."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    packages = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        packages.add(name.strip().split(".")[0])
+        if not name.startswith("  "):  # top-level entries already include nested imports
+            total_us += int(cumulative)
+    return total_us / 1e6, packages
+
+
+def test_library_import_is_lazy() -> None:
+    seconds, packages = _importtime("-c", "import pricing_engine")
+    assert packages.isdisjoint(HEAVY_MODULES | {"numpy", "pydantic"})
+
+    seconds, packages = _importtime("-c", "import pricing_engine.tariff_engine")
+    assert seconds < LIBRARY_BUDGET_S
+    assert packages.isdisjoint(HEAVY_MODULES)
+
+
+def test_cli_run_does_not_import_pandas_or_exporters() -> None:
+    seconds, packages = _importtime(
+        "-m",
+        "pricing_engine",
+        "run",
+        "--market",
+        "ROI",
+        "--segment",
+        "SME",
+        "--tariff",
+        "daynight",
+        "--year",
+        "2026",
+    )
+    assert seconds < CLI_BUDGET_S
+    assert packages.isdisjoint(HEAVY_MODULES)
@@ -0,0 +1,196 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+from pricing_engine.book import reprice_book
+from pricing_engine.incremental import InputKey, diff_inputs, quote_dependencies, reprice_changes
+from pricing_engine.schemas import (
+    Commodity,
+    ContractType,
+    Market,
+    Segment,
+    TariffRequest,
+    TariffStructure,
+    TimeBand,
+)
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def test_reprice_changes_touches_only_dependent_quotes(tmp_path) -> None:
+    book = pd.DataFrame(
+        {
+            "customer_id": [f"C{i}" for i in range(6)],
+            "market": ["ROI", "NI"] * 3,
+            "commodity": "ELEC",
+            "segment": "SME",
+            "tariff_structure": ["daynight", "flat"] * 3,
+            "contract_type": "fixed",
+            "year": 2026,
+            "annual_consumption_kwh": [10_000.0 * (i + 1) for i in range(6)],
+            "standing_charge_eur_per_year": 300.0,
+            "flat_share": [0.0, 1.0] * 3,
+            "day_share": [0.6, 0.0] * 3,
+            "night_share": [0.4, 0.0] * 3,
+            "peak_share": 0.0,
+            "offpeak_share": 0.0,
+        }
+    )
+    book.to_csv(tmp_path / "book.csv", index=False)
+    shutil.copytree("sample_data", tmp_path / "sample_data")
+    old = TariffEngine.from_config("config/base.yaml", ".")
+    reprice_book(old, tmp_path / "book.csv", tmp_path / "old.csv")
+
+    charges = tmp_path / "sample_data" / "pass_through_charges.csv"
+    old_row, new_row = (f"2026,DAY,NETWORK,DUoS SME Day,EUR_MWH,{v}," for v in ("45", "47.5"))
+    charges.write_text(charges.read_text().replace(old_row, new_row))
+    new = TariffEngine.from_config("config/base.yaml", tmp_path)
+    changes = diff_inputs(old.market_index(), new.market_index(), old.settings, new.settings)
+    key = InputKey("pass_through", "ROI", "ELEC", "SME", 2026, "DAY", "DUoS SME Day")
+    assert [(c.key, c.old, c.new) for c in changes] == [(key, 45.0, 47.5)]
+
+    request = TariffRequest(
+        market=Market.ROI,
+        commodity=Commodity.ELEC,
+        segment=Segment.SME,
+        tariff_structure=TariffStructure.DAY_NIGHT,
+        year=2026,
+        contract_type=ContractType.FIXED,
+        annual_consumption_kwh=10_000,
+        standing_charge_eur_per_year=300,
+        band_split={TimeBand.DAY: 0.6, TimeBand.NIGHT: 0.4},
+    )
+    assert key in quote_dependencies(request, new.market_index())
+
+    stats = reprice_changes(
+        new,
+        changes,
+        tmp_path / "book.csv",
+        tmp_path / "old.csv",
+        tmp_path / "new.csv",
+        feed_path=tmp_path / "feed.csv",
+    )
+    assert (stats.rows, stats.repriced) == (6, 3)
+
+    # The same update, four rows at a time.
+    chunked = reprice_changes(
+        new, changes, tmp_path / "book.csv", tmp_path / "old.csv", tmp_path / "chunked.csv",
+        chunk_size=4,
+    )
+    assert (chunked.rows, chunked.repriced) == (6, 3)
+    pd.testing.assert_frame_equal(
+        pd.read_csv(tmp_path / "chunked.csv"), pd.read_csv(tmp_path / "new.csv")
+    )
+    pd.read_csv(tmp_path / "old.csv").head(5).to_csv(tmp_path / "short.csv", index=False)
+    with pytest.raises(ValueError, match="has 5 rows but the book has 6"):
+        reprice_changes(
+            new, changes, tmp_path / "book.csv", tmp_path / "short.csv", tmp_path / "x.csv",
+            chunk_size=4,
+        )
+
+    reprice_book(new, tmp_path / "book.csv", tmp_path / "full.csv")
+    full = pd.read_csv(tmp_path / "full.csv")
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "new.csv"), full)
+
+    feed = pd.read_csv(tmp_path / "feed.csv")
+    assert feed["customer_id"].tolist() == ["C0", "C2", "C4"]
+    assert feed["row"].tolist() == [0, 2, 4]
+    assert (feed["new_weighted_all_in_eur_per_kwh"] > feed["old_weighted_all_in_eur_per_kwh"]).all()
+    assert (feed["changed_inputs"] == key.label).all()
+
+
+def test_reprice_changes_reflags_a_flagged_book(tmp_path) -> None:
+    book = pd.DataFrame(
+        {
+            "customer_id": ["C0", "C1"],
+            "market": ["ROI", "NI"],
+            "commodity": "ELEC",
+            "segment": "SME",
+            "tariff_structure": ["daynight", "flat"],
+            "contract_type": "fixed",
+            "year": 2026,
+            "annual_consumption_kwh": 10_000.0,
+            "standing_charge_eur_per_year": 300.0,
+            "flat_share": [0.0, 1.0],
+            "day_share": [0.6, 0.0],
+            "night_share": [0.4, 0.0],
+        }
+    )
+    book.to_csv(tmp_path / "book.csv", index=False)
+    shutil.copytree("sample_data", tmp_path / "sample_data")
+    charges = tmp_path / "sample_data" / "pass_through_charges.csv"
+    old_row, new_row = (f"2026,DAY,NETWORK,DUoS SME Day,EUR_MWH,{v}," for v in ("45", "900"))
+    charges.write_text(charges.read_text().replace(old_row, new_row))
+    base = TariffEngine.from_config("config/base.yaml", ".")
+    steep = TariffEngine.from_config("config/base.yaml", tmp_path)
+
+    def reprice(old, new, previous, output):
+        changes = diff_inputs(old.market_index(), new.market_index(), old.settings, new.settings)
+        stats = reprice_changes(
+            new, changes, tmp_path / "book.csv", previous, output, on_breach="flag"
+        )
+        reprice_book(new, tmp_path / "book.csv", tmp_path / "full.csv", on_breach="flag")
+        pd.testing.assert_frame_equal(pd.read_csv(output), pd.read_csv(tmp_path / "full.csv"))
+        return stats, pd.read_csv(output)["sanity_breach"].tolist()
+
+    reprice_book(base, tmp_path / "book.csv", tmp_path / "base.csv", on_breach="flag")
+    stats, flags = reprice(base, steep, tmp_path / "base.csv", tmp_path / "steep.csv")
+    assert (stats.repriced, stats.breaches, flags) == (1, 1, [True, False])
+    stats, flags = reprice(steep, base, tmp_path / "steep.csv", tmp_path / "back.csv")
+    assert (stats.repriced, stats.breaches, flags) == (1, 0, [False, False])
+
+    # A book priced with the default "raise" gains the column when updated with "flag".
+    reprice_book(base, tmp_path / "book.csv", tmp_path / "raised.csv")
+    reprice(base, steep, tmp_path / "raised.csv", tmp_path / "from_raised.csv")
+    with pytest.raises(ValueError, match="on_breach='drop'"):
+        reprice_changes(
+            steep, [], tmp_path / "book.csv", tmp_path / "base.csv", tmp_path / "x.csv",
+            on_breach="drop",
+        )
+
+
+def test_risk_model_change_reprices_non_indexed_quotes(tmp_path) -> None:
+    book = pd.DataFrame(
+        {
+            "market": "ROI",
+            "commodity": "ELEC",
+            "segment": "SME",
+            "tariff_structure": "daynight",
+            "contract_type": ["fixed", "indexed", "fixed"],
+            "year": 2026,
+            "annual_consumption_kwh": [10_000.0, 20_000.0, 30_000.0],
+            "standing_charge_eur_per_year": 300.0,
+            "day_share": 0.6,
+            "night_share": 0.4,
+        }
+    )
+    book.to_csv(tmp_path / "book.csv", index=False)
+    config = {"paths": 500, "seed": 3}
+
+    def engine_with(risk_model):
+        engine = TariffEngine.from_config("config/base.yaml", ".")
+        engine.settings.risk_model = risk_model
+        # Indexed quotes carry no wholesale cost and sit below the SME floor.
+        engine.settings.sanity["min_unit_rate_eur_per_kwh"]["SME"] = 0.0
+        return engine
+
+    flat = engine_with(None)
+    reprice_book(flat, tmp_path / "book.csv", tmp_path / "flat.csv")
+
+    def reprice(old, new, previous, output):
+        changes = diff_inputs(old.market_index(), new.market_index(), old.settings, new.settings)
+        stats = reprice_changes(new, changes, tmp_path / "book.csv", previous, output)
+        reprice_book(new, tmp_path / "book.csv", tmp_path / "full.csv")
+        full = pd.read_csv(tmp_path / "full.csv")
+        pd.testing.assert_frame_equal(pd.read_csv(output), full)
+        return changes, stats.repriced
+
+    # Switching the model on moves indexed quotes too (flat risk_pct -> no premium).
+    mc = engine_with(config)
+    changes, repriced = reprice(flat, mc, tmp_path / "flat.csv", tmp_path / "mc.csv")
+    assert [(c.key.label, c.old) for c in changes] == [("risk_model", None)]
+    assert repriced == 3
+
+    wider = engine_with({**config, "percentile": 90})
+    _, repriced = reprice(mc, wider, tmp_path / "mc.csv", tmp_path / "wider.csv")
+    assert repriced == 2
@@ -0,0 +1,63 @@
+from pricing_engine.batch import RequestBatch
+from pricing_engine.export_csv import export_tariff_to_csv
+from pricing_engine.instrumentation import METRICS, MetricsRegistry
+from pricing_engine.schemas import (
+    Commodity,
+    ContractType,
+    Market,
+    Segment,
+    TariffRequest,
+    TariffStructure,
+    TimeBand,
+)
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def _request() -> TariffRequest:
+    return TariffRequest(
+        market=Market.ROI,
+        commodity=Commodity.ELEC,
+        segment=Segment.SME,
+        tariff_structure=TariffStructure.DAY_NIGHT,
+        year=2026,
+        contract_type=ContractType.FIXED,
+        annual_consumption_kwh=50_000,
+        standing_charge_eur_per_year=300,
+        band_split={TimeBand.DAY: 0.6, TimeBand.NIGHT: 0.4},
+    )
+
+
+def test_disabled_registry_records_nothing() -> None:
+    registry = MetricsRegistry()
+    with registry.stage("cost_stack"):
+        pass
+    assert registry.laps() is None
+    assert registry.stages() == {}
+    assert registry.to_openmetrics().endswith("# EOF\n")
+
+
+def test_engine_and_exporters_record_stages(tmp_path) -> None:
+    METRICS.reset()
+    METRICS.enable()
+    try:
+        engine = TariffEngine.from_config("config/base.yaml", ".")
+        result = engine.build_tariff(_request())
+        engine.price_batch(RequestBatch.from_requests([_request()] * 3))
+        export_tariff_to_csv(result, tmp_path / "quote.csv")
+    finally:
+        METRICS.disable()
+    stages = METRICS.stages()
+    METRICS.reset()
+
+    for name in ("read_input", "compile_index", "build_tariff", "sanity", "export_csv"):
+        assert stages[name].count >= 1, name
+    assert stages["cost_stack"].count == 2
+    assert stages["cost_stack"].items == 4
+    assert stages["build_tariff"].total_s >= stages["sanity"].total_s
+
+    METRICS.record("cost_stack", 0.5, items=10)
+    text = METRICS.to_openmetrics()
+    METRICS.reset()
+    assert 'pricing_engine_stage_seconds_count{stage="cost_stack"} 1' in text
+    assert 'pricing_engine_stage_items_total{stage="cost_stack"} 10' in text
+    assert text.endswith("# EOF\n")
@@ -0,0 +1,46 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from pricing_engine.config import load_settings
+from pricing_engine.market_data import MarketDataStore, parse_csv_columns
+
+
+def test_store_reloads_only_on_content_change(tmp_path) -> None:
+    settings = load_settings("config/base.yaml")
+    path = tmp_path / "losses.csv"
+    path.write_text("year,market,commodity,segment,band,loss_factor\n2026,ROI,ELEC,SME,FLAT,1.08\n")
+    store = MarketDataStore(settings, tmp_path)
+
+    assert store.read(path)["loss_factor"].iloc[0] == 1.08
+    store.read(path)
+    assert (store.stats.misses, store.stats.hits, store.stats.reloads) == (1, 1, 0)
+
+    # Touching the file without changing it does not trigger a re-parse.
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    store.read(path)
+    assert store.stats.reloads == 0
+
+    path.write_text("year,market,commodity,segment,band,loss_factor\n2026,ROI,ELEC,SME,FLAT,1.09\n")
+    assert store.read(path)["loss_factor"].iloc[0] == 1.09
+    assert store.stats.reloads == 1
+
+
+def test_column_parser_matches_pandas(tmp_path) -> None:
+    odd = tmp_path / "odd.csv"
+    odd.write_text(
+        "flag,maybe,count,name,empty,code,rate\n"
+        "True,true,1,x,NA,1_0,inf\n"
+        "false,,NA,null,N/A,7,-Infinity\n"
+    )
+    for path in sorted(Path("sample_data").glob("*.csv")) + [odd]:
+        expected = pd.read_csv(path)
+        parsed = parse_csv_columns(path.read_bytes())
+        assert list(parsed) == list(expected.columns), path
+        for name, column in parsed.items():
+            values = expected[name].to_numpy()
+            assert column.dtype == values.dtype, (path, name)
+            assert pd.isna(column).tolist() == pd.isna(values).tolist(), (path, name)
+            assert column[~pd.isna(column)].tolist() == values[~pd.isna(values)].tolist()
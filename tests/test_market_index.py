@@ -0,0 +1,47 @@
+import shutil
+
+from pricing_engine.charges import PassThroughLibrary
+from pricing_engine.market_data import (
+    load_losses,
+    load_pass_through,
+    load_shaping_adders,
+    load_wholesale_curve,
+)
+from pricing_engine.schemas import Commodity, Market, Segment, TimeBand
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def test_index_matches_dataframe_loaders() -> None:
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    index = engine.market_index()
+    settings, root = engine.settings, engine.data_root
+
+    (inputs,) = index.band_inputs(Market.ROI, Commodity.ELEC, Segment.SME, 2026, [TimeBand.DAY])
+
+    wholesale = load_wholesale_curve(settings, root, Market.ROI, Commodity.ELEC, 2026)
+    shaping = load_shaping_adders(settings, root, Market.ROI, Commodity.ELEC, 2026)
+    losses = load_losses(settings, root, Market.ROI, Commodity.ELEC, Segment.SME, 2026)
+    charges = PassThroughLibrary(
+        load_pass_through(settings, root, Market.ROI, Commodity.ELEC, Segment.SME, 2026)
+    ).select_for_band(Market.ROI, Commodity.ELEC, Segment.SME, 2026, TimeBand.DAY)
+
+    assert inputs.wholesale_eur_per_mwh == wholesale.set_index("band").loc["DAY", "price_eur_per_mwh"]
+    assert inputs.shaping_eur_per_mwh == shaping.set_index("band").loc["DAY", "adder_eur_per_mwh"]
+    assert inputs.loss_factor == losses.set_index("band").loc["DAY", "loss_factor"]
+    assert inputs.network_eur_per_mwh == charges.network_eur_per_mwh
+    assert inputs.levies_eur_per_mwh == charges.levies_eur_per_mwh
+
+
+def test_index_recompiles_when_inputs_change(tmp_path) -> None:
+    shutil.copytree("sample_data", tmp_path / "sample_data")
+    engine = TariffEngine.from_config("config/base.yaml", tmp_path)
+    first = engine.market_index()
+    assert engine.market_index() is first
+
+    curve = tmp_path / "sample_data" / "wholesale_elec_roi_2026.csv"
+    curve.write_text(curve.read_text().replace("DAY,110", "DAY,111"))
+
+    index = engine.market_index()
+    assert index is not first
+    (inputs,) = index.band_inputs(Market.ROI, Commodity.ELEC, Segment.SME, 2026, [TimeBand.DAY])
+    assert inputs.wholesale_eur_per_mwh == 111
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from pricing_engine.batch import RequestBatch
+from pricing_engine.metering import ingest_meter_reads
+from pricing_engine.schemas import Market, TariffStructure
+from pricing_engine.tariff_engine import TariffEngine
+from pricing_engine.tou import TouCalendar
+
+
+def test_ingest_meter_reads_band_splits_price_directly(tmp_path) -> None:
+    rng = np.random.default_rng(0)
+    starts = pd.date_range("2026-03-20", "2026-04-10", freq="30min", inclusive="left")
+    reads = pd.DataFrame(
+        {
+            "customer_id": np.repeat(["A", "B", "C"], len(starts)),
+            "timestamp": np.tile(starts.strftime("%Y-%m-%dT%H:%M:%SZ"), 3),
+            "kwh": rng.uniform(0.0, 2.0, 3 * len(starts)),
+        }
+    )
+    reads.to_csv(tmp_path / "reads.csv", index=False)
+
+    table, stats = ingest_meter_reads(
+        tmp_path / "reads.csv",
+        tmp_path / "splits.parquet",
+        market=Market.ROI,
+        chunk_size=1_000,
+        annualise=True,
+        year=2026,
+        defaults={
+            "commodity": "ELEC",
+            "segment": "SME",
+            "tariff_structure": "daynight",
+            "contract_type": "fixed",
+            "year": 2026,
+            "standing_charge_eur_per_year": 300.0,
+        },
+    )
+    assert stats.rows == len(reads) and stats.chunks > 1 and stats.customers == 3
+    assert table.equals(pd.read_parquet(tmp_path / "splits.parquet"))
+
+    calendar = TouCalendar(Market.ROI)
+    utc = starts.to_numpy().astype("datetime64[m]")
+    night = calendar.slots(TariffStructure.DAY_NIGHT, utc) == 1
+    peak = calendar.slots(TariffStructure.PEAK_OFFPEAK, utc) == 0
+    for i, customer in enumerate("ABC"):
+        kwh = reads.loc[reads.customer_id == customer, "kwh"].to_numpy()
+        row = table.iloc[i]
+        assert row.customer_id == customer and row.reads == len(starts)
+        assert np.isclose(row.night_share, kwh[night].sum() / kwh.sum())
+        assert np.isclose(row.peak_share, kwh[peak].sum() / kwh.sum())
+        assert np.isclose(row.day_share + row.night_share, 1.0)
+        assert np.isclose(row.annual_consumption_kwh, kwh.sum() * 17_520 / len(starts))
+
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    priced = engine.price_batch(RequestBatch.from_columns(table))
+    assert priced.valid[:2].all()
+    assert np.isclose(priced.batch.band_weights[0, 1], table.night_share[0])
@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+
+from pricing_engine.batch import RequestBatch
+from pricing_engine.parallel import ParallelPricer
+from pricing_engine.schemas import (
+    Commodity,
+    ContractType,
+    Market,
+    Segment,
+    TariffRequest,
+    TariffStructure,
+    TimeBand,
+)
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def test_parallel_pricer_matches_serial_batch() -> None:
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    requests = [
+        TariffRequest(
+            market=Market.ROI,
+            commodity=Commodity.ELEC,
+            segment=Segment.SME,
+            tariff_structure=TariffStructure.DAY_NIGHT,
+            year=2026,
+            contract_type=ContractType.FIXED,
+            annual_consumption_kwh=5_000 + 100 * i,
+            standing_charge_eur_per_year=300,
+            band_split={TimeBand.DAY: 0.6, TimeBand.NIGHT: 0.4},
+            vat_rate=0.23,
+        )
+        for i in range(100)
+    ]
+    batch = RequestBatch.from_requests(requests)
+
+    serial = engine.price_batch(batch)
+    with ParallelPricer(engine, processes=3, min_task_rows=30) as pricer:
+        assert pricer.task_rows(len(batch)) == 34
+        parallel = pricer.price_batch(batch)
+        shared_dir = pricer._dir
+
+    for a, b in zip(serial.stack, parallel.stack):
+        assert np.array_equal(a, b, equal_nan=True)
+    assert np.array_equal(serial.valid, parallel.valid)
+    assert parallel.results() == serial.results()
+    assert not os.path.exists(shared_dir)
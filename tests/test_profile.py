@@ -0,0 +1,46 @@
+import numpy as np
+
+from pricing_engine.profile import ProfilePricer, create_profiles, open_profiles
+from pricing_engine.schemas import Commodity, ContractType, Market, Segment, TariffStructure
+from pricing_engine.tariff_engine import TariffEngine
+from pricing_engine.tou import TouCalendar, intervals_in_year
+
+
+def test_profile_pricing_uses_volume_weighted_band_prices(tmp_path) -> None:
+    assert intervals_in_year(2026) == 17_520
+    rng = np.random.default_rng(0)
+    prices = rng.uniform(60.0, 160.0, 17_520)
+
+    profiles = create_profiles(tmp_path / "profiles.npy", n_sites=5, year=2026)
+    profiles[:] = rng.uniform(0.0, 3.0, profiles.shape)
+    profiles.flush()
+    profiles = open_profiles(tmp_path / "profiles.npy")
+    assert profiles.dtype == np.float32
+
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    pricer = ProfilePricer(engine, chunk_size=2)
+    result = pricer.price_profiles(
+        profiles,
+        prices,
+        Market.ROI,
+        Commodity.ELEC,
+        Segment.SME,
+        TariffStructure.DAY_NIGHT,
+        2026,
+        ContractType.FIXED,
+        standing_charge_eur_per_year=300.0,
+    )
+
+    slots = TouCalendar(Market.ROI).year_slots(TariffStructure.DAY_NIGHT, 2026)
+    for i in range(5):
+        load = profiles[i].astype(np.float64)
+        for b in range(2):
+            in_band = slots == b
+            expected = (load[in_band] @ prices[in_band]) / load[in_band].sum()
+            priced = result.stack.wholesale[b, i] + result.stack.shaping[b, i]
+            assert np.isclose(priced, expected, rtol=1e-12)
+        assert np.isclose(result.batch.annual_consumption_kwh[i], load.sum())
+
+    quote = result[0]
+    assert np.isclose(sum(quote.request.band_split.values()), 1.0)
+    assert quote.estimated_annual_bill_ex_vat > 300.0
@@ -0,0 +1,72 @@
+import shutil
+import time
+
+from pricing_engine.quote_cache import QuoteCache, request_fingerprint, request_key
+from pricing_engine.schemas import (
+    Commodity,
+    ContractType,
+    Market,
+    Segment,
+    TariffRequest,
+    TariffStructure,
+    TimeBand,
+)
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def _request(kwh: float, day: float = 0.6) -> TariffRequest:
+    return TariffRequest(
+        market=Market.ROI,
+        commodity=Commodity.ELEC,
+        segment=Segment.SME,
+        tariff_structure=TariffStructure.DAY_NIGHT,
+        year=2026,
+        contract_type=ContractType.FIXED,
+        annual_consumption_kwh=kwh,
+        standing_charge_eur_per_year=300,
+        band_split={TimeBand.DAY: day, TimeBand.NIGHT: round(1 - day, 6)},
+    )
+
+
+def test_cache_hits_evictions_and_ttl() -> None:
+    assert request_key(_request(50_000)) == request_key(_request(50_000.0))
+    assert request_fingerprint(_request(50_000)) != request_fingerprint(_request(50_001))
+
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    engine.quote_cache = QuoteCache(max_entries=2)
+    first = engine.build_tariff(_request(50_000))
+    assert engine.build_tariff(_request(50_000)) is first
+    engine.build_tariff(_request(60_000))
+    engine.build_tariff(_request(70_000))  # evicts 50_000, the least recently used
+    assert engine.build_tariff(_request(50_000)) is not first
+    assert engine.build_tariff(_request(50_000)) == first
+
+    stats = engine.quote_cache.stats
+    assert (stats.hits, stats.misses, stats.evictions) == (2, 4, 2)
+    assert stats.hit_rate == 2 / 6
+
+    expiring = QuoteCache(ttl_s=0.01)
+    expiring.put(request_key(_request(1)), first)
+    time.sleep(0.02)
+    assert expiring.get(request_key(_request(1))) is None
+    assert expiring.stats.expirations == 1
+
+
+def test_cache_invalidates_on_settings_and_data_changes(tmp_path) -> None:
+    shutil.copytree("sample_data", tmp_path / "sample_data")
+    engine = TariffEngine.from_config("config/base.yaml", tmp_path)
+    engine.quote_cache = QuoteCache()
+    request = _request(50_000)
+    base = engine.build_tariff(request)
+
+    engine.settings.margin_pct["SME"] += 0.01
+    with_margin = engine.build_tariff(request)
+    assert with_margin.weighted_all_in_eur_per_kwh > base.weighted_all_in_eur_per_kwh
+
+    curve = tmp_path / "sample_data" / "wholesale_elec_roi_2026.csv"
+    curve.write_text(curve.read_text().replace("DAY,110", "DAY,111"))
+    repriced = engine.build_tariff(request)
+    assert repriced.snapshot_id != with_margin.snapshot_id
+    assert repriced.weighted_all_in_eur_per_kwh > with_margin.weighted_all_in_eur_per_kwh
+    assert engine.quote_cache.stats.invalidations == 2
+    assert engine.quote_cache.stats.hits == 0
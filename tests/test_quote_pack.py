@@ -0,0 +1,78 @@
+import pandas as pd
+
+from pricing_engine.export_excel import export_tariff_to_excel
+from pricing_engine.quote_pack import build_quote_packs, pack_file_name, read_manifest
+from pricing_engine.schemas import (
+    Commodity,
+    ContractType,
+    Market,
+    Segment,
+    TariffRequest,
+    TariffStructure,
+    TimeBand,
+)
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def test_quote_packs_match_single_exports_and_resume(tmp_path) -> None:
+    book = pd.DataFrame(
+        {
+            "customer_id": ["C/0", "C/1", "C/2", "C/3", "C/4"],
+            "market": "ROI",
+            "commodity": "ELEC",
+            "segment": "SME",
+            "tariff_structure": "daynight",
+            "contract_type": "fixed",
+            "annual_consumption_kwh": [20_000.0 * (i + 1) for i in range(5)],
+            "standing_charge_eur_per_year": 300.0,
+            "day_share": 0.6,
+            "night_share": 0.4,
+        }
+    )
+    book.to_csv(tmp_path / "book.csv", index=False)
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    out = tmp_path / "packs"
+
+    stats = build_quote_packs(
+        engine, tmp_path / "book.csv", out, processes=1, chunk_size=2, files_per_task=2, year=2026
+    )
+    assert (stats.files, stats.skipped, stats.failed) == (5, 0, 0)
+    manifest = read_manifest(out)
+    assert sorted(manifest) == [pack_file_name(c) for c in book["customer_id"]]
+    assert {row["status"] for row in manifest.values()} == {"ok"}
+
+    expected = engine.build_tariff(
+        TariffRequest(
+            market=Market.ROI,
+            commodity=Commodity.ELEC,
+            segment=Segment.SME,
+            tariff_structure=TariffStructure.DAY_NIGHT,
+            year=2026,
+            contract_type=ContractType.FIXED,
+            annual_consumption_kwh=60_000.0,
+            standing_charge_eur_per_year=300.0,
+            band_split={TimeBand.DAY: 0.6, TimeBand.NIGHT: 0.4},
+            vat_rate=engine.settings.vat["ROI"],
+        )
+    )
+    export_tariff_to_excel(expected, tmp_path / "single.xlsx")
+    single = pd.read_excel(tmp_path / "single.xlsx", sheet_name=None)
+    packed = pd.read_excel(out / "C_2.xlsx", sheet_name=None)
+    assert list(packed) == list(single)
+    for name in single:
+        pd.testing.assert_frame_equal(packed[name], single[name])
+
+    # A re-run after a crash only renders what is missing.
+    (out / "C_3.xlsx").unlink()
+    stats = build_quote_packs(engine, tmp_path / "book.csv", out, processes=1, year=2026)
+    assert (stats.files, stats.skipped) == (1, 4)
+    assert (out / "C_3.xlsx").exists()
+
+    # A changed book row or config invalidates the affected workbooks only.
+    book.loc[1, "annual_consumption_kwh"] = 45_000.0
+    book.to_csv(tmp_path / "book.csv", index=False)
+    stats = build_quote_packs(engine, tmp_path / "book.csv", out, processes=1, year=2026)
+    assert (stats.files, stats.skipped) == (1, 4)
+    engine.settings.margin_pct["SME"] += 0.01
+    stats = build_quote_packs(engine, tmp_path / "book.csv", out, processes=1, year=2026)
+    assert (stats.files, stats.skipped) == (5, 0)
@@ -0,0 +1,100 @@
+import shutil
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pricing_engine.quote_cache import PersistentQuoteCache
+from pricing_engine.schemas import Commodity, ContractType, Market, Segment, TariffStructure
+from pricing_engine.tariff_engine import TariffEngine
+
+QUOTE = (Market.ROI, Commodity.ELEC, Segment.SME, TariffStructure.DAY_NIGHT, 2026, ContractType.FIXED)
+
+
+def test_results_are_shared_between_engines_until_inputs_change(tmp_path) -> None:
+    shutil.copytree("sample_data", tmp_path / "sample_data")
+    path = tmp_path / "cache" / "results.sqlite"
+
+    first = TariffEngine.from_config("config/base.yaml", tmp_path)
+    first.result_cache = PersistentQuoteCache(path)
+    priced = first.build_tariff_from_archetype(*QUOTE)
+    stats = first.result_cache.stats()
+    assert (stats["entries"], stats["misses"]) == (1, 1)  # one entry per quote
+
+    second = TariffEngine.from_config("config/base.yaml", tmp_path)
+    second.result_cache = PersistentQuoteCache(path)
+    assert second.build_tariff_from_archetype(*QUOTE) == priced
+    assert second._index is None  # answered without compiling market data
+    assert second.result_cache.stats()["hits"] == 1
+
+    second.settings.margin_pct["SME"] += 0.01
+    assert second.build_tariff_from_archetype(*QUOTE) != priced
+
+    curve = tmp_path / "sample_data" / "wholesale_elec_roi_2026.csv"
+    curve.write_text(curve.read_text().replace("DAY,110", "DAY,111"))
+    third = TariffEngine.from_config("config/base.yaml", tmp_path)
+    third.result_cache = PersistentQuoteCache(path)
+    assert third.build_tariff_from_archetype(*QUOTE).snapshot_id != priced.snapshot_id
+
+
+def test_size_cap_prune_and_concurrent_writers(tmp_path) -> None:
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    result = engine.build_tariff_from_archetype(*QUOTE)
+    path = tmp_path / "results.sqlite"
+
+    def write(worker: int) -> None:
+        cache = PersistentQuoteCache(path)  # one connection per writer, as separate processes
+        for i in range(25):
+            cache.put(f"{worker}-{i}", result)
+            assert cache.get(f"{worker}-{i}") == result
+        cache.close()
+
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(write, range(4)))
+
+    cache = PersistentQuoteCache(path)
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"]) == (100, 100)
+    with sqlite3.connect(path) as db:
+        assert db.execute("SELECT SUM(size) FROM quotes").fetchone()[0] == stats["bytes"]
+
+    recent = [f"{w}-{i}" for w in range(4) for i in range(0, 25, 10)][:10]
+    for key in recent:
+        cache.get(key)
+    size = stats["bytes"] // 100
+    assert cache.prune(max_bytes=10 * size) == 90  # least recently used go first
+    with sqlite3.connect(path) as db:
+        assert sorted(k for (k,) in db.execute("SELECT key FROM quotes")) == sorted(recent)
+
+
+def test_lookups_do_not_write(tmp_path) -> None:
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    result = engine.build_tariff_from_archetype(*QUOTE)
+    path = tmp_path / "results.sqlite"
+    writer = PersistentQuoteCache(path, timeout_s=0.1, flush_every=3)
+    writer.put("a", result)
+
+    with sqlite3.connect(path, isolation_level=None) as other:
+        other.execute("BEGIN IMMEDIATE")  # another process holds the write lock
+        assert writer.get("a") == result and writer.get("b") is None
+        other.execute("COMMIT")
+    assert writer.get("a") == result  # third lookup flushes the counts
+    with sqlite3.connect(path) as db:
+        assert dict(db.execute("SELECT name, value FROM counters WHERE name != 'bytes'")) == {
+            "hits": 2,
+            "misses": 1,
+        }
+    writer.close()
+
+    reader = PersistentQuoteCache(path, read_only=True)
+    assert reader.get("a") == result
+    reader.put("c", result)
+    assert reader.get("c") is None
+    assert (reader.stats()["hits"], reader.stats()["misses"]) == (3, 2)
+    with pytest.raises(PermissionError, match="read-only"):
+        reader.prune(max_bytes=0)
+    with pytest.raises(PermissionError, match="read-only"):
+        reader.clear()
+    reader.close()
+    with sqlite3.connect(path) as db:
+        assert db.execute("SELECT COUNT(*), SUM(hits) FROM quotes").fetchone() == (1, 2)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from pricing_engine.batch import RequestBatch
+from pricing_engine.risk import MonteCarloRisk
+from pricing_engine.schemas import (
+    Commodity,
+    ContractType,
+    Market,
+    Segment,
+    TariffRequest,
+    TariffStructure,
+    TimeBand,
+)
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def _request(day: float, contract: ContractType = ContractType.FIXED) -> TariffRequest:
+    return TariffRequest(
+        market=Market.ROI,
+        commodity=Commodity.ELEC,
+        segment=Segment.SME,
+        tariff_structure=TariffStructure.DAY_NIGHT,
+        year=2026,
+        contract_type=contract,
+        annual_consumption_kwh=50_000,
+        standing_charge_eur_per_year=300,
+        band_split={TimeBand.DAY: day, TimeBand.NIGHT: round(1 - day, 6)},
+    )
+
+
+def _engine(**risk_model) -> TariffEngine:
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    engine.settings.risk_model = {"paths": 2_000, "seed": 11, **risk_model}
+    return engine
+
+
+def test_monte_carlo_premium_is_reproducible_and_matches_single_quotes() -> None:
+    requests = [_request(0.5 + i / 100) for i in range(40)]
+    batch = RequestBatch.from_requests(requests)
+    engine = _engine()
+    priced = engine.price_batch(batch)
+
+    # Small chunks and a fresh engine give the same numbers, as does the scalar path.
+    chunked = _engine(max_cells=5_000).price_batch(batch)
+    np.testing.assert_array_equal(
+        chunked.weighted_all_in_eur_per_kwh, priced.weighted_all_in_eur_per_kwh
+    )
+    assert engine.build_tariff(requests[7]) == priced.result(7)
+
+    weights = batch.band_weights.T
+    premium = engine.risk_model().premium(batch, engine.market_tables().gather(batch))
+    np.testing.assert_allclose((weights * priced.stack.risk).sum(axis=0), premium)
+    assert (premium > 0).all()
+
+    riskier = _engine(percentile=99, price_volatility={"SME": 0.5, "IC": 0.3}).price_batch(batch)
+    assert (riskier.weighted_all_in_eur_per_kwh > priced.weighted_all_in_eur_per_kwh).all()
+
+
+def test_indexed_quotes_carry_no_price_risk_and_config_is_validated() -> None:
+    model = MonteCarloRisk.from_config({"paths": 500})
+    batch = RequestBatch.from_requests([_request(0.6, ContractType.INDEXED)])
+    tables = TariffEngine.from_config("config/base.yaml", ".").market_tables()
+    assert model.premium(batch, tables.gather(batch))[0] == 0.0
+
+    with pytest.raises(ValueError, match="Unknown risk_model settings"):
+        MonteCarloRisk.from_config({"path": 500})
+    with pytest.raises(ValueError, match="no value for segments"):
+        MonteCarloRisk.from_config({"volume_volatility": {"SME": 0.1}})
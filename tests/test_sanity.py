@@ -1,5 +1,10 @@
+import pandas as pd
+import pytest
+
+from pricing_engine.batch import RequestBatch
+from pricing_engine.book import reprice_book
 from pricing_engine.config import load_settings
-from pricing_engine.sanity import check_tariff_bounds
+from pricing_engine.sanity import batch_bounds_violations, check_tariff_bounds
 from pricing_engine.tariff_engine import TariffEngine
 from pricing_engine.schemas import Commodity, ContractType, Market, Segment, TariffStructure
 
@@ -21,3 +26,72 @@ def test_tariff_bounds_check() -> None:
         max_bounds=settings.sanity["max_unit_rate_eur_per_kwh"],
     )
     assert warnings == []
+
+
+def _book() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "customer_id": [f"C{i}" for i in range(6)],
+            "market": ["ROI", "NI"] * 3,
+            "commodity": "ELEC",
+            "segment": "SME",
+            "tariff_structure": ["daynight", "flat"] * 3,
+            "contract_type": "fixed",
+            "annual_consumption_kwh": 20_000.0,
+            "standing_charge_eur_per_year": 300.0,
+            "flat_share": [0.0, 1.0] * 3,
+            "day_share": [0.6, 0.0] * 3,
+            "night_share": [0.4, 0.0] * 3,
+        }
+    )
+
+
+def test_batch_bounds_match_single_quote_check() -> None:
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    priced = engine.price_batch(RequestBatch.from_columns(_book(), year=2026))
+    max_bounds = {"SME": 0.17, "IC": 0.40}  # below the day rate, above night and flat
+    min_bounds = engine.settings.sanity["min_unit_rate_eur_per_kwh"]
+
+    violations = batch_bounds_violations(priced, min_bounds, max_bounds)
+    expected = [bool(check_tariff_bounds(r, min_bounds, max_bounds)) for r in priced.results()]
+    assert violations.mask.tolist() == expected == [True, False] * 3
+
+    table = violations.table(_book()["customer_id"])
+    assert table["quote"].tolist() == ["C0", "C2", "C4"]
+    assert table[["segment", "band", "limit"]].astype(str).drop_duplicates().values.tolist() == [
+        ["SME", "DAY", "max"]
+    ]
+    summary = violations.summary()
+    assert summary["breaches"].tolist() == [3]
+
+
+def test_reprice_book_breach_policies(tmp_path) -> None:
+    _book().to_csv(tmp_path / "book.csv", index=False)
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    engine.settings.sanity["max_unit_rate_eur_per_kwh"]["SME"] = 0.17
+
+    with pytest.raises(ValueError, match="out of configured bounds"):
+        reprice_book(engine, tmp_path / "book.csv", tmp_path / "raise.csv", year=2026)
+
+    stats = reprice_book(
+        engine,
+        tmp_path / "book.csv",
+        tmp_path / "flag.csv",
+        chunk_size=4,
+        year=2026,
+        on_breach="flag",
+        violations_path=tmp_path / "violations.csv",
+    )
+    flagged = pd.read_csv(tmp_path / "flag.csv")
+    assert (stats.rows, stats.breaches, stats.dropped) == (6, 3, 0)
+    assert flagged["sanity_breach"].tolist() == [True, False] * 3
+    assert pd.read_csv(tmp_path / "violations.csv")["quote"].tolist() == ["C0", "C2", "C4"]
+    assert stats.violations["breaches"].tolist() == [3]  # combined across both chunks
+
+    stats = reprice_book(
+        engine, tmp_path / "book.csv", tmp_path / "drop.csv", year=2026, on_breach="drop"
+    )
+    dropped = pd.read_csv(tmp_path / "drop.csv")
+    assert stats.dropped == 3
+    assert dropped["customer_id"].tolist() == ["C1", "C3", "C5"]
+    assert "sanity_breach" not in dropped.columns
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from pricing_engine.batch import CONTRACT_TYPES, RequestBatch
+from pricing_engine.scenarios import GRID_TOTALS, ScenarioEngine, ScenarioShocks
+from pricing_engine.schemas import (
+    Commodity,
+    ContractType,
+    Market,
+    Segment,
+    TariffRequest,
+    TariffStructure,
+    TimeBand,
+)
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def _engine(margin_shift: float = 0.0) -> TariffEngine:
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    engine.settings.sanity["min_unit_rate_eur_per_kwh"] = {"SME": 0.0, "IC": 0.0}
+    engine.settings.margin_pct = {k: v + margin_shift for k, v in engine.settings.margin_pct.items()}
+    return engine
+
+
+def test_scenario_grid_matches_repricing_with_shocked_inputs(tmp_path) -> None:
+    requests = [
+        TariffRequest(
+            market=Market.ROI,
+            commodity=Commodity.ELEC,
+            segment=Segment.SME,
+            tariff_structure=TariffStructure.DAY_NIGHT,
+            year=2026,
+            contract_type=contract,
+            annual_consumption_kwh=10_000 + 2_500 * i,
+            standing_charge_eur_per_year=300,
+            band_split={TimeBand.DAY: 0.5 + i / 40, TimeBand.NIGHT: 0.5 - i / 40},
+            vat_rate=0.135,
+        )
+        for i in range(10)
+        for contract in ContractType
+    ]
+    batch = RequestBatch.from_requests(requests)
+    engine = _engine()
+    base = engine.price_batch(batch)
+
+    shocks = ScenarioShocks.grid(margin_pct=[0.0, 0.02], wholesale=[0.0, 15.0])
+    grid = ScenarioEngine(engine, max_cells=8)  # several chunks each way
+    totals = grid.totals(batch, shocks)
+    for name in GRID_TOTALS:
+        assert (totals[name][0] == getattr(base, name)).all()
+
+    margin_up = _engine(margin_shift=0.02).price_batch(batch)
+    assert np.allclose(
+        totals["estimated_annual_bill_ex_vat"][2], margin_up.estimated_annual_bill_ex_vat
+    )
+
+    # Wholesale shocks move fixed quotes only; indexed quotes exclude wholesale.
+    fixed = batch.contract_type == CONTRACT_TYPES.index(ContractType.FIXED)
+    moved = totals["weighted_all_in_eur_per_kwh"][1] - totals["weighted_all_in_eur_per_kwh"][0]
+    assert (moved[fixed] > 0.015).all() and (moved[~fixed] == 0.0).all()
+
+    paths = grid.write_grid(batch, shocks, tmp_path / "grid")
+    written = np.load(paths["estimated_annual_bill_inc_vat"])
+    assert np.array_equal(written, totals["estimated_annual_bill_inc_vat"])
+
+    # A book streamed in chunks lands at each chunk's offset.
+    parts = (batch.slice(slice(q, q + 3)) for q in range(0, len(batch), 3))
+    paths = grid.write_grid(parts, shocks, tmp_path / "chunked", quotes=len(batch))
+    for name in GRID_TOTALS:
+        assert np.array_equal(np.load(paths[name]), totals[name])
+    with pytest.raises(ValueError, match="sized for"):
+        grid.write_grid([batch], shocks, tmp_path / "short", quotes=len(batch) - 1)
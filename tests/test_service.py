@@ -0,0 +1,101 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from pricing_engine.schemas import (
+    Commodity,
+    ContractType,
+    Market,
+    Segment,
+    TariffRequest,
+    TariffStructure,
+    TimeBand,
+)
+from pricing_engine.service import QuoteServer, QuoteService, dump_model
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def _request(kwh: float, year: int = 2026) -> TariffRequest:
+    return TariffRequest(
+        market=Market.ROI,
+        commodity=Commodity.ELEC,
+        segment=Segment.SME,
+        tariff_structure=TariffStructure.DAY_NIGHT,
+        year=year,
+        contract_type=ContractType.FIXED,
+        annual_consumption_kwh=kwh,
+        standing_charge_eur_per_year=300,
+        band_split={TimeBand.DAY: 0.6, TimeBand.NIGHT: 0.4},
+    )
+
+
+async def _http(port: int, method: str, path: str, body: bytes = b"") -> tuple:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n".encode()
+        + body
+    )
+    response = await reader.read()
+    writer.close()
+    head, payload = response.split(b"\r\n\r\n", 1)
+    return int(head.split()[1]), json.loads(payload)
+
+
+def test_service_batches_deduplicates_and_serves_http() -> None:
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    requests = [_request(10_000), _request(20_000), _request(10_000), _request(10_000, year=2031)]
+
+    async def scenario() -> None:
+        service = QuoteService(engine, max_wait_ms=1.0)
+        async with service:
+            results = await asyncio.gather(
+                *(service.quote(r) for r in requests), return_exceptions=True
+            )
+        assert results[0] == results[2] == engine.build_tariff(requests[0])
+        assert results[1] == engine.build_tariff(requests[1])
+        assert isinstance(results[3], ValueError)
+        metrics = service.metrics.snapshot()
+        assert (metrics["requests"], metrics["failed"], metrics["deduplicated"]) == (3, 1, 1)
+        assert metrics["batches"] == 1 and metrics["p99_ms"] >= metrics["p50_ms"] > 0
+
+        server = QuoteServer(QuoteService(engine))
+        _host, port = await server.start("127.0.0.1", 0)
+        try:
+            status, quote = await _http(port, "POST", "/quote", dump_model(requests[1]))
+            assert status == 200
+            assert quote["estimated_annual_bill_ex_vat"] == results[1].estimated_annual_bill_ex_vat
+            assert (await _http(port, "POST", "/quote", dump_model(requests[3])))[0] == 422
+            assert (await _http(port, "POST", "/quote", b"{}"))[0] == 400
+            status, metrics = await _http(port, "GET", "/metrics")
+            assert status == 200 and metrics["requests"] == 1
+        finally:
+            await server.stop()
+
+    asyncio.run(scenario())
+
+
+def test_batch_window_sleeps_and_batcher_survives_errors() -> None:
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    remember = engine.remember_quote
+
+    async def scenario() -> None:
+        async with QuoteService(engine, max_wait_ms=50.0) as service:
+            wall, cpu = time.perf_counter(), time.process_time()
+            for kwh in (1_000, 2_000, 3_000):
+                await service.quote(_request(kwh))
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            assert wall >= 0.15 and cpu < wall / 2  # the window waits, it does not spin
+
+            def broken(request, result):
+                raise OSError("market data reload failed")
+
+            engine.remember_quote = broken
+            with pytest.raises(OSError):
+                await service.quote(_request(4_000))
+            engine.remember_quote = remember
+            assert await service.quote(_request(5_000)) == engine.build_tariff(_request(5_000))
+
+    asyncio.run(scenario())
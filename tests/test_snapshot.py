@@ -0,0 +1,38 @@
+import numpy as np
+
+from pricing_engine.schemas import Commodity, ContractType, Market, Segment, TariffStructure
+from pricing_engine.snapshot import MarketSnapshot, compile_snapshot
+from pricing_engine.tariff_engine import TariffEngine
+
+
+def test_snapshot_engine_matches_csv_engine(tmp_path) -> None:
+    csv_engine = TariffEngine.from_config("config/base.yaml", ".")
+    snapshot_id = compile_snapshot(csv_engine.store, tmp_path / "market.npz")
+    snapshot_engine = TariffEngine.from_snapshot(tmp_path / "market.npz", "config/base.yaml", ".")
+
+    args = (
+        Market.ROI,
+        Commodity.ELEC,
+        Segment.SME,
+        TariffStructure.DAY_NIGHT,
+        2026,
+        ContractType.FIXED,
+    )
+    expected = csv_engine.build_tariff_from_archetype(*args)
+    assert expected.snapshot_id == snapshot_id
+    assert snapshot_engine.build_tariff_from_archetype(*args) == expected
+
+
+def test_snapshot_columns_are_mapped_and_coded(tmp_path) -> None:
+    engine = TariffEngine.from_config("config/base.yaml", ".")
+    compile_snapshot(engine.store, tmp_path / "market.npz")
+    snapshot = MarketSnapshot(tmp_path / "market.npz")
+
+    codes = snapshot._arrays["pass_through:region:codes"]
+    assert codes.dtype == np.int8
+    assert isinstance(codes.base, np.memmap)
+
+    table = snapshot.table("pass_through")
+    source = engine.store.read("sample_data/pass_through_charges.csv")
+    assert table["region"].tolist() == source["region"].tolist()
+    assert table["value"].tolist() == source["value"].tolist()
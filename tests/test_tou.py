@@ -0,0 +1,33 @@
+from datetime import date
+
+import numpy as np
+
+from pricing_engine.schemas import Market, TariffStructure
+from pricing_engine.tou import TouCalendar, easter_sunday, local_to_utc, public_holidays
+
+
+def test_holidays_and_summer_time() -> None:
+    assert easter_sunday(2026) == date(2026, 4, 5)
+    assert date(2026, 2, 2) in public_holidays(Market.ROI, 2026)  # St Brigid's Day
+    assert date(2026, 7, 13) in public_holidays(Market.NI, 2026)  # 12 July substitute
+    assert date(2026, 7, 13) not in public_holidays(Market.ROI, 2026)
+
+    local = np.array(["2026-01-15T12:00", "2026-07-15T12:00"], dtype="datetime64[m]")
+    expected = np.array(["2026-01-15T12:00", "2026-07-15T11:00"], dtype="datetime64[m]")
+    assert (local_to_utc(local) == expected).all()
+
+    calendar = TouCalendar(Market.ROI)
+    utc = np.array(
+        [
+            "2026-07-15T07:00",  # 08:00 local, weekday: peak
+            "2026-07-15T06:30",  # 07:30 local: off-peak
+            "2026-01-15T08:00",  # winter, 08:00 local: peak
+            "2026-02-02T12:00",  # bank holiday: off-peak
+            "2026-07-18T12:00",  # Saturday: off-peak
+        ],
+        dtype="datetime64[m]",
+    )
+    assert calendar.slots(TariffStructure.PEAK_OFFPEAK, utc).tolist() == [0, 1, 0, 1, 1]
+    # Night meters stay on standard time: 23:00-08:00 UTC all year.
+    night = np.array(["2026-07-15T23:00", "2026-07-15T07:30", "2026-07-15T08:00"], "datetime64[m]")
+    assert calendar.slots(TariffStructure.DAY_NIGHT, night).tolist() == [1, 1, 0]